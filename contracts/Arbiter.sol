@@ -12,8 +12,15 @@ pragma solidity ^0.8.0;
 
 import "@openzeppelin/utils/cryptography/ECDSA.sol";
 import "@openzeppelin/utils/Address.sol";
+import "@openzeppelin/utils/math/SafeCast.sol";
+import "@openzeppelin/utils/introspection/ERC165Checker.sol";
+import "@openzeppelin/utils/cryptography/MerkleProof.sol";
+import "@openzeppelin/utils/math/Math.sol";
 import "../interfaces/IGameJutsuRules.sol";
+import "../interfaces/IGameJutsuTransitionRules.sol";
+import "../interfaces/IGameJutsuOutcomeRules.sol";
 import "../interfaces/IGameJutsuArbiter.sol";
+import "./PackedGameMove.sol";
 
 /**
     @title GameJutsu Arbiter
@@ -27,13 +34,50 @@ import "../interfaces/IGameJutsuArbiter.sol";
 contract Arbiter is IGameJutsuArbiter {
     /**
         @custom startTime The moment one of the players gets fed up waiting for the other to make a move
-        @custom gameMove GameMove structure with the last move of the complainer
+        @custom player the complainer, the player who made the last move
         @custom stake Put your money where your mouth is - nefarious timeouts can be penalized by not returning stake
+        @custom nonce nonce of the last move of the complainer
+        @custom stateHash keccak256 of the new state of the last move of the complainer, the opponent's move must continue from it
       */
     struct Timeout {
         uint256 startTime;
-        GameMove gameMove;
-        uint256 stake;
+        address player;
+        uint96 stake;
+        uint256 nonce;
+        bytes32 stateHash;
+    }
+
+    /**
+        @notice The latest game state both players have signed
+        @custom nonce nonce of the next move, the one to be made from the checkpointed state
+        @custom stateHash keccak256 of the checkpointed state
+        @dev two slots, the full state hash takes a whole one, a newer checkpoint rewrites both without clearing them
+      */
+    struct Checkpoint {
+        uint256 nonce;
+        bytes32 stateHash;
+    }
+
+    /**
+        @notice Merkle root over the moves both players have signed so far
+        @custom root root of the tree with `keccak256(digest)` of every GameMove as leaves, sibling pairs hashed sorted
+        @custom length number of moves in the log
+      */
+    struct MoveLog {
+        bytes32 root;
+        uint256 length;
+    }
+
+    /**
+        @notice Everything a call needs to know about a GameMove's hashes, computed once per move
+        @custom digest EIP-712 typed data hash the players sign
+        @custom oldStateHash keccak256 of the move's oldState
+        @custom newStateHash keccak256 of the move's newState, or of the state derived by the rules if the move omits it
+      */
+    struct MoveContext {
+        bytes32 digest;
+        bytes32 oldStateHash;
+        bytes32 newStateHash;
     }
 
     uint256 public constant TIMEOUT = 5 minutes;
@@ -42,56 +86,39 @@ contract Arbiter is IGameJutsuArbiter {
     bytes32 public immutable DOMAIN_SEPARATOR;
     /// @notice The EIP-712 typehash for the game move struct used by the contract
     bytes32 public constant GAME_MOVE_TYPEHASH = keccak256("GameMove(uint256 gameId,uint256 nonce,address player,bytes oldState,bytes newState,bytes move)");
+    /// @notice The EIP-712 typehash for the state checkpoint both players sign
+    bytes32 public constant CHECKPOINT_TYPEHASH = keccak256("Checkpoint(uint256 gameId,uint256 nonce,bytes32 stateHash)");
+    /// @notice The EIP-712 typehash for a game move committing to the move before it
+    bytes32 public constant CHAINED_GAME_MOVE_TYPEHASH = keccak256("ChainedGameMove(uint256 gameId,uint256 nonce,address player,bytes oldState,bytes newState,bytes move,bytes32 previousMoveHash)");
+    /// @notice The EIP-712 typehash for the move log root both players sign
+    bytes32 public constant MOVE_LOG_TYPEHASH = keccak256("MoveLog(uint256 gameId,uint256 length,bytes32 root)");
+    /// @notice The EIP-712 typehash for the terms of a game opened by signatures
+    bytes32 public constant GAME_OPEN_TYPEHASH = keccak256("GameOpen(address rules,uint256 stake,uint256 rulesGasBudget,address[2] players,uint256 deadline,bytes32 salt)");
+
+    /// @notice `Game.outcome` of a drawn game, 1 and 2 are the 1-based IDs of the winners
+    uint8 public constant OUTCOME_DRAW = 3;
+    /// @notice Session addresses each player can register in a game, so settling the game stays bounded
+    uint256 public constant MAX_SESSION_ADDRESSES = 4;
 
     uint256 public DEFAULT_TIMEOUT = 5 minutes;
     uint256 public DEFAULT_TIMEOUT_STAKE = 0.1 ether;
     uint256 public NUM_PLAYERS = 2;
 
-    mapping(uint256 => Game) public games;
+    mapping(uint256 => Game) private _games;
     mapping(uint256 => Timeout) public timeouts;
+    mapping(uint256 => Checkpoint) public checkpoints;
+    mapping(uint256 => MoveLog) public moveLogs;
+    mapping(uint256 => uint256) private _rulesGasBudgets;
+    mapping(uint256 => address[][2]) private _sessionAddresses;
+    /// @notice Deposits, winnings and returned stakes credited to each player, stakes are reserved from it, the rest can be withdrawn at once
+    mapping(address => uint256) public balances;
     uint256 public nextGameId;
 
-    modifier firstMoveSignedByAll(SignedGameMove[2] calldata signedMoves) {
-        require(_isSignedByAllPlayersAndOnlyByPlayers(signedMoves[0]), "Arbiter: first move not signed by all players");
-        _;
-    }
-
-    modifier lastMoveSignedByMover(SignedGameMove[2] calldata signedMoves) {
-        require(_moveSignedByMover(signedMoves[1]), "Arbiter: first signature must belong to the player making the move");
-        _;
-    }
-
-    modifier signedByMover(SignedGameMove calldata signedMove) {
-        require(_moveSignedByMover(signedMove), "Arbiter: first signature must belong to the player making the move");
-        _;
-    }
-
-    modifier onlyValidGameMove(GameMove calldata move) {
-        require(_isValidGameMove(move), "Arbiter: invalid game move");
-        _;
-    }
-
     modifier onlyPlayer(SignedGameMove calldata signedMove){
         require(_playerInGame(signedMove.gameMove.gameId, signedMove.gameMove.player), "Arbiter: player not in game");
         _;
     }
 
-    modifier movesInSequence(SignedGameMove[2] calldata moves) {
-        for (uint256 i = 0; i < moves.length - 1; i++) {
-            GameMove calldata currentMove = moves[i].gameMove;
-            GameMove calldata nextMove = moves[i + 1].gameMove;
-            require(currentMove.gameId == nextMove.gameId, "Arbiter: moves are for different games");
-            require(currentMove.nonce + 1 == nextMove.nonce, "Arbiter: moves are not in sequence");
-            require(keccak256(currentMove.newState) == keccak256(nextMove.oldState), "Arbiter: moves are not in sequence");
-        }
-        _;
-    }
-
-    modifier allValidGameMoves(SignedGameMove[2] calldata moves) {
-        require(_allValidGameMoves(moves), "Arbiter: invalid game move");
-        _;
-    }
-
     modifier timeoutStarted(uint256 gameId) {
         require(_timeoutStarted(gameId), "Arbiter: timeout not started");
         _;
@@ -118,59 +145,112 @@ contract Arbiter is IGameJutsuArbiter {
 
     /**
         @notice Create a new game, define its rules and stake amount, put the stake on the table
+        @notice both stakes have to fit in the game's uint72 pot, at most about 2361 ether per player
         @param rules Rules contract address to use in conflict resolution
         @param sessionAddresses Addresses the proposer intends to use to sign moves
       */
     function proposeGame(IGameJutsuRules rules, address[] calldata sessionAddresses) payable external returns (uint256 gameId) {
-        gameId = nextGameId;
-        Game storage game = games[gameId];
-        game.rules = rules;
-        game.players[msg.sender] = 1;
-        game.playersArray[0] = msg.sender;
-        game.stake = msg.value;
-        nextGameId++;
-        emit GameProposed(address(rules), gameId, msg.value, msg.sender);
-        if (sessionAddresses.length > 0) {
-            for (uint256 i = 0; i < sessionAddresses.length; i++) {
-                _registerSessionAddress(gameId, msg.sender, sessionAddresses[i]);
-            }
-        }
+        return _proposeGame(rules, msg.value, sessionAddresses);
+    }
+
+    /**
+        @notice Same as `proposeGame` with a gas budget for every call the Arbiter makes to the rules in this game
+        @notice a move the rules can't validate within the budget is an invalid move, see `measureRulesGas` to size it
+        @param rules Rules contract address to use in conflict resolution
+        @param gasBudget Gas for each single rules call
+        @param sessionAddresses Addresses the proposer intends to use to sign moves
+      */
+    function proposeGameWithRulesGasBudget(IGameJutsuRules rules, uint256 gasBudget, address[] calldata sessionAddresses) payable external returns (uint256 gameId) {
+        require(gasBudget > 0, "Arbiter: zero rules gas budget");
+        gameId = _proposeGame(rules, msg.value, sessionAddresses);
+        _rulesGasBudgets[gameId] = gasBudget;
+    }
+
+    /**
+        @notice Same as `proposeGame` with the stake reserved from the proposer's balance
+        @notice `msg.value`, if any, is deposited first
+        @param rules Rules contract address to use in conflict resolution
+        @param stake The amount each player stakes
+        @param sessionAddresses Addresses the proposer intends to use to sign moves
+      */
+    function proposeGameFromDeposit(IGameJutsuRules rules, uint256 stake, address[] calldata sessionAddresses) payable external returns (uint256 gameId) {
+        balances[msg.sender] += msg.value;
+        gameId = _proposeGame(rules, stake, sessionAddresses);
+        _reserveStake(msg.sender, stake);
     }
 
 
     /**
         @notice Join a game, put the stake on the table
+        @notice `msg.value` is deposited, the proposer's stake is then reserved from the joiner's balance
         @param gameId Game ID to join
         @param sessionAddresses Addresses the joiner intends to use to sign moves
       */
     function acceptGame(uint256 gameId, address[] calldata sessionAddresses) payable external {
-        Game storage game = games[gameId];
-        require(game.players[msg.sender] == 0, "Arbiter: player already in game");
-        require(game.started == false, "Arbiter: game already started");
-        require(game.playersArray[0] != address(0), "Arbiter: game not proposed");
-        require(game.stake <= msg.value, "Arbiter: stake mismatch");
-        game.players[msg.sender] = 2;
-        game.playersArray[1] = msg.sender;
-        game.stake += msg.value;
-        game.started = true;
+        require(_rulesGasBudgets[gameId] == 0, "Arbiter: rules gas budget not confirmed");
+        _acceptGame(gameId, sessionAddresses);
+    }
 
-        emit GameStarted(address(game.rules), gameId, game.stake, game.playersArray);
-        if (sessionAddresses.length > 0) {
-            for (uint256 i = 0; i < sessionAddresses.length; i++) {
-                _registerSessionAddress(gameId, msg.sender, sessionAddresses[i]);
-            }
+    /**
+        @notice Same as `acceptGame` for a game proposed with a rules gas budget of its own
+        @notice the joiner confirms the budget, it decides which moves are too expensive to validate
+        @param gameId Game ID to join
+        @param gasBudget The game's rules gas budget, see `rulesGasBudget`
+        @param sessionAddresses Addresses the joiner intends to use to sign moves
+      */
+    function acceptGameWithRulesGasBudget(uint256 gameId, uint256 gasBudget, address[] calldata sessionAddresses) payable external {
+        require(rulesGasBudget(gameId) == gasBudget, "Arbiter: rules gas budget mismatch");
+        _acceptGame(gameId, sessionAddresses);
+    }
+
+    /**
+        @notice Bring on-chain a game both players have opened by signing its terms
+        @notice only needed once the game needs arbitration, its moves are signed with `gameOpenId` as the game ID
+        @notice both stakes are reserved from the players' balances, `msg.value` is credited to the caller's balance first
+        @notice the signed terms expire at their deadline, stale signatures can't lock the players' deposits later
+        @param gameOpen The terms of the game
+        @param signatures Signatures of both players over the EIP-712 `GameOpen` struct
+      */
+    function openGame(GameOpen calldata gameOpen, bytes[] calldata signatures) payable external returns (uint256 gameId) {
+        gameId = gameOpenId(gameOpen);
+        Game storage game = _games[gameId];
+        require(!game.started, "Arbiter: game already opened");
+        require(block.timestamp <= gameOpen.deadline, "Arbiter: game open expired");
+        require(gameOpen.players[0] != gameOpen.players[1], "Arbiter: same player twice");
+        require(signatures.length == NUM_PLAYERS, "Arbiter: game not signed by both players");
+        address[] memory signers = getSigners(signatures, bytes32(gameId));
+        require(
+            (signers[0] == gameOpen.players[0] && signers[1] == gameOpen.players[1]) ||
+            (signers[0] == gameOpen.players[1] && signers[1] == gameOpen.players[0]),
+            "Arbiter: game not signed by both players"
+        );
+
+        balances[msg.sender] += msg.value;
+        for (uint8 i = 0; i < NUM_PLAYERS; i++) {
+            address player = gameOpen.players[i];
+            _reserveStake(player, gameOpen.stake);
+            game.players[player] = i + 1;
+            game.playersArray[i] = player;
         }
+        game.rules = gameOpen.rules;
+        game.stake = SafeCast.toUint72(gameOpen.stake * NUM_PLAYERS);
+        game.started = true;
+        if (gameOpen.rulesGasBudget > 0) {
+            _rulesGasBudgets[gameId] = gameOpen.rulesGasBudget;
+        }
+        emit GameStarted(address(gameOpen.rules), gameId, game.stake, game.playersArray);
     }
 
     /**
         @notice Register an additional session address to sign moves
         @notice This is useful if when changing browser sessions
+        @notice each player can register up to `MAX_SESSION_ADDRESSES` of them in a game
         @param gameId The ID of the game being played
         @param sessionAddress Address the joiner intends to use to sign moves
       */
     function registerSessionAddress(uint256 gameId, address sessionAddress) external {
-        require(games[gameId].players[msg.sender] > 0, "Arbiter: player not in game");
-        require(games[gameId].started == true, "Arbiter: game not started");
+        require(_games[gameId].players[msg.sender] > 0, "Arbiter: player not in game");
+        require(_isGameOn(gameId), "Arbiter: game not active");
         _registerSessionAddress(gameId, msg.sender, sessionAddress);
     }
 
@@ -181,38 +261,92 @@ contract Arbiter is IGameJutsuArbiter {
         @notice the first move must be signed by all players
         @notice and the second move must be signed at least by the player making the move
         @notice the new state of the second move must be final -i.e. reported by the rules contract as such
+        @notice either move may leave `newState` empty, the Arbiter derives it and the signatures vouch for it
         @param signedMoves Array of 2 signed moves
       */
-    function finishGame(SignedGameMove[2] calldata signedMoves) external
-    movesInSequence(signedMoves)
-    returns (address winner){
-        if(signedMoves[0].gameMove.player == signedMoves[1].gameMove.player){
-            require(_isSignedByAllPlayersAndOnlyByPlayers(signedMoves[0]), "Arbiter: both moves from the same player and first move not signed by all players");
-        } else
-            require(_moveSignedByMover(signedMoves[0]), "Arbiter: first move not signed by mover");
-        require(_moveSignedByMover(signedMoves[1]), "Arbiter: second move not signed by mover");
+    function finishGame(SignedGameMove[2] calldata signedMoves) external returns (address winner){
+        (string memory failure, bytes memory newState) = _finishingState(signedMoves);
+        require(bytes(failure).length == 0, failure);
+        return _settleFinalState(signedMoves[1].gameMove.gameId, signedMoves[1].gameMove.nonce + 1, newState);
+    }
 
-        uint256 gameId = signedMoves[0].gameMove.gameId;
-        require(_isGameOn(gameId), "Arbiter: game not active");
-        require(signedMoves[1].gameMove.gameId == gameId, "Arbiter: game ids mismatch");
-        require(_isValidGameMove(signedMoves[1].gameMove), "Arbiter: invalid game move");
+    /**
+        @notice Finish the game with a single move continuing from the checkpoint
+        @notice the move must be signed at least by the player making it, its new state must be final
+        @notice the move may leave `newState` empty
+        @param signedMove The move made from the checkpointed state
+      */
+    function finishGameFromCheckpoint(SignedGameMove calldata signedMove) external returns (address winner){
+        require(_isGameOn(signedMove.gameMove.gameId), "Arbiter: game not active");
+        (MoveContext memory context, bytes memory newState) = _validMoveContext(signedMove.gameMove);
+        require(_moveSignedByMover(signedMove, context.digest), "Arbiter: move not signed by mover");
+        _requireContinuesCheckpoint(signedMove.gameMove, context);
+        return _settleFinalState(signedMove.gameMove.gameId, signedMove.gameMove.nonce + 1, newState);
+    }
 
-        IGameJutsuRules.GameState memory newState = IGameJutsuRules.GameState(
-            gameId,
-            signedMoves[1].gameMove.nonce + 1,
-            signedMoves[1].gameMove.newState);
-        IGameJutsuRules rules = games[gameId].rules;
-        require(rules.isFinal(newState), "Arbiter: game state not final");
-        for (uint8 i = 0; i < NUM_PLAYERS; i++) {
-            if (rules.isWin(newState, i)) {
-                winner = games[gameId].playersArray[i];
-                address loser = _opponent(gameId, winner);
-                _finishGame(gameId, winner, loser, false);
-                return winner;
-            }
+    /**
+        @notice Finish many games in one transaction, see `finishGame` for the requirements for each game
+        @notice entries that can't finish a game are skipped, the rest of the batch is still settled
+        @notice a malformed signature, a rules call short of its gas budget or reverting in a game without one reverts the whole batch
+        @param signedMovesBatch 2 most recent signed moves for each game
+        @return finished whether each game got finished by this call
+      */
+    function finishGames(SignedGameMove[2][] calldata signedMovesBatch) external returns (bool[] memory finished){
+        finished = new bool[](signedMovesBatch.length);
+        for (uint256 i = 0; i < signedMovesBatch.length; i++) {
+            finished[i] = _tryFinishGame(signedMovesBatch[i]);
         }
-        _finishGame(gameId, address(0), address(0), true);
-        return address(0);
+    }
+
+    /**
+        @notice Record the latest game state both players agree on
+        @notice later timeouts and finishes can start from it instead of a move signed by both players
+        @param gameId The ID of the game being played
+        @param nonce Nonce of the next move, the one to be made from the checkpointed state
+        @param stateHash keccak256 of the encoded game state
+        @param signatures Signatures of all players over the EIP-712 `Checkpoint` struct
+      */
+    function checkpoint(uint256 gameId, uint256 nonce, bytes32 stateHash, bytes[] calldata signatures) external {
+        require(_isGameOn(gameId), "Arbiter: game not active");
+        Checkpoint storage current = checkpoints[gameId];
+        require(current.stateHash == 0 || nonce > current.nonce, "Arbiter: checkpoint not newer");
+        bytes32 digest = ECDSA.toTypedDataHash(DOMAIN_SEPARATOR, keccak256(abi.encode(CHECKPOINT_TYPEHASH, gameId, nonce, stateHash)));
+        require(_isSignedByAllPlayersAndOnlyByPlayers(gameId, signatures, digest), "Arbiter: checkpoint not signed by all players");
+        checkpoints[gameId] = Checkpoint(nonce, stateHash);
+        emit CheckpointRecorded(gameId, nonce, stateHash);
+    }
+
+    /**
+        @notice Record the root of a Merkle tree over the move log both players agree on
+        @notice any move in the log can then be disputed with a proof instead of the moves leading to it
+        @param gameId The ID of the game being played
+        @param length Number of moves in the log, must be greater than in the log recorded before
+        @param root Root of the tree, see `MoveLog`
+        @param signatures Signatures of all players over the EIP-712 `MoveLog` struct
+      */
+    function commitMoveLog(uint256 gameId, uint256 length, bytes32 root, bytes[] calldata signatures) external {
+        require(_isGameOn(gameId), "Arbiter: game not active");
+        require(length > moveLogs[gameId].length, "Arbiter: move log not longer");
+        bytes32 digest = ECDSA.toTypedDataHash(DOMAIN_SEPARATOR, keccak256(abi.encode(MOVE_LOG_TYPEHASH, gameId, length, root)));
+        require(_isSignedByAllPlayersAndOnlyByPlayers(gameId, signatures, digest), "Arbiter: move log not signed by all players");
+        moveLogs[gameId] = MoveLog(root, length);
+        emit MoveLogCommitted(gameId, length, root);
+    }
+
+    /**
+        @notice Dispute a cheat move from the move log both players have signed
+        @notice the proof takes the place of the move's signatures, the rules are asked once
+        @param gameMove The move from the log, with its newState
+        @param proof Merkle proof of the move's leaf against the recorded root
+      */
+    function disputeLoggedMove(GameMove calldata gameMove, bytes32[] calldata proof) external {
+        uint256 gameId = gameMove.gameId;
+        require(_isGameOn(gameId), "Arbiter: game not active");
+        MoveContext memory context = _moveContext(gameMove);
+        bytes32 root = moveLogs[gameId].root;
+        require(root != 0 && MerkleProof.verifyCalldata(proof, root, keccak256(abi.encode(context.digest))), "Arbiter: move not in the log");
+        require(!_isValidGameMove(gameMove, context), "Arbiter: valid move disputed");
+        disqualifyPlayer(gameId, gameMove.player);
     }
 
     /**
@@ -222,7 +356,7 @@ contract Arbiter is IGameJutsuArbiter {
       */
     function resign(uint256 gameId) external {
         require(_isGameOn(gameId), "Arbiter: game not active");
-        require(games[gameId].players[msg.sender] != 0, "Arbiter: player not in game");
+        require(_games[gameId].players[msg.sender] != 0, "Arbiter: player not in game");
         address loser = msg.sender;
         address winner = _opponent(gameId, loser);
         _finishGame(gameId, winner, loser, false);
@@ -231,23 +365,44 @@ contract Arbiter is IGameJutsuArbiter {
 
     /**
         @notice Dispute a cheat move by a player
+        @notice the move must carry its `newState`, an invalid move has no state for the Arbiter to derive
         @param signedMove The signed move to be validated
       */
-    function disputeMove(SignedGameMove calldata signedMove) external
-    signedByMover(signedMove)
-    {
+    function disputeMove(SignedGameMove calldata signedMove) external {
         GameMove calldata gm = signedMove.gameMove;
-        require(!_isValidGameMove(gm), "Arbiter: valid move disputed");
-
-        Game storage game = games[gm.gameId];
-        require(game.started && !game.finished, "Arbiter: game not started yet or already finished");
-        require(game.players[gm.player] != 0, "Arbiter: player not in game");
-
-        disqualifyPlayer(gm.gameId, gm.player);
+        MoveContext memory context = _moveContext(gm);
+        require(_moveSignedByMover(signedMove, context.digest), "Arbiter: first signature must belong to the player making the move");
+        require(!_isValidGameMove(gm, context), "Arbiter: valid move disputed");
+        _disqualifyCheater(gm.gameId, gm.player);
     }
 
+    /**
+        @notice Dispute a move contradicting a previous move its player has signed
+        @notice same nonce: the player has signed two different moves for the same turn
+        @notice consecutive nonces: the disputed move doesn't start from the state the previous move has led to
+        @notice or the transition is invalid according to the rules
+        @notice the rules are only asked if the moves are properly linked
+        @param signedMoves The previous move, signed by the disputed player among others, and the disputed move
+      */
     function disputeMoveWithHistory(SignedGameMove[2] calldata signedMoves) external {
-        //TODO add dispute move version based on comparison to previously signed moves
+        GameMove calldata previousMove = signedMoves[0].gameMove;
+        GameMove calldata disputedMove = signedMoves[1].gameMove;
+        uint256 gameId = disputedMove.gameId;
+        require(previousMove.gameId == gameId, "Arbiter: moves are for different games");
+        require(_isGameOn(gameId), "Arbiter: game not active");
+
+        MoveContext memory previousContext = _moveContext(previousMove);
+        MoveContext memory disputedContext = _moveContext(disputedMove);
+        require(_moveSignedByMover(signedMoves[1], disputedContext.digest), "Arbiter: first signature must belong to the player making the move");
+        require(_isSignedByPlayer(gameId, signedMoves[0].signatures, previousContext.digest, disputedMove.player), "Arbiter: previous move not signed by the disputed player");
+
+        if (previousMove.nonce == disputedMove.nonce) {
+            require(previousContext.digest != disputedContext.digest, "Arbiter: same move disputed");
+        } else {
+            require(previousMove.nonce + 1 == disputedMove.nonce, "Arbiter: moves are not in sequence");
+            require(previousContext.newStateHash != disputedContext.oldStateHash || !_isValidGameMove(disputedMove, disputedContext), "Arbiter: valid move disputed");
+        }
+        disqualifyPlayer(gameId, disputedMove.player);
     }
 
     /**
@@ -255,42 +410,48 @@ contract Arbiter is IGameJutsuArbiter {
         @notice first move must be signed by both players
         @notice second move must be signed at least by the player making the move
         @notice no timeout should be active for the game
+        @notice either move may leave `newState` empty, the Arbiter derives it and the signatures vouch for it
        */
     function initTimeout(SignedGameMove[2] calldata moves) payable external
-    firstMoveSignedByAll(moves)
-    lastMoveSignedByMover(moves)
     timeoutNotStarted(moves[0].gameMove.gameId)
-    movesInSequence(moves)
-    allValidGameMoves(moves)
     {
-        require(msg.value == DEFAULT_TIMEOUT_STAKE, "Arbiter: timeout stake mismatch");
-        uint256 gameId = moves[0].gameMove.gameId;
-        timeouts[gameId].stake = msg.value;
-        timeouts[gameId].gameMove = moves[1].gameMove;
-        timeouts[gameId].startTime = block.timestamp;
-        emit TimeoutStarted(gameId, moves[1].gameMove.player, moves[1].gameMove.nonce, block.timestamp + TIMEOUT);
+        (MoveContext memory lastMove,) = _validMoveContext(moves[1].gameMove);
+        MoveContext memory previousMove = _linkedMoveContext(moves[0].gameMove, moves[1].gameMove);
+        require(_isSignedByAllPlayersAndOnlyByPlayers(moves[0].gameMove.gameId, moves[0].signatures, previousMove.digest), "Arbiter: first move not signed by all players");
+        require(_moveSignedByMover(moves[1], lastMove.digest), "Arbiter: first signature must belong to the player making the move");
+        _requireMovesInSequence(moves[0].gameMove, previousMove, moves[1].gameMove, lastMove);
+        require(_isValidGameMove(moves[0].gameMove, previousMove), "Arbiter: invalid game move");
+        _startTimeout(moves[1].gameMove.gameId, moves[1].gameMove.player, moves[1].gameMove.nonce, lastMove.newStateHash);
+    }
+
+    /**
+        @notice same as `initTimeout` with the checkpoint standing for the move signed by both players
+        @notice the move must continue from the checkpoint and be signed at least by the player making it
+        @notice the move may leave `newState` empty
+       */
+    function initTimeoutFromCheckpoint(SignedGameMove calldata signedMove) payable external
+    timeoutNotStarted(signedMove.gameMove.gameId)
+    {
+        (MoveContext memory context,) = _validMoveContext(signedMove.gameMove);
+        require(_moveSignedByMover(signedMove, context.digest), "Arbiter: first signature must belong to the player making the move");
+        _requireContinuesCheckpoint(signedMove.gameMove, context);
+        _startTimeout(signedMove.gameMove.gameId, signedMove.gameMove.player, signedMove.gameMove.nonce, context.newStateHash);
     }
 
     /**
         @notice a single valid signed move is enough to resolve the timout
         @notice the move must be signed by the player whos turn it is
         @notice the move must continue the game from the move started the timeout
+        @notice the move may leave `newState` empty
        */
     function resolveTimeout(SignedGameMove calldata signedMove) external
     timeoutStarted(signedMove.gameMove.gameId)
     timeoutNotExpired(signedMove.gameMove.gameId)
-    signedByMover(signedMove)
-    onlyValidGameMove(signedMove.gameMove)
     onlyPlayer(signedMove)
     {
-        uint256 gameId = signedMove.gameMove.gameId;
-        GameMove storage timeoutMove = timeouts[gameId].gameMove;
-        require(timeoutMove.gameId == signedMove.gameMove.gameId, "Arbiter: game ids mismatch");
-        require(timeoutMove.nonce + 1 == signedMove.gameMove.nonce, "Arbiter: nonce mismatch");
-        require(timeoutMove.player != signedMove.gameMove.player, "Arbiter: same player");
-        require(keccak256(timeoutMove.newState) == keccak256(signedMove.gameMove.oldState), "Arbiter: state mismatch");
-        _clearTimeout(gameId);
-        emit TimeoutResolved(gameId, signedMove.gameMove.player, signedMove.gameMove.nonce);
+        (MoveContext memory context,) = _validMoveContext(signedMove.gameMove);
+        require(_moveSignedByMover(signedMove, context.digest), "Arbiter: first signature must belong to the player making the move");
+        _resolveTimeout(signedMove.gameMove.gameId, signedMove.gameMove.nonce, signedMove.gameMove.player, context.oldStateHash);
     }
 
     /**
@@ -300,17 +461,239 @@ contract Arbiter is IGameJutsuArbiter {
     function finalizeTimeout(uint256 gameId) external
     timeoutExpired(gameId)
     {
-        address loser = _opponent(gameId, timeouts[gameId].gameMove.player);
-        disqualifyPlayer(gameId, loser);
-        _clearTimeout(gameId);
+        _finalizeTimeout(gameId);
+    }
+
+    /**
+        @notice Finalize every expired timeout among the games, the rest are skipped
+        @param gameIds The IDs of the games to finalize the timeouts of
+        @return finalized Bitmap of the finalized ones, bit `i % 256` of word `i / 256` for `gameIds[i]`
+       */
+    function finalizeTimeouts(uint256[] calldata gameIds) external returns (uint256[] memory finalized) {
+        finalized = new uint256[]((gameIds.length + 255) / 256);
+        for (uint256 i = 0; i < gameIds.length; i++) {
+            if (_timeoutExpired(gameIds[i]) && _isGameOn(gameIds[i])) {
+                _finalizeTimeout(gameIds[i]);
+                finalized[i / 256] |= 1 << (i % 256);
+            }
+        }
+    }
+
+    /**
+        @notice `finishGame` for hash-chained moves, the new state of the head must be final
+        @notice the chain is checked by hashing, only the signatures over its last two moves are recovered
+        @param chain Moves up to the final one, see `ChainedMoves`
+      */
+    function finishGameChained(ChainedMoves calldata chain) external returns (address winner){
+        GameMove calldata lastMove = _chainHead(chain);
+        require(_isGameOn(lastMove.gameId), "Arbiter: game not active");
+        (, MoveContext memory head) = _authenticatedChain(chain);
+        (bool valid, bytes memory newState) = _transition(lastMove);
+        require(valid && head.oldStateHash != head.newStateHash && keccak256(newState) == head.newStateHash, "Arbiter: invalid game move");
+        return _settleFinalState(lastMove.gameId, lastMove.nonce + 1, newState);
+    }
+
+    /**
+        @notice `initTimeout` for hash-chained moves, the last two moves of the chain must be valid
+        @param chain Moves up to the last one of the complainer, see `ChainedMoves`
+      */
+    function initTimeoutChained(ChainedMoves calldata chain) payable external
+    timeoutNotStarted(_chainHead(chain).gameId)
+    {
+        (MoveContext memory previous, MoveContext memory head) = _authenticatedChain(chain);
+        GameMove calldata lastMove = _chainHead(chain);
+        require(_isValidGameMove(chain.moves[chain.moves.length - 2], previous) && _isValidGameMove(lastMove, head), "Arbiter: invalid game move");
+        _startTimeout(lastMove.gameId, lastMove.player, lastMove.nonce, head.newStateHash);
+    }
+
+    /**
+        @notice `finishGame` with both signed moves tightly packed, see `PackedGameMove` for the layout
+        @notice the moves are read in place from calldata: no ABI offsets, length words or padding
+        @param packedMoves 2 most recent signed moves, packed
+      */
+    function finishGamePacked(bytes calldata packedMoves) external returns (address winner){
+        (bytes calldata previous, bytes calldata last) = PackedGameMove.split(packedMoves);
+        uint256 gameId = PackedGameMove.gameId(last);
+        require(_isGameOn(gameId), "Arbiter: game not active");
+        (MoveContext memory lastMove, bytes memory newState) = _packedValidMoveContext(last);
+        MoveContext memory previousMove = _packedLinkedMoveContext(previous, last);
+        _requirePackedMovesInSequence(previous, previousMove, last, lastMove);
+        if (PackedGameMove.player(previous) == PackedGameMove.player(last)) {
+            require(_isPackedSignedByAllPlayersAndOnlyByPlayers(previous, previousMove.digest), "Arbiter: both moves from the same player and first move not signed by all players");
+        } else
+            require(_packedMoveSignedByMover(previous, previousMove.digest), "Arbiter: first move not signed by mover");
+        require(_packedMoveSignedByMover(last, lastMove.digest), "Arbiter: second move not signed by mover");
+        return _settleFinalState(gameId, PackedGameMove.nonce(last) + 1, newState);
+    }
+
+    /**
+        @notice `initTimeout` with both signed moves tightly packed, see `PackedGameMove` for the layout
+        @param packedMoves 2 most recent signed moves, packed
+      */
+    function initTimeoutPacked(bytes calldata packedMoves) payable external
+    timeoutNotStarted(PackedGameMove.gameId(packedMoves))
+    {
+        (bytes calldata previous, bytes calldata last) = PackedGameMove.split(packedMoves);
+        (MoveContext memory lastMove,) = _packedValidMoveContext(last);
+        MoveContext memory previousMove = _packedLinkedMoveContext(previous, last);
+        require(_isPackedSignedByAllPlayersAndOnlyByPlayers(previous, previousMove.digest), "Arbiter: first move not signed by all players");
+        require(_packedMoveSignedByMover(last, lastMove.digest), "Arbiter: first signature must belong to the player making the move");
+        _requirePackedMovesInSequence(previous, previousMove, last, lastMove);
+        require(_isValidPackedMove(previous, previousMove), "Arbiter: invalid game move");
+        _startTimeout(PackedGameMove.gameId(last), PackedGameMove.player(last), PackedGameMove.nonce(last), lastMove.newStateHash);
+    }
+
+    /**
+        @notice `resolveTimeout` with the signed move tightly packed, see `PackedGameMove` for the layout
+        @param packedMove The signed move, packed
+      */
+    function resolveTimeoutPacked(bytes calldata packedMove) external
+    timeoutStarted(PackedGameMove.gameId(packedMove))
+    timeoutNotExpired(PackedGameMove.gameId(packedMove))
+    {
+        bytes calldata signedMove = PackedGameMove.single(packedMove);
+        uint256 gameId = PackedGameMove.gameId(signedMove);
+        address player = PackedGameMove.player(signedMove);
+        require(_playerInGame(gameId, player), "Arbiter: player not in game");
+        (MoveContext memory context,) = _packedValidMoveContext(signedMove);
+        require(_packedMoveSignedByMover(signedMove, context.digest), "Arbiter: first signature must belong to the player making the move");
+        _resolveTimeout(gameId, PackedGameMove.nonce(signedMove), player, context.oldStateHash);
+    }
+
+    /**
+        @notice `disputeMove` with the signed move tightly packed, see `PackedGameMove` for the layout
+        @param packedMove The signed move, packed
+      */
+    function disputeMovePacked(bytes calldata packedMove) external {
+        bytes calldata signedMove = PackedGameMove.single(packedMove);
+        MoveContext memory context = _packedMoveContext(signedMove);
+        require(_packedMoveSignedByMover(signedMove, context.digest), "Arbiter: first signature must belong to the player making the move");
+        require(!_isValidPackedMove(signedMove, context), "Arbiter: valid move disputed");
+        _disqualifyCheater(PackedGameMove.gameId(signedMove), PackedGameMove.player(signedMove));
+    }
+
+    /**
+        @notice Top up the caller's balance, stakes for any number of games can be reserved from it
+       */
+    function deposit() external payable {
+        balances[msg.sender] += msg.value;
+        emit Deposit(msg.sender, msg.value);
+    }
+
+    /**
+        @notice Withdraw everything credited to the caller by all the games settled so far
+        @notice along with the deposits not reserved by any game
+       */
+    function withdraw() external {
+        uint256 amount = balances[msg.sender];
+        require(amount > 0, "Arbiter: nothing to withdraw");
+        balances[msg.sender] = 0;
+        Address.sendValue(payable(msg.sender), amount);
+        emit Withdrawal(msg.sender, amount);
     }
 
     /**
-        @notice Get addresses of players in a game
+        @notice What the Arbiter knows about the game, unpacked
+        @param gameId The ID of the game
+       */
+    function games(uint256 gameId) external view returns (IGameJutsuRules rules, uint256 stake, bool started, bool finished){
+        Game storage game = _games[gameId];
+        return (game.rules, game.stake, game.started, game.finished);
+    }
+
+    /**
+        @notice Records of any games, including the ones opened by signatures
+        @param gameIds The IDs of the games
+       */
+    function getGames(uint256[] calldata gameIds) external view returns (GameRecord[] memory records) {
+        records = new GameRecord[](gameIds.length);
+        for (uint256 i = 0; i < gameIds.length; i++) {
+            records[i] = _gameRecord(gameIds[i]);
+        }
+    }
+
+    /**
+        @notice Records of consecutive proposed games, the range is cut at `nextGameId`
+        @param fromGameId The ID of the first game
+        @param count How many games to return at most
+       */
+    function getGameRange(uint256 fromGameId, uint256 count) external view returns (GameRecord[] memory records) {
+        uint256 available = fromGameId < nextGameId ? nextGameId - fromGameId : 0;
+        records = new GameRecord[](Math.min(count, available));
+        for (uint256 i = 0; i < records.length; i++) {
+            records[i] = _gameRecord(fromGameId + i);
+        }
+    }
+
+    /**
+        @notice How the game has ended, 0 if it hasn't, 1 or 2 for the first or the second player winning, `OUTCOME_DRAW`
+        @param gameId The ID of the game
+       */
+    function gameOutcome(uint256 gameId) external view returns (uint8) {
+        return _games[gameId].outcome;
+    }
+
+    /**
+        @notice Gas every single call to the rules gets in the game, 0 if the game has no budget and the calls are not bounded
+        @param gameId The ID of the game
+       */
+    function rulesGasBudget(uint256 gameId) public view returns (uint256) {
+        return _rulesGasBudgets[gameId];
+    }
+
+    /**
+        @notice Worst-case gas a single rules call of the Arbiter takes in the given state, to size a rules gas budget
+        @notice every candidate move is measured the way the Arbiter validates moves, the state's outcome is measured too
+        @param rules The rules contract
+        @param state The state to measure in
+        @param playerId The player to make the moves, 0 or 1
+        @param moves Candidate moves, e.g. all the legal moves in the state
+        @return gasUsed The most gas any single call took
+       */
+    function measureRulesGas(IGameJutsuRules rules, IGameJutsuRules.GameState calldata state, uint8 playerId, bytes[] calldata moves) external view returns (uint256 gasUsed) {
+        IGameJutsuRules.GameState memory gameState = state;
+        if (ERC165Checker.supportsERC165InterfaceUnchecked(address(rules), type(IGameJutsuOutcomeRules).interfaceId)) {
+            gasUsed = _measuredCall(rules, abi.encodeWithSelector(IGameJutsuOutcomeRules.outcome.selector, gameState));
+        } else {
+            gasUsed = _measuredCall(rules, abi.encodeWithSelector(IGameJutsuRules.isFinal.selector, gameState));
+            for (uint8 i = 0; i < NUM_PLAYERS; i++) {
+                gasUsed = Math.max(gasUsed, _measuredCall(rules, abi.encodeWithSelector(IGameJutsuRules.isWin.selector, gameState, i)));
+            }
+        }
+        bool transitionRules = ERC165Checker.supportsERC165InterfaceUnchecked(address(rules), type(IGameJutsuTransitionRules).interfaceId);
+        for (uint256 i = 0; i < moves.length; i++) {
+            if (transitionRules) {
+                gasUsed = Math.max(gasUsed, _measuredCall(rules, abi.encodeWithSelector(IGameJutsuTransitionRules.validateAndTransition.selector, gameState, playerId, moves[i])));
+            } else {
+                gasUsed = Math.max(gasUsed, _measuredCall(rules, abi.encodeWithSelector(IGameJutsuRules.isValidMove.selector, gameState, playerId, moves[i])));
+                gasUsed = Math.max(gasUsed, _measuredCall(rules, abi.encodeWithSelector(IGameJutsuRules.transition.selector, gameState, playerId, moves[i])));
+            }
+        }
+    }
+
+    /**
+        @notice Get addresses of players in a game, they are kept once the game is finished
         @param gameId The ID of the game being played
        */
     function getPlayers(uint256 gameId) external view returns (address[2] memory){
-        return games[gameId].playersArray;
+        return _games[gameId].playersArray;
+    }
+
+    /**
+        @notice ID of a game opened by signatures, the EIP-712 hash of its terms
+        @param gameOpen The terms of the game
+       */
+    function gameOpenId(GameOpen calldata gameOpen) public view returns (uint256) {
+        bytes32 structHash = keccak256(abi.encode(
+                GAME_OPEN_TYPEHASH,
+                gameOpen.rules,
+                gameOpen.stake,
+                gameOpen.rulesGasBudget,
+                keccak256(abi.encode(gameOpen.players)),
+                gameOpen.deadline,
+                gameOpen.salt
+            ));
+        return uint256(ECDSA.toTypedDataHash(DOMAIN_SEPARATOR, structHash));
     }
 
     /**
@@ -318,7 +701,7 @@ contract Arbiter is IGameJutsuArbiter {
         @param gameMove The move to be validated
        */
     function isValidGameMove(GameMove calldata gameMove) external view returns (bool) {
-        return _isValidGameMove(gameMove);
+        return _isValidGameMove(gameMove, _moveContext(gameMove));
     }
 
     /**
@@ -330,112 +713,703 @@ contract Arbiter is IGameJutsuArbiter {
     }
 
     function disqualifyPlayer(uint256 gameId, address cheater) private {
-        require(games[gameId].players[cheater] != 0, "Arbiter: player not in game");
-        games[gameId].finished = true;
-        address winner = games[gameId].playersArray[0] == cheater ? games[gameId].playersArray[1] : games[gameId].playersArray[0];
-        payable(winner).transfer(games[gameId].stake);
+        uint8 cheaterId = _games[gameId].players[cheater];
+        require(cheaterId != 0, "Arbiter: player not in game");
+        address winner = _opponent(gameId, cheater);
+        balances[winner] += _games[gameId].stake;
+        _compactFinishedGame(gameId, 3 - cheaterId);
         emit GameFinished(gameId, winner, cheater, false);
         emit PlayerDisqualified(gameId, cheater);
     }
 
+    /**
+        @dev disqualifies the mover of a move proven invalid, the game must be on
+    */
+    function _disqualifyCheater(uint256 gameId, address cheater) private {
+        Game storage game = _games[gameId];
+        require(game.started && !game.finished, "Arbiter: game not started yet or already finished");
+        disqualifyPlayer(gameId, cheater);
+    }
+
     function _finishGame(uint256 gameId, address winner, address loser, bool draw) private {
-        games[gameId].finished = true;
+        uint8 outcome;
         if (draw) {
-            uint256 half = games[gameId].stake / 2;
-            uint256 theOtherHalf = games[gameId].stake - half;
-            payable(games[gameId].playersArray[0]).transfer(half);
-            payable(games[gameId].playersArray[1]).transfer(theOtherHalf);
+            uint256 half = _games[gameId].stake / 2;
+            uint256 theOtherHalf = _games[gameId].stake - half;
+            balances[_games[gameId].playersArray[0]] += half;
+            balances[_games[gameId].playersArray[1]] += theOtherHalf;
+            outcome = OUTCOME_DRAW;
         } else {
-            payable(winner).transfer(games[gameId].stake);
+            balances[winner] += _games[gameId].stake;
+            outcome = _games[gameId].players[winner];
         }
+        _compactFinishedGame(gameId, outcome);
         emit GameFinished(gameId, winner, loser, draw);
     }
 
+    /**
+        @dev leaves the game's first slot with the outcome and `playersArray` as a tombstone for clients to read
+        @dev deletes the `players` entries of the players and of their session addresses, and every other per-game record
+        @dev there are at most `MAX_SESSION_ADDRESSES` session addresses per player to delete, the settlement cost stays bounded
+        @dev a timeout still running is cleared with its stake returned, nothing can resolve or finalize it anymore
+    */
+    function _compactFinishedGame(uint256 gameId, uint8 outcome) private {
+        Game storage game = _games[gameId];
+        game.finished = true;
+        game.outcome = outcome;
+        delete game.players[game.playersArray[0]];
+        delete game.players[game.playersArray[1]];
+        for (uint256 playerId = 0; playerId < 2; playerId++) {
+            address[] storage sessionAddresses = _sessionAddresses[gameId][playerId];
+            for (uint256 i = 0; i < sessionAddresses.length; i++) {
+                delete game.players[sessionAddresses[i]];
+            }
+        }
+        delete _sessionAddresses[gameId];
+        delete checkpoints[gameId];
+        delete moveLogs[gameId];
+        delete _rulesGasBudgets[gameId];
+        if (_timeoutStarted(gameId)) {
+            _clearTimeout(gameId);
+        }
+    }
+
+    function _startTimeout(uint256 gameId, address player, uint256 nonce, bytes32 newStateHash) private {
+        require(msg.value == DEFAULT_TIMEOUT_STAKE, "Arbiter: timeout stake mismatch");
+        timeouts[gameId] = Timeout(block.timestamp, player, SafeCast.toUint96(msg.value), nonce, newStateHash);
+        emit TimeoutStarted(gameId, player, nonce, block.timestamp + TIMEOUT);
+    }
+
+    /**
+        @dev the move answering the timeout must be validated and its signature checked by the caller
+    */
+    function _resolveTimeout(uint256 gameId, uint256 nonce, address player, bytes32 oldStateHash) private {
+        Timeout storage timeout = timeouts[gameId];
+        require(timeout.nonce + 1 == nonce, "Arbiter: nonce mismatch");
+        require(timeout.player != player, "Arbiter: same player");
+        require(timeout.stateHash == oldStateHash, "Arbiter: state mismatch");
+        _clearTimeout(gameId);
+        emit TimeoutResolved(gameId, player, nonce);
+    }
+
+    /**
+        @dev the state must have been reached by a move validated by the caller, it must be final
+    */
+    function _settleFinalState(uint256 gameId, uint256 nonce, bytes memory state) private returns (address winner) {
+        bool settled;
+        (settled, winner) = _trySettleFinalState(gameId, nonce, state);
+        require(settled, "Arbiter: game state not final");
+    }
+
+    /**
+        @dev `_settleFinalState` leaving the game untouched if the state is not final
+    */
+    function _trySettleFinalState(uint256 gameId, uint256 nonce, bytes memory state) private returns (bool settled, address winner) {
+        IGameJutsuRules.GameState memory finalState = IGameJutsuRules.GameState(gameId, nonce, state);
+        (IGameJutsuOutcomeRules.Status status, uint8 winnerIndex) = _outcome(finalState);
+        if (status == IGameJutsuOutcomeRules.Status.InProgress) {
+            return (false, address(0));
+        }
+        if (status == IGameJutsuOutcomeRules.Status.Win) {
+            winner = _games[gameId].playersArray[winnerIndex];
+            address loser = _opponent(gameId, winner);
+            _finishGame(gameId, winner, loser, false);
+            return (true, winner);
+        }
+        _finishGame(gameId, address(0), address(0), true);
+        return (true, address(0));
+    }
+
+    /**
+        @dev `finishGame` for one entry of a batch, false instead of a revert if the moves can't finish the game
+    */
+    function _tryFinishGame(SignedGameMove[2] calldata signedMoves) private returns (bool settled) {
+        (string memory failure, bytes memory newState) = _finishingState(signedMoves);
+        if (bytes(failure).length != 0) {
+            return false;
+        }
+        (settled,) = _trySettleFinalState(signedMoves[1].gameMove.gameId, signedMoves[1].gameMove.nonce + 1, newState);
+    }
+
+    /**
+        @dev every check of `finishGame` but the final state, in the same order
+        @return failure the revert reason of the first check failed, empty if all pass
+        @return newState the state reached by the last move according to the rules
+    */
+    function _finishingState(SignedGameMove[2] calldata signedMoves) private view returns (string memory failure, bytes memory newState) {
+        GameMove calldata previousMove = signedMoves[0].gameMove;
+        GameMove calldata lastMove = signedMoves[1].gameMove;
+        if (!_isGameOn(lastMove.gameId)) {
+            return ("Arbiter: game not active", "");
+        }
+        bool valid;
+        (valid, newState) = _transition(lastMove);
+        if (!valid) {
+            return ("Arbiter: invalid game move", "");
+        }
+        MoveContext memory last = _moveContext(lastMove, keccak256(newState));
+        if (!_isNewState(last, lastMove.newState)) {
+            return ("Arbiter: invalid game move", "");
+        }
+        MoveContext memory previous = _linkedMoveContext(previousMove, lastMove);
+        if (previousMove.gameId != lastMove.gameId) {
+            return ("Arbiter: moves are for different games", "");
+        }
+        if (!_isInSequence(previousMove.nonce, previous, lastMove.nonce, last)) {
+            return ("Arbiter: moves are not in sequence", "");
+        }
+        if (previousMove.player == lastMove.player) {
+            if (!_isSignedByAllPlayersAndOnlyByPlayers(previousMove.gameId, signedMoves[0].signatures, previous.digest)) {
+                return ("Arbiter: both moves from the same player and first move not signed by all players", "");
+            }
+        } else if (!_moveSignedByMover(signedMoves[0], previous.digest)) {
+            return ("Arbiter: first move not signed by mover", "");
+        }
+        if (!_moveSignedByMover(signedMoves[1], last.digest)) {
+            return ("Arbiter: second move not signed by mover", "");
+        }
+    }
+
+    function _gameRecord(uint256 gameId) private view returns (GameRecord memory) {
+        Game storage game = _games[gameId];
+        Timeout storage timeout = timeouts[gameId];
+        return GameRecord(
+            gameId,
+            game.rules,
+            game.stake,
+            game.started,
+            game.finished,
+            game.outcome,
+            game.playersArray,
+            timeout.startTime,
+            timeout.player,
+            timeout.nonce
+        );
+    }
+
+    function _proposeGame(IGameJutsuRules rules, uint256 stake, address[] calldata sessionAddresses) private returns (uint256 gameId) {
+        gameId = nextGameId;
+        Game storage game = _games[gameId];
+        game.rules = rules;
+        game.players[msg.sender] = 1;
+        game.playersArray[0] = msg.sender;
+        require(stake * NUM_PLAYERS <= type(uint72).max, "Arbiter: stake too high");
+        game.stake = uint72(stake);
+        nextGameId++;
+        emit GameProposed(address(rules), gameId, stake, msg.sender);
+        if (sessionAddresses.length > 0) {
+            for (uint256 i = 0; i < sessionAddresses.length; i++) {
+                _registerSessionAddress(gameId, msg.sender, sessionAddresses[i]);
+            }
+        }
+    }
+
+    function _acceptGame(uint256 gameId, address[] calldata sessionAddresses) private {
+        Game storage game = _games[gameId];
+        require(game.players[msg.sender] == 0, "Arbiter: player already in game");
+        require(game.started == false, "Arbiter: game already started");
+        require(game.playersArray[0] != address(0), "Arbiter: game not proposed");
+        balances[msg.sender] += msg.value;
+        _reserveStake(msg.sender, game.stake);
+        game.players[msg.sender] = 2;
+        game.playersArray[1] = msg.sender;
+        game.stake *= 2;
+        game.started = true;
+
+        emit GameStarted(address(game.rules), gameId, game.stake, game.playersArray);
+        if (sessionAddresses.length > 0) {
+            for (uint256 i = 0; i < sessionAddresses.length; i++) {
+                _registerSessionAddress(gameId, msg.sender, sessionAddresses[i]);
+            }
+        }
+    }
+
+    /**
+        @dev moves the stake from the player's balance into a game, settlements credit it back to the balances
+    */
+    function _reserveStake(address player, uint256 stake) private {
+        require(balances[player] >= stake, "Arbiter: insufficient balance");
+        balances[player] -= stake;
+    }
+
     function _registerSessionAddress(uint256 gameId, address player, address sessionAddress) private {
-        games[gameId].players[sessionAddress] = games[gameId].players[player];
+        uint8 oneBasedPlayerId = _games[gameId].players[player];
+        address[] storage sessionAddresses = _sessionAddresses[gameId][oneBasedPlayerId - 1];
+        require(sessionAddresses.length < MAX_SESSION_ADDRESSES, "Arbiter: too many session addresses");
+        sessionAddresses.push(sessionAddress);
+        _games[gameId].players[sessionAddress] = oneBasedPlayerId;
         emit SessionAddressRegistered(gameId, player, sessionAddress);
     }
 
+    /**
+        @dev the settlement clears the timeout returning its stake
+    */
+    function _finalizeTimeout(uint256 gameId) private {
+        address loser = _opponent(gameId, timeouts[gameId].player);
+        disqualifyPlayer(gameId, loser);
+    }
+
     function _clearTimeout(uint256 gameId) private {
-        Address.sendValue(payable(timeouts[gameId].gameMove.player), timeouts[gameId].stake);
+        balances[timeouts[gameId].player] += timeouts[gameId].stake;
         delete timeouts[gameId];
     }
 
-    function getSigners(SignedGameMove calldata signedMove) private view returns (address[] memory) {
-        address[] memory signers = new address[](signedMove.signatures.length);
-        for (uint256 i = 0; i < signedMove.signatures.length; i++) {
-            signers[i] = recoverAddress(signedMove.gameMove, signedMove.signatures[i]);
+    /**
+        @dev accepts both 65-byte `(r, s, v)` and EIP-2098 compact 64-byte `(r, vs)` signatures
+        @dev the two forms of a signature recover the same signer, nothing here relies on signatures being unique
+    */
+    function _recover(bytes32 digest, bytes calldata signature) private pure returns (address) {
+        if (signature.length == 64) {
+            return ECDSA.recover(digest, bytes32(signature[0 : 32]), bytes32(signature[32 : 64]));
+        }
+        return ECDSA.recover(digest, signature);
+    }
+
+    function getSigners(bytes[] calldata signatures, bytes32 digest) private pure returns (address[] memory) {
+        address[] memory signers = new address[](signatures.length);
+        for (uint256 i = 0; i < signatures.length; i++) {
+            signers[i] = _recover(digest, signatures[i]);
         }
         return signers;
     }
 
-    function recoverAddress(GameMove calldata gameMove, bytes calldata signature) private view returns (address){
+    /**
+        @dev hashes the states and the EIP-712 struct once, every check of the move reuses the result
+    */
+    function _moveContext(GameMove calldata gameMove) private view returns (MoveContext memory context){
+        return _moveContext(gameMove, keccak256(gameMove.newState));
+    }
+
+    /**
+        @dev the digest commits to `newStateHash` exactly as it commits to a shipped `newState`
+        @dev so a signature only recovers to the mover if the mover has signed the state behind the hash
+    */
+    function _moveContext(GameMove calldata gameMove, bytes32 newStateHash) private view returns (MoveContext memory){
+        return _moveContext(gameMove.gameId, gameMove.nonce, gameMove.player, gameMove.oldState, newStateHash, gameMove.move);
+    }
+
+    /**
+        @dev the fields of a move, ABI-encoded or packed, hash to the same digest
+    */
+    function _moveContext(
+        uint256 gameId,
+        uint256 nonce,
+        address player,
+        bytes calldata oldState,
+        bytes32 newStateHash,
+        bytes calldata move
+    ) private view returns (MoveContext memory context){
         //        https://codesandbox.io/s/gamejutsu-moves-eip712-no-nested-types-p5fnzf?file=/src/index.js
+        context.oldStateHash = keccak256(oldState);
+        context.newStateHash = newStateHash;
         bytes32 structHash = keccak256(abi.encode(
                 GAME_MOVE_TYPEHASH,
+                gameId,
+                nonce,
+                player,
+                context.oldStateHash,
+                context.newStateHash,
+                keccak256(move)
+            ));
+        context.digest = ECDSA.toTypedDataHash(DOMAIN_SEPARATOR, structHash);
+    }
+
+    /**
+        @dev a move without `newState` followed by `nextMove` has led to the old state of `nextMove`
+    */
+    function _linkedMoveContext(GameMove calldata gameMove, GameMove calldata nextMove) private view returns (MoveContext memory){
+        if (gameMove.newState.length == 0) {
+            return _moveContext(gameMove, keccak256(nextMove.oldState));
+        }
+        return _moveContext(gameMove);
+    }
+
+    /**
+        @dev runs the rules first and takes the new state from them, a shipped `newState` must match it
+        @dev reverts on an invalid move, the signatures are checked by the caller against the returned digest
+    */
+    function _validMoveContext(GameMove calldata gameMove) private view returns (MoveContext memory context, bytes memory newState){
+        bool valid;
+        (valid, newState) = _transition(gameMove);
+        require(valid, "Arbiter: invalid game move");
+        context = _moveContext(gameMove, keccak256(newState));
+        _requireNewState(context, gameMove.newState);
+    }
+
+    /**
+        @dev the move must change the state, a shipped `newState` must be the one derived by the rules
+    */
+    function _requireNewState(MoveContext memory context, bytes calldata shippedNewState) private pure {
+        require(_isNewState(context, shippedNewState), "Arbiter: invalid game move");
+    }
+
+    function _isNewState(MoveContext memory context, bytes calldata shippedNewState) private pure returns (bool) {
+        return context.oldStateHash != context.newStateHash &&
+            (shippedNewState.length == 0 || keccak256(shippedNewState) == context.newStateHash);
+    }
+
+    /**
+        @dev the `ChainedGameMove` digest of a move, the struct hash is what the next move in the chain commits to
+    */
+    function _chainedMoveContext(GameMove calldata gameMove, bytes32 newStateHash, bytes32 previousMoveHash) private view returns (MoveContext memory context, bytes32 structHash){
+        context.oldStateHash = keccak256(gameMove.oldState);
+        context.newStateHash = newStateHash;
+        structHash = keccak256(abi.encode(
+                CHAINED_GAME_MOVE_TYPEHASH,
                 gameMove.gameId,
                 gameMove.nonce,
                 gameMove.player,
-                keccak256(gameMove.oldState),
-                keccak256(gameMove.newState),
-                keccak256(gameMove.move)
+                context.oldStateHash,
+                context.newStateHash,
+                keccak256(gameMove.move),
+                previousMoveHash
             ));
-        bytes32 digest = ECDSA.toTypedDataHash(DOMAIN_SEPARATOR, structHash);
-        return ECDSA.recover(digest, signature);
+        context.digest = ECDSA.toTypedDataHash(DOMAIN_SEPARATOR, structHash);
+    }
+
+    /**
+        @dev hashes the whole chain, recovers only the signatures over its last two moves
+        @dev the head must be signed by its mover, the opponent must sign either the head or the move before it
+        @return previous context of the move before the head
+        @return head context of the last move
+    */
+    function _authenticatedChain(ChainedMoves calldata chain) private view returns (MoveContext memory previous, MoveContext memory head) {
+        GameMove calldata headMove = _chainHead(chain);
+        GameMove[] calldata moves = chain.moves;
+        bytes32 chainHash = chain.previousMoveHash;
+        for (uint256 i = 0; i < moves.length; i++) {
+            previous = head;
+            bytes32 newStateHash = i + 1 < moves.length && moves[i].newState.length == 0 ?
+                keccak256(moves[i + 1].oldState) :
+                keccak256(moves[i].newState);
+            (head, chainHash) = _chainedMoveContext(moves[i], newStateHash, chainHash);
+            if (i > 0) {
+                _requireMovesInSequence(moves[i - 1], previous, moves[i], head);
+            }
+        }
+
+        uint256 gameId = headMove.gameId;
+        require(
+            _playerInGame(gameId, headMove.player) &&
+            chain.headSignatures.length > 0 &&
+            _signedByMover(gameId, headMove.player, chain.headSignatures[0], head.digest),
+            "Arbiter: head not signed by mover"
+        );
+        // the first head signature recovers to the mover, only the ones after it can be the opponent's
+        address opponent = _opponent(gameId, headMove.player);
+        require(
+            _isSignedByPlayer(gameId, chain.previousSignatures, previous.digest, opponent) ||
+            _isSignedByPlayer(gameId, chain.headSignatures, head.digest, opponent),
+            "Arbiter: chain not signed by all players"
+        );
+    }
+
+    /**
+        @dev the last move of the chain, a chain has at least the two moves its signatures are over
+    */
+    function _chainHead(ChainedMoves calldata chain) private pure returns (GameMove calldata) {
+        require(chain.moves.length >= 2, "Arbiter: chain too short");
+        return chain.moves[chain.moves.length - 1];
+    }
+
+    function _requireContinuesCheckpoint(GameMove calldata move, MoveContext memory context) private view {
+        Checkpoint storage current = checkpoints[move.gameId];
+        require(current.stateHash != 0 && current.nonce == move.nonce && current.stateHash == context.oldStateHash, "Arbiter: move does not continue from the checkpoint");
+    }
+
+    function _requireMovesInSequence(
+        GameMove calldata currentMove,
+        MoveContext memory currentContext,
+        GameMove calldata nextMove,
+        MoveContext memory nextContext
+    ) private pure {
+        _requireInSequence(currentMove.gameId, currentMove.nonce, currentContext, nextMove.gameId, nextMove.nonce, nextContext);
+    }
+
+    function _requireInSequence(
+        uint256 gameId,
+        uint256 nonce,
+        MoveContext memory context,
+        uint256 nextGameId,
+        uint256 nextNonce,
+        MoveContext memory nextContext
+    ) private pure {
+        require(gameId == nextGameId, "Arbiter: moves are for different games");
+        require(_isInSequence(nonce, context, nextNonce, nextContext), "Arbiter: moves are not in sequence");
+    }
+
+    function _isInSequence(uint256 nonce, MoveContext memory context, uint256 nextNonce, MoveContext memory nextContext) private pure returns (bool) {
+        return nonce + 1 == nextNonce && context.newStateHash == nextContext.oldStateHash;
+    }
+
+    /**
+        @dev `_moveContext` of a packed signed move
+    */
+    function _packedMoveContext(bytes calldata signedMove) private view returns (MoveContext memory){
+        return _packedMoveContext(signedMove, keccak256(PackedGameMove.newState(signedMove)));
+    }
+
+    function _packedMoveContext(bytes calldata signedMove, bytes32 newStateHash) private view returns (MoveContext memory){
+        return _moveContext(
+            PackedGameMove.gameId(signedMove),
+            PackedGameMove.nonce(signedMove),
+            PackedGameMove.player(signedMove),
+            PackedGameMove.oldState(signedMove),
+            newStateHash,
+            PackedGameMove.move(signedMove)
+        );
+    }
+
+    /**
+        @dev `_linkedMoveContext` of packed signed moves
+    */
+    function _packedLinkedMoveContext(bytes calldata signedMove, bytes calldata nextMove) private view returns (MoveContext memory){
+        if (PackedGameMove.newState(signedMove).length == 0) {
+            return _packedMoveContext(signedMove, keccak256(PackedGameMove.oldState(nextMove)));
+        }
+        return _packedMoveContext(signedMove);
+    }
+
+    /**
+        @dev `_validMoveContext` of a packed signed move
+    */
+    function _packedValidMoveContext(bytes calldata signedMove) private view returns (MoveContext memory context, bytes memory newState){
+        bool valid;
+        (valid, newState) = _packedTransition(signedMove);
+        require(valid, "Arbiter: invalid game move");
+        context = _packedMoveContext(signedMove, keccak256(newState));
+        _requireNewState(context, PackedGameMove.newState(signedMove));
+    }
+
+    function _requirePackedMovesInSequence(
+        bytes calldata currentMove,
+        MoveContext memory currentContext,
+        bytes calldata nextMove,
+        MoveContext memory nextContext
+    ) private pure {
+        _requireInSequence(
+            PackedGameMove.gameId(currentMove),
+            PackedGameMove.nonce(currentMove),
+            currentContext,
+            PackedGameMove.gameId(nextMove),
+            PackedGameMove.nonce(nextMove),
+            nextContext
+        );
+    }
+
+    /**
+        @dev `_isValidGameMove` of a packed signed move
+    */
+    function _isValidPackedMove(bytes calldata signedMove, MoveContext memory context) private view returns (bool) {
+        if (context.oldStateHash == context.newStateHash) {
+            return false;
+        }
+        (bool valid, bytes memory newState) = _packedTransition(signedMove);
+        return valid && keccak256(newState) == context.newStateHash;
+    }
+
+    function _packedTransition(bytes calldata signedMove) private view returns (bool valid, bytes memory newState) {
+        IGameJutsuRules.GameState memory oldGameState = IGameJutsuRules.GameState(PackedGameMove.gameId(signedMove), PackedGameMove.nonce(signedMove), PackedGameMove.oldState(signedMove));
+        return _transition(oldGameState, PackedGameMove.player(signedMove), PackedGameMove.move(signedMove));
+    }
+
+    function _packedMoveSignedByMover(bytes calldata signedMove, bytes32 digest) private view returns (bool) {
+        return _signedByMover(PackedGameMove.gameId(signedMove), PackedGameMove.player(signedMove), PackedGameMove.signature(signedMove, 0), digest);
+    }
+
+    function _isPackedSignedByAllPlayersAndOnlyByPlayers(bytes calldata signedMove, bytes32 digest) private view returns (bool) {
+        return PackedGameMove.signatureCount(signedMove) == NUM_PLAYERS && _areBothPlayers(
+            PackedGameMove.gameId(signedMove),
+            _recover(digest, PackedGameMove.signature(signedMove, 0)),
+            _recover(digest, PackedGameMove.signature(signedMove, 1))
+        );
     }
 
     function _opponent(uint256 gameId, address player) private view returns (address){
-        return games[gameId].playersArray[2 - games[gameId].players[player]];
+        return _games[gameId].playersArray[2 - _games[gameId].players[player]];
     }
 
     /**
         @dev checks only state transition validity, all the signatures are checked elsewhere
     */
-    function _isValidGameMove(GameMove calldata move) private view returns (bool) {
-        Game storage game = games[move.gameId];
-        IGameJutsuRules.GameState memory oldGameState = IGameJutsuRules.GameState(move.gameId, move.nonce, move.oldState);
-        return keccak256(move.oldState) != keccak256(move.newState) &&
-        game.started &&
-        !game.finished &&
-        game.players[move.player] != 0 &&
-        game.rules.isValidMove(oldGameState, game.players[move.player] - 1, move.move) &&
-        keccak256(game.rules.transition(oldGameState, game.players[move.player] - 1, move.move).state) == keccak256(move.newState);
+    function _isValidGameMove(GameMove calldata move, MoveContext memory context) private view returns (bool) {
+        if (context.oldStateHash == context.newStateHash) {
+            return false;
+        }
+        (bool valid, bytes memory newState) = _transition(move);
+        return valid && keccak256(newState) == context.newStateHash;
+    }
+
+    /**
+        @dev validity and the new state according to the rules, a single call if the rules support it
+        @dev rules returning malformed data, or reverting or running out of the game's gas budget, make the move invalid
+        @dev in a game without a budget a reverting rules call reverts the caller, see `_rulesCall`
+    */
+    function _transition(GameMove calldata move) private view returns (bool valid, bytes memory newState) {
+        return _transition(IGameJutsuRules.GameState(move.gameId, move.nonce, move.oldState), move.player, move.move);
+    }
+
+    function _transition(IGameJutsuRules.GameState memory oldGameState, address player, bytes calldata move) private view returns (bool valid, bytes memory newState) {
+        Game storage game = _games[oldGameState.gameId];
+        uint8 oneBasedPlayerId = game.players[player];
+        if (!game.started || game.finished || oneBasedPlayerId == 0) {
+            return (false, "");
+        }
+        bool success;
+        bytes memory result;
+        if (ERC165Checker.supportsERC165InterfaceUnchecked(address(game.rules), type(IGameJutsuTransitionRules).interfaceId)) {
+            (success, result) = _rulesCall(oldGameState.gameId, abi.encodeWithSelector(IGameJutsuTransitionRules.validateAndTransition.selector, oldGameState, oneBasedPlayerId - 1, move));
+            if (!success || !_isBoolAndBytesResult(result)) {
+                return (false, "");
+            }
+            return abi.decode(result, (bool, bytes));
+        }
+        (success, result) = _rulesCall(oldGameState.gameId, abi.encodeWithSelector(IGameJutsuRules.isValidMove.selector, oldGameState, oneBasedPlayerId - 1, move));
+        if (!success || !_isBoolResult(result) || !abi.decode(result, (bool))) {
+            return (false, "");
+        }
+        (success, result) = _rulesCall(oldGameState.gameId, abi.encodeWithSelector(IGameJutsuRules.transition.selector, oldGameState, oneBasedPlayerId - 1, move));
+        if (!success || !_isGameStateResult(result)) {
+            return (false, "");
+        }
+        return (true, abi.decode(result, (IGameJutsuRules.GameState)).state);
+    }
+
+    /**
+        @dev a single `outcome` call if the rules support it, `isFinal` and `isWin` for every player otherwise
+        @dev rules returning malformed data, or reverting or running out of the game's gas budget, leave the game in progress
+        @dev in a game without a budget a reverting rules call reverts the caller, see `_rulesCall`
+    */
+    function _outcome(IGameJutsuRules.GameState memory state) private view returns (IGameJutsuOutcomeRules.Status, uint8) {
+        IGameJutsuRules rules = _games[state.gameId].rules;
+        bool success;
+        bytes memory result;
+        if (ERC165Checker.supportsERC165InterfaceUnchecked(address(rules), type(IGameJutsuOutcomeRules).interfaceId)) {
+            (success, result) = _rulesCall(state.gameId, abi.encodeWithSelector(IGameJutsuOutcomeRules.outcome.selector, state));
+            if (!success || !_isOutcomeResult(result)) {
+                return (IGameJutsuOutcomeRules.Status.InProgress, 0);
+            }
+            return abi.decode(result, (IGameJutsuOutcomeRules.Status, uint8));
+        }
+        (success, result) = _rulesCall(state.gameId, abi.encodeWithSelector(IGameJutsuRules.isFinal.selector, state));
+        if (!success || !_isBoolResult(result) || !abi.decode(result, (bool))) {
+            return (IGameJutsuOutcomeRules.Status.InProgress, 0);
+        }
+        for (uint8 i = 0; i < NUM_PLAYERS; i++) {
+            (success, result) = _rulesCall(state.gameId, abi.encodeWithSelector(IGameJutsuRules.isWin.selector, state, i));
+            if (success && _isBoolResult(result) && abi.decode(result, (bool))) {
+                return (IGameJutsuOutcomeRules.Status.Win, i);
+            }
+        }
+        return (IGameJutsuOutcomeRules.Status.Draw, 0);
+    }
+
+    /**
+        @dev a `staticcall` to the game's rules bounded by the game's rules gas budget
+        @dev reverts if the call may have got less than the whole budget, a caller can't starve a call into failing
+        @dev games without a budget forward all the gas and bubble up a revert, only a successful call returns
+    */
+    function _rulesCall(uint256 gameId, bytes memory data) private view returns (bool success, bytes memory result) {
+        uint256 gasBudget = _rulesGasBudgets[gameId];
+        if (gasBudget == 0) {
+            return (true, Address.functionStaticCall(address(_games[gameId].rules), data));
+        }
+        (success, result) = address(_games[gameId].rules).staticcall{gas : gasBudget}(data);
+        require(success || gasleft() > gasBudget / 63, "Arbiter: not enough gas for the rules");
+    }
+
+    /**
+        @dev a failed call counts as 0, with a budget it makes the move invalid or leaves the game in progress
+    */
+    function _measuredCall(IGameJutsuRules rules, bytes memory data) private view returns (uint256 gasUsed) {
+        gasUsed = gasleft();
+        (bool success,) = address(rules).staticcall(data);
+        gasUsed = success ? gasUsed - gasleft() : 0;
+    }
+
+    /**
+        @dev the rules' return data is checked before `abi.decode`, which would revert on what these reject
+    */
+    function _isBoolResult(bytes memory result) private pure returns (bool) {
+        return result.length >= 32 && _resultWord(result, 0) <= 1;
+    }
+
+    /// @dev `(bool, bytes)` returned by `validateAndTransition`
+    function _isBoolAndBytesResult(bytes memory result) private pure returns (bool) {
+        return _isBoolResult(result) && result.length >= 64 && _isBytesResult(result, 0, 32);
+    }
+
+    /// @dev `GameState` returned by `transition`: its offset, then `gameId`, `nonce` and the offset of `state`
+    function _isGameStateResult(bytes memory result) private pure returns (bool) {
+        if (result.length < 96) {
+            return false;
+        }
+        uint256 offset = _resultWord(result, 0);
+        return offset <= result.length - 96 && _isBytesResult(result, offset, offset + 64);
+    }
+
+    /// @dev `(Status, uint8)` returned by `outcome`, the winner of a won game must be one of the players
+    function _isOutcomeResult(bytes memory result) private view returns (bool) {
+        if (result.length < 64) {
+            return false;
+        }
+        uint256 status = _resultWord(result, 0);
+        uint256 winnerIndex = _resultWord(result, 32);
+        return status <= uint256(IGameJutsuOutcomeRules.Status.Draw)
+            && winnerIndex <= type(uint8).max
+            && (status != uint256(IGameJutsuOutcomeRules.Status.Win) || winnerIndex < NUM_PLAYERS);
+    }
+
+    /**
+        @dev whether the `bytes` with its offset from `base` in the word at `head` fits in `result`
+        @dev `head + 32` and `base` must not exceed the length of `result`
+    */
+    function _isBytesResult(bytes memory result, uint256 base, uint256 head) private pure returns (bool) {
+        uint256 offset = _resultWord(result, head);
+        if (offset > result.length - base || result.length - base - offset < 32) {
+            return false;
+        }
+        return _resultWord(result, base + offset) <= result.length - base - offset - 32;
+    }
+
+    function _resultWord(bytes memory result, uint256 offset) private pure returns (uint256 word) {
+        assembly {
+            word := mload(add(add(result, 32), offset))
+        }
     }
 
     /**
         @dev checks state transition validity and signatures, first signature must be by the player making the move
     */
     function _isValidSignedMove(SignedGameMove calldata move) private view returns (bool) {
-        if (!_moveSignedByMover(move)) {
+        MoveContext memory context = _moveContext(move.gameMove);
+        if (!_moveSignedByMover(move, context.digest)) {
             return false;
         }
 
         for (uint i = 1; i < move.signatures.length; i++) {
-            if (!_playerInGame(move.gameMove.gameId, recoverAddress(move.gameMove, move.signatures[i]))) {
+            if (!_playerInGame(move.gameMove.gameId, _recover(context.digest, move.signatures[i]))) {
                 return false;
             }
         }
-        return _isValidGameMove(move.gameMove);
+        return _isValidGameMove(move.gameMove, context);
     }
 
     function _isGameOn(uint256 gameId) private view returns (bool) {
-        return games[gameId].started && !games[gameId].finished;
+        return _games[gameId].started && !_games[gameId].finished;
     }
 
-    function _isSignedByAllPlayersAndOnlyByPlayers(SignedGameMove calldata signedMove) private view returns (bool) {
-        address[] memory signers = getSigners(signedMove);
-        bool[2] memory signersPresent;
-        if (signers.length != NUM_PLAYERS) {
-            return false;
-        }
-        for (uint256 i = 0; i < signers.length; i++) {
-            uint8 oneBasedPlayerId = games[signedMove.gameMove.gameId].players[signers[i]];
-            if (oneBasedPlayerId == 0) {
-                return false;
-            }
-            signersPresent[oneBasedPlayerId - 1] = true;
-        }
-        return signersPresent[0] && signersPresent[1];
+    function _isSignedByAllPlayersAndOnlyByPlayers(uint256 gameId, bytes[] calldata signatures, bytes32 digest) private view returns (bool) {
+        return signatures.length == NUM_PLAYERS && _areBothPlayers(gameId, _recover(digest, signatures[0]), _recover(digest, signatures[1]));
+    }
+
+    /**
+        @dev 2 player games only
+    */
+    function _areBothPlayers(uint256 gameId, address first, address second) private view returns (bool) {
+        uint8 firstId = _games[gameId].players[first];
+        uint8 secondId = _games[gameId].players[second];
+        return firstId != 0 && secondId != 0 && firstId != secondId;
     }
 
     function _timeoutStarted(uint256 gameId) private view returns (bool) {
@@ -446,22 +1420,28 @@ contract Arbiter is IGameJutsuArbiter {
         return _timeoutStarted(gameId) && timeouts[gameId].startTime + TIMEOUT < block.timestamp;
     }
 
-    function _allValidGameMoves(SignedGameMove[2] calldata moves) private view returns (bool) {
-        for (uint256 i = 0; i < moves.length; i++) {
-            if (!_isValidGameMove(moves[i].gameMove)) {
-                return false;
+    function _isSignedByPlayer(uint256 gameId, bytes[] calldata signatures, bytes32 digest, address player) private view returns (bool) {
+        uint8 oneBasedPlayerId = _games[gameId].players[player];
+        if (oneBasedPlayerId == 0) {
+            return false;
+        }
+        for (uint256 i = 0; i < signatures.length; i++) {
+            if (_games[gameId].players[_recover(digest, signatures[i])] == oneBasedPlayerId) {
+                return true;
             }
         }
-        return true;
+        return false;
+    }
+
+    function _moveSignedByMover(SignedGameMove calldata move, bytes32 digest) private view returns (bool) {
+        return move.signatures.length > 0 && _signedByMover(move.gameMove.gameId, move.gameMove.player, move.signatures[0], digest);
     }
 
-    function _moveSignedByMover(SignedGameMove calldata move) private view returns (bool) {
-        address signer = recoverAddress(move.gameMove, move.signatures[0]);
-        uint256 gameId = move.gameMove.gameId;
-        return games[gameId].players[signer] == games[gameId].players[move.gameMove.player];
+    function _signedByMover(uint256 gameId, address player, bytes calldata signature, bytes32 digest) private view returns (bool) {
+        return _games[gameId].players[_recover(digest, signature)] == _games[gameId].players[player];
     }
 
     function _playerInGame(uint256 gameId, address player) private view returns (bool) {
-        return games[gameId].players[player] != 0;
+        return _games[gameId].players[player] != 0;
     }
 }
@@ -0,0 +1,116 @@
+/*
+  ________                           ____.       __
+ /  _____/_____    _____   ____     |    |__ ___/  |_  ________ __
+/   \  ___\__  \  /     \_/ __ \    |    |  |  \   __\/  ___/  |  \
+\    \_\  \/ __ \|  Y Y  \  ___//\__|    |  |  /|  |  \___ \|  |  /
+ \______  (____  /__|_|  /\___  >________|____/ |__| /____  >____/
+        \/     \/      \/     \/                          \/
+https://gamejutsu.app
+*/
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+/**
+    @title Packed GameMove reading
+    @notice Reads signed moves straight from a tightly packed calldata blob instead of ABI-encoded tuples
+    @notice a signed move is packed as
+    @notice gameId (32 bytes) | nonce (32) | player (20) | oldState | newState | move | signature count (1) | signatures
+    @notice oldState, newState and move are prefixed with a 2-byte length, every signature with a 1-byte length
+    @notice field values are the same as in the ABI-encoded move, and so is the EIP-712 digest the players sign
+    @dev nothing is copied to memory, every reader returns a value or a calldata slice of a single packed move
+  */
+library PackedGameMove {
+    uint256 private constant HEADER_LENGTH = 84;
+
+    /**
+        @param packed A single packed signed move
+        @return signedMove The same move, checked to have no trailing bytes
+      */
+    function single(bytes calldata packed) internal pure returns (bytes calldata signedMove) {
+        require(_end(packed) == packed.length, "PackedGameMove: trailing bytes");
+        return packed;
+    }
+
+    /**
+        @param packed Two packed signed moves one after another
+      */
+    function split(bytes calldata packed) internal pure returns (bytes calldata first, bytes calldata second) {
+        uint256 firstEnd = _end(packed);
+        first = packed[: firstEnd];
+        second = single(packed[firstEnd :]);
+    }
+
+    function gameId(bytes calldata signedMove) internal pure returns (uint256) {
+        return uint256(bytes32(signedMove[0 : 32]));
+    }
+
+    function nonce(bytes calldata signedMove) internal pure returns (uint256) {
+        return uint256(bytes32(signedMove[32 : 64]));
+    }
+
+    function player(bytes calldata signedMove) internal pure returns (address) {
+        return address(bytes20(signedMove[64 : HEADER_LENGTH]));
+    }
+
+    function oldState(bytes calldata signedMove) internal pure returns (bytes calldata) {
+        return _field(signedMove, 0);
+    }
+
+    function newState(bytes calldata signedMove) internal pure returns (bytes calldata) {
+        return _field(signedMove, 1);
+    }
+
+    function move(bytes calldata signedMove) internal pure returns (bytes calldata) {
+        return _field(signedMove, 2);
+    }
+
+    function signatureCount(bytes calldata signedMove) internal pure returns (uint256) {
+        return uint8(signedMove[_fieldsEnd(signedMove)]);
+    }
+
+    /**
+        @dev reverts if the move has no signature `index`
+      */
+    function signature(bytes calldata signedMove, uint256 index) internal pure returns (bytes calldata) {
+        uint256 offset = _fieldsEnd(signedMove) + 1;
+        for (uint256 i = 0; i < index; i++) {
+            offset += 1 + uint256(uint8(signedMove[offset]));
+        }
+        uint256 start = offset + 1;
+        return signedMove[start : start + uint8(signedMove[offset])];
+    }
+
+    /**
+        @param index 0 for oldState, 1 for newState, 2 for move
+      */
+    function _field(bytes calldata signedMove, uint256 index) private pure returns (bytes calldata) {
+        uint256 offset = HEADER_LENGTH;
+        for (uint256 i = 0; i < index; i++) {
+            offset += 2 + uint256(uint16(bytes2(signedMove[offset : offset + 2])));
+        }
+        uint256 start = offset + 2;
+        return signedMove[start : start + uint16(bytes2(signedMove[offset : offset + 2]))];
+    }
+
+    /**
+        @return offset where the signature count byte is
+      */
+    function _fieldsEnd(bytes calldata signedMove) private pure returns (uint256 offset) {
+        offset = HEADER_LENGTH;
+        for (uint256 i = 0; i < 3; i++) {
+            offset += 2 + uint256(uint16(bytes2(signedMove[offset : offset + 2])));
+        }
+    }
+
+    /**
+        @return end where the packed move starting at the beginning of `packed` ends
+      */
+    function _end(bytes calldata packed) private pure returns (uint256 end) {
+        end = _fieldsEnd(packed);
+        uint256 count = uint8(packed[end]);
+        end++;
+        for (uint256 i = 0; i < count; i++) {
+            end += 1 + uint256(uint8(packed[end]));
+        }
+    }
+}
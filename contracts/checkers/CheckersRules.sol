@@ -10,7 +10,9 @@ https://gamejutsu.app
 // SPDX-License-Identifier: MIT
 pragma solidity ^0.8.0;
 
-import "../../interfaces/IGameJutsuRules.sol";
+import "@openzeppelin/utils/introspection/ERC165.sol";
+import "../../interfaces/IGameJutsuTransitionRules.sol";
+import "../../interfaces/IGameJutsuOutcomeRules.sol";
 
 /**
     @title Checkers Rules
@@ -21,9 +23,10 @@ import "../../interfaces/IGameJutsuRules.sol";
     @author Gene A. Tsvigun
     @author Vic G. Larson
     @dev The state encodes the board as `uint[32] with 0 for empty, 1 for White, and 2 for Red
-    @dev yes we know the board can be packed more efficiently but we want to keep it simple
+    @dev either `abi.encode`d or in a compact 35-byte form, see `_isCompact`, new states keep the format of the old ones
+    @dev internally the board is packed into White, Red and kings bitmasks in one word, see `_board`
   */
-contract CheckersRules is IGameJutsuRules {
+contract CheckersRules is IGameJutsuTransitionRules, IGameJutsuOutcomeRules, ERC165 {
 
     /**
         @custom cells 32-byte array of uint8s representing the board
@@ -52,6 +55,30 @@ contract CheckersRules is IGameJutsuRules {
         bool passMoveToOpponent;
     }
 
+    uint8 private constant COMPACT_STATE_VERSION = 0x01;
+    uint256 private constant COMPACT_STATE_LENGTH = 35;
+
+    uint256 private constant WHITE = 0;
+    uint256 private constant RED = 32;
+    uint256 private constant KINGS = 64;
+    uint256 private constant CELLS = 0xFFFFFFFF;
+    uint256 private constant CELL = 0x10000000100000001; // one cell in each of the three masks
+    uint256 private constant EVEN_ROWS = 0x0F0F0F0F;
+    uint256 private constant ODD_ROWS = 0xF0F0F0F0;
+    uint256 private constant EVEN_ROWS_NOT_RIGHT_EDGE = 0x07070707;
+    uint256 private constant ODD_ROWS_NOT_LEFT_EDGE = 0xE0E0E0E0;
+
+    // byte `i` of a lookup table is the cell one diagonal step (STEP_) or one jump (JUMP_) away from cell `i`
+    // in the table's direction, 0xFF if it is off the board, the cell jumped over is the step in the same direction
+    uint256 private constant STEP_DOWN_LEFT = 0xffffffff1f1e1d1c1a1918ff17161514121110ff0f0e0d0c0a0908ff07060504;
+    uint256 private constant STEP_DOWN_RIGHT = 0xffffffffff1f1e1d1b1a1918ff17161513121110ff0f0e0d0b0a0908ff070605;
+    uint256 private constant STEP_UP_LEFT = 0x1a1918ff17161514121110ff0f0e0d0c0a0908ff07060504020100ffffffffff;
+    uint256 private constant STEP_UP_RIGHT = 0x1b1a1918ff17161513121110ff0f0e0d0b0a0908ff07060503020100ffffffff;
+    uint256 private constant JUMP_DOWN_LEFT = 0xffffffffffffffff1e1d1cff1a1918ff161514ff121110ff0e0d0cff0a0908ff;
+    uint256 private constant JUMP_DOWN_RIGHT = 0xffffffffffffffffff1f1e1dff1b1a19ff171615ff131211ff0f0e0dff0b0a09;
+    uint256 private constant JUMP_UP_LEFT = 0x161514ff121110ff0e0d0cff0a0908ff060504ff020100ffffffffffffffffff;
+    uint256 private constant JUMP_UP_RIGHT = 0xff171615ff131211ff0f0e0dff0b0a09ff070605ff030201ffffffffffffffff;
+
     //          0       1       2       3
     // 0  │███│ o │███│ o │███│ o │███│ o │ 3
     // 4  │ o │███│ o │███│ o │███│ o │███│ 7
@@ -69,162 +96,117 @@ contract CheckersRules is IGameJutsuRules {
         @param _move is the move represented by `abi.encode`d `Move` struct
         */
     function isValidMove(GameState calldata _state, uint8 playerId, bytes calldata _move) external pure override returns (bool) {
-        State memory state = abi.decode(_state.state, (State));
+        return _isValidMove(_redMoves(_state.state), _board(_state.state), playerId, _decodeMove(_move));
+    }
+
+    /**
+        @notice `isValidMove` and `transition` in one call, the board is read from calldata once,
+        @notice the state is copied to memory only if the move is valid
+        @param _state GameState struct with the current state of the game: id, nonce, encoded game-specific state
+        @param playerId 0 is White, player 1 is Red
+        @param _move is the move represented by `abi.encode`d `Move` struct
+        */
+    function validateAndTransition(GameState calldata _state, uint8 playerId, bytes calldata _move) external pure override returns (bool valid, bytes memory newState) {
+        uint256 board = _board(_state.state);
         Move memory move = _decodeMove(_move);
-        bool isPlayerRed = playerId == 1;
-        bool isInBounds = move.from >= 0 && move.from < 32 && move.to >= 0 && move.to < 32;
-        bool isCorrectPlayerMove = isPlayerRed == state.redMoves;
+        if (!_isValidMove(_redMoves(_state.state), board, playerId, move)) {
+            return (false, "");
+        }
+        State memory state = _decodeState(_state.state);
+        _transition(state, board, move);
+        return (true, _encodeState(state, _isCompact(_state.state)));
+    }
 
-        bool isFromOccupied = _isCellOccupied(state, move.from);
-        bool isToEmpty = !_isCellOccupied(state, move.to);
+    function _isValidMove(bool redMoves, uint256 board, uint8 playerId, Move memory move) private pure returns (bool) {
+        if (move.from >= 32 || move.to >= 32) {
+            return false;
+        }
+        bool isPlayerRed = playerId == 1;
+        bool isCorrectPlayerMove = isPlayerRed == redMoves;
 
-        bool isCheckerRed = _isRed(state.cells[move.from]);
-        bool isCheckerKing = _isKing(state.cells[move.from]);
+        bool isFromOccupied = !_isCellIn(_empty(board), move.from);
+        bool isToEmpty = _isCellIn(_empty(board), move.to);
 
+        bool isCheckerRed = _isCellIn(_checkers(board, true), move.from);
         bool isColorCorrect = isCheckerRed == isPlayerRed;
-        bool isDirectionCorrect = isCheckerKing || (isCheckerRed ? move.from > move.to : move.from < move.to);
+        bool isDirectionCorrect = _isCellIn(_kings(board), move.from) || (isCheckerRed ? move.from > move.to : move.from < move.to);
 
-        bool isJump = move.to > move.from ? move.to - move.from > 5 : move.from - move.to > 5;
-        
-        bool isToCorrect = !isJump && _isMoveDestinationCorrect(move.from, move.to, isCheckerRed, isCheckerKing)
-        || isJump && _isJumpDestinationCorrect(move.from, move.to);
-        bool isCaptureCorrect = !isJump || _isCaptureCorrect(state.cells, move.from, move.to, isCheckerRed);
+        bool isJump = _isJump(move.from, move.to);
+        bool isToCorrect = isJump ? _isJumpDestinationCorrect(move.from, move.to) : _isMoveDestinationCorrect(move.from, move.to);
+        bool isCaptureCorrect = !isJump || _isCellIn(_checkers(board, !isCheckerRed), _jumpMiddle(move.from, move.to));
 
         if (!isJump) {
-            if (_validJumpExists(state.cells, isPlayerRed) || !move.passMoveToOpponent)
+            if (_canJump(board, isPlayerRed) || !move.passMoveToOpponent)
                 return false;
         } else {
-            state.cells[move.to] = state.cells[move.from];
-            state.cells[move.from] = 0;
-            uint8 jumpedCell = _jumpMiddle(move.from, move.to);
-            state.cells[jumpedCell] = 0;
-
-            if (move.passMoveToOpponent == _validJumpExists(state.cells, isPlayerRed)) {
+            if (move.passMoveToOpponent == _canJump(_moved(board, move.from, move.to), isPlayerRed)) {
                 return false;
             }
         }
 
         return isCorrectPlayerMove &&
-        isInBounds &&
         isFromOccupied &&
         isToEmpty &&
         isColorCorrect &&
         isDirectionCorrect &&
-        isFromOccupied &&
-        isToEmpty &&
         isToCorrect &&
         isCaptureCorrect;
     }
 
-    /**
-        @param state `uint8[32]` array representing board cells, 0: empty, 01:W, 02:R, A1:WK, A2:RK
-        @param cell is index of the cell checked
-        */
-    function _isCellOccupied(State memory state, uint8 cell) private pure returns (bool) {
-        return state.cells[cell] != 0;
-    }
-
     /**
         @param from index of the cell from which the checker is moved
         @param to index of the cell to which the checker is moved
-        @param isRed is true if the checker doing the move is red
-        @param isKing is true if the checker doing the move is king
         */
-    function _isMoveDestinationCorrect(uint8 from, uint8 to, bool isRed, bool isKing) private pure returns (bool) {
-        uint8 row = from / 4;
-        uint8 col = from % 4;
+    function _isMoveDestinationCorrect(uint8 from, uint8 to) private pure returns (bool) {
+        if (to > from) {
+            return _cellAt(STEP_DOWN_LEFT, from) == to || _cellAt(STEP_DOWN_RIGHT, from) == to;
+        }
+        return _cellAt(STEP_UP_LEFT, from) == to || _cellAt(STEP_UP_RIGHT, from) == to;
+    }
 
-        return _move(row, col, isRed, false) == to || _move(row, col, isRed, true) == to
-        || isKing && (_move(row, col, !isRed, false) == to || _move(row, col, !isRed, true) == to);
+    function _isJumpDestinationCorrect(uint8 from, uint8 to) private pure returns (bool) {
+        (, uint256 jumps) = _jumpDirection(from, to);
+        return _cellAt(jumps, from) == to;
     }
 
     /**
-        @notice no matter if `from` and `to` represent a valid jump, this function will return the cell in between
+        @notice the cell jumped over is one step in the direction of the jump, 0xFF if there is no such cell
         @param from index of the cell from which the checker is moved
         @param to index of the cell to which the checker is moved
         @return index of the cell in between `from` and `to`
         */
     function _jumpMiddle(uint8 from, uint8 to) private pure returns (uint8){
-        return (from + to + 1 - ((from) / 4 % 2)) / 2;
+        (uint256 steps,) = _jumpDirection(from, to);
+        return _cellAt(steps, from);
     }
 
-    function _move(uint8 row, uint8 col, bool red, bool right) private pure returns (uint8 destination) {
-        uint8 dcol = row % 2;
-        uint8 newCol = col;
-        if (right) {
-            if (col + 1 - dcol > 3) {
-                return 255;
-            }
-            newCol = col + 1 - dcol;
-        } else {
-            if (col < dcol) {
-                return 255;
-            }
-            newCol = col - dcol;
-        }
-        uint8 newRow;
-        if (red) {
-            if (row == 0) {
-                return 255;
-            }
-            newRow = row - 1;
-        } else {
-            if (row > 6) {
-                return 255;
-            }
-            newRow = row + 1;
-        }
-        destination = newRow * 4 + newCol;
-    }
-
-    function _jump(uint8 row, uint8 col, bool red, bool right) private pure returns (uint8 destination) {
-        uint8 newCol = col;
-        if (right) {
-            if (col + 1 > 3) {
-                return 255;
-            }
-            newCol = col + 1;
-        } else {
-            if (col < 1) {
-                return 255;
+    /**
+        @notice the step and jump tables for the direction of the jump from `from` to `to`
+        @dev down-left jumps are +7, down-right +9, up-left -9, up-right -7
+        */
+    function _jumpDirection(uint8 from, uint8 to) private pure returns (uint256 steps, uint256 jumps) {
+        if (to > from) {
+            if (to - from == 7) {
+                return (STEP_DOWN_LEFT, JUMP_DOWN_LEFT);
             }
-            newCol = col - 1;
+            return (STEP_DOWN_RIGHT, JUMP_DOWN_RIGHT);
         }
-        uint8 newRow;
-        if (red) {
-            if (row < 2) {
-                return 255;
-            }
-            newRow = row - 2;
-        } else {
-            if (row > 5) {
-                return 255;
-            }
-            newRow = row + 2;
+        if (from - to == 9) {
+            return (STEP_UP_LEFT, JUMP_UP_LEFT);
         }
-        destination = newRow * 4 + newCol;
+        return (STEP_UP_RIGHT, JUMP_UP_RIGHT);
     }
 
-
     /**
-        @param cells array of 32 `uint8`s representing the board
-        @param from index of the cell from which the checker is moved
-        @param to index of the cell to which the checker is moved
-        @param isPlayerRed is true if the player doing the move plays red
+        @param table one of the `STEP_` or `JUMP_` lookup tables
+        @param cell index of the cell to look up
         */
-    function _isCaptureCorrect(uint8[32] memory cells, uint8 from, uint8 to, bool isPlayerRed) private pure returns (bool) {
-        uint8 opponent = _opponent(isPlayerRed);
-        return cells[_jumpMiddle(from, to)] % 10 == opponent;
-    }
-
-    function _opponent(bool isPlayerRed) private pure returns (uint8) {
-        return isPlayerRed ? 1 : 2;
+    function _cellAt(uint256 table, uint8 cell) private pure returns (uint8) {
+        return uint8(table >> (uint256(cell) * 8));
     }
 
-
-    function _isJumpDestinationCorrect(uint8 from, uint8 to) private pure returns (bool) {
-        uint8 diff = to > from ? to - from : from - to;
-        return diff == 7 || diff == 9;
+    function _isJump(uint8 from, uint8 to) private pure returns (bool) {
+        return to > from ? to - from > 5 : from - to > 5;
     }
 
     /**
@@ -234,33 +216,40 @@ contract CheckersRules is IGameJutsuRules {
         @param _move is the move represented by `abi.encode`d `Move` struct
         */
     function transition(GameState calldata _state, uint8 playerId, bytes calldata _move) external pure override returns (GameState memory) {
-        State memory state = abi.decode(_state.state, (State));
-        Move memory move = _decodeMove(_move);
+        State memory state = _decodeState(_state.state);
+        _transition(state, _board(_state.state), _decodeMove(_move));
+        return GameState(_state.gameId, _state.nonce + 1, _encodeState(state, _isCompact(_state.state)));
+    }
+
+    /**
+        @dev applies `move` to `state` in place, `board` is the bitboard of `state.cells` before the move
+        */
+    function _transition(State memory state, uint256 board, Move memory move) private pure {
         uint8 newCellValue = state.cells[move.from];
         bool isRed = state.cells[move.from] % 16 == 2;
+        board = _moved(board, move.from, move.to);
         if (_lastRow(move.to, isRed)) {
             newCellValue = newCellValue | 0xA0;
+            board |= uint256(1) << (KINGS + move.to);
         }
         state.cells[move.to] = newCellValue;
         state.cells[move.from] = 0;
-        bool isJump = move.to > move.from ? move.to - move.from > 5 : move.from - move.to > 5;
-        if (isJump) {
-            uint8 jumpedCell = _jumpMiddle(move.from, move.to);
-            state.cells[jumpedCell] = 0;
-            if (!_validJumpExists(state.cells, state.redMoves)) {
+
+        (bool whiteCanMove, bool whiteCanJump, bool redCanMove, bool redCanJump) = _mobility(board);
+        if (_isJump(move.from, move.to)) {
+            state.cells[_jumpMiddle(move.from, move.to)] = 0;
+            if (!(state.redMoves ? redCanJump : whiteCanJump)) {
                 state.redMoves = !state.redMoves;
             }
         } else {
             state.redMoves = !state.redMoves;
         }
 
-        (bool whiteHasMoves, bool redHasMoves) = _validMovesExist(state.cells);
-        if (state.redMoves && !redHasMoves && !_validJumpExists(state.cells, state.redMoves)) {//TODO test valid jumps checks for setting the winner
+        if (state.redMoves && !redCanMove && !redCanJump) {
             state.winner = 1;
-        } else if (!state.redMoves && !whiteHasMoves && !_validJumpExists(state.cells, state.redMoves)) {
+        } else if (!state.redMoves && !whiteCanMove && !whiteCanJump) {
             state.winner = 2;
         }
-        return GameState(_state.gameId, _state.nonce + 1, abi.encode(state));
     }
 
     /**
@@ -298,93 +287,193 @@ contract CheckersRules is IGameJutsuRules {
         return isRed && to <= 3 || !isRed && to >= 28;
     }
 
-    function _validMovesExist(uint8[32] memory cells) private pure returns (bool whiteHasValidMoves, bool redHasValidMoves) {
-        whiteHasValidMoves = false;
-        redHasValidMoves = false;
-        for (uint8 i = 0; i < 32; i++) {
-            if (cells[i] == 0)
-                continue;
-            if (_isRed(cells[i])) {
-                redHasValidMoves = redHasValidMoves || _canMove(cells, i);
-            } else {
-                whiteHasValidMoves = whiteHasValidMoves || _canMove(cells, i);
+    /**
+        @notice packs the board into three 32-bit masks, bit `i` of each stands for cell `i`
+        @notice the cells are read straight from the calldata, nothing is copied to memory
+        @dev bits 0-31 are White checkers, bits 32-63 are Red checkers, bits 64-95 are kings of either color
+        @dev a compact state must be canonical: cell codes from `State` only, `redMoves` 0 or 1, `winner` 0 to 2
+        @param state `abi.encode`d `State` or its compact form
+        */
+    function _board(bytes calldata state) private pure returns (uint256 board) {
+        if (_isCompact(state)) {
+            bytes32 cells = bytes32(state[1 : 33]);
+            for (uint256 i = 0; i < 32; i++) {
+                uint8 cell = uint8(cells[i]);
+                require(_isCellCode(cell));
+                board |= _cellBits(cell, i);
             }
+            require(uint8(state[33]) <= 1 && uint8(state[34]) <= 2);
+            return board;
         }
+        uint256 allCells;
+        for (uint256 i = 0; i < 32; i++) {
+            uint256 cell = _word(state, i);
+            allCells |= cell;
+            board |= _cellBits(uint8(cell), i);
+        }
+        require(allCells <= type(uint8).max);
     }
 
-    function _validJumpExists(uint8[32] memory cells, bool forRed) private pure returns (bool) {
-        for (uint8 i = 0; i < 32; i++) {
-            if (_isRed(cells[i]) == forRed && _canJump(cells, i)) {
-                return true;
-            }
+    function _isCellCode(uint8 cell) private pure returns (bool) {
+        return cell <= 2 || cell == 0xA1 || cell == 0xA2;
+    }
+
+    function _cellBits(uint8 cell, uint256 i) private pure returns (uint256 bits) {
+        if (cell == 0) {
+            return 0;
+        }
+        bits = uint256(1) << (_isRed(cell) ? RED + i : WHITE + i);
+        if (_isKing(cell)) {
+            bits |= uint256(1) << (KINGS + i);
         }
-        return false;
+    }
+
+    function _redMoves(bytes calldata state) private pure returns (bool) {
+        if (_isCompact(state)) {
+            uint8 compactRedMoves = uint8(state[33]);
+            require(compactRedMoves <= 1);
+            return compactRedMoves == 1;
+        }
+        uint256 redMoves = _word(state, 32);
+        require(redMoves <= 1);
+        return redMoves == 1;
+    }
+
+    function _winner(bytes calldata state) private pure returns (uint8) {
+        if (_isCompact(state)) {
+            uint8 compactWinner = uint8(state[34]);
+            require(compactWinner <= 2);
+            return compactWinner;
+        }
+        uint256 winner = _word(state, 33);
+        require(winner <= type(uint8).max);
+        return uint8(winner);
     }
 
     /**
-        @param cells array of 32 `uint8`s representing the board
-        @param from index
-      */
-    function _canMove(uint8[32] memory cells, uint8 from) private pure returns (bool) {
-        bool isRed = _isRed(cells[from]);
-        bool isKing = _isKing(cells[from]);
-        uint8 row = from / 4;
-        uint8 col = from % 4;
-        return
-        _isCellEmpty(cells, _move(row, col, isRed, false)) ||
-        _isCellEmpty(cells, _move(row, col, isRed, true)) ||
-        isKing && (
-        _isCellEmpty(cells, _move(row, col, !isRed, false)) ||
-        _isCellEmpty(cells, _move(row, col, !isRed, true))
-        );
+        @notice word `index` of the `abi.encode`d `State`: cells 0-31, then `redMoves` and `winner`
+        @dev the slice reverts on a state too short, and the readers reject out of range values as `abi.decode` would
+        */
+    function _word(bytes calldata state, uint256 index) private pure returns (uint256) {
+        return uint256(bytes32(state[index * 32 : index * 32 + 32]));
     }
 
-    function _isCellEmpty(uint8[32] memory cells, uint8 i) private pure returns (bool) {
-        return i < 32 && cells[i] == 0;
+    function _checkers(uint256 board, bool red) private pure returns (uint256) {
+        return (board >> (red ? RED : WHITE)) & CELLS;
+    }
+
+    function _kings(uint256 board) private pure returns (uint256) {
+        return (board >> KINGS) & CELLS;
+    }
+
+    function _isCellIn(uint256 cells, uint8 cell) private pure returns (bool) {
+        return cells >> cell & 1 == 1;
+    }
+
+    function _empty(uint256 board) private pure returns (uint256) {
+        return ~(board >> WHITE | board >> RED) & CELLS;
     }
 
     /**
-        @param cells array of 32 `uint8`s representing the board
-        @param from index
-      */
-    function _canJump(uint8[32] memory cells, uint8 from) private pure returns (bool) {
-        if (cells[from] == 0)
-            return false;
-        bool isRed = _isRed(cells[from]);
-        bool isKing = _isKing(cells[from]);
-        uint8 row = from / 4;
-        uint8 col = from % 4;
-
-        uint8 opponent = isRed ? 1 : 2;
-        uint8 jump = _jump(row, col, isRed, false);
-        if (_isCellEmpty(cells, jump) && cells[_jumpMiddle(from, jump)] % 10 == opponent) {
-            return true;
-        }
-        jump = _jump(row, col, isRed, true);
-        if (_isCellEmpty(cells, jump) && cells[_jumpMiddle(from, jump)] % 10 == opponent) {
-            return true;
+        @notice moves the checker from `from` to `to` with its king mark, removing the jumped checker if it is a jump
+        @dev no promotion here, it is applied by `_transition` only
+        */
+    function _moved(uint256 board, uint8 from, uint8 to) private pure returns (uint256) {
+        uint256 checker = board & (CELL << from);
+        board = board & ~(CELL << from) | (checker >> from) << to;
+        if (_isJump(from, to)) {
+            board &= ~(CELL << _jumpMiddle(from, to));
         }
+        return board;
+    }
 
-        if (isKing) {
-            jump = _jump(row, col, !isRed, false);
-            if (_isCellEmpty(cells, jump) && cells[_jumpMiddle(from, jump)] % 10 == opponent) {
-                return true;
-            }
-            jump = _jump(row, col, !isRed, true);
-            if (_isCellEmpty(cells, jump) && cells[_jumpMiddle(from, jump)] % 10 == opponent) {
-                return true;
-            }
-        }
-        return false;
+    /**
+        @notice whether each color has a simple move and a jump, one pass over the board for both colors,
+        @notice reused for passing the turn and for detecting the winner
+        */
+    function _mobility(uint256 board) private pure returns (bool whiteCanMove, bool whiteCanJump, bool redCanMove, bool redCanJump) {
+        uint256 white = _checkers(board, false);
+        uint256 red = _checkers(board, true);
+        uint256 kings = _kings(board);
+        uint256 empty = _empty(board);
+        whiteCanMove = _steps(white, kings, false) & empty != 0;
+        whiteCanJump = _jumps(white, kings, false, red) & empty != 0;
+        redCanMove = _steps(red, kings, true) & empty != 0;
+        redCanJump = _jumps(red, kings, true, white) & empty != 0;
     }
 
+    function _canJump(uint256 board, bool red) private pure returns (bool) {
+        return _jumps(_checkers(board, red), _kings(board), red, _checkers(board, !red)) & _empty(board) != 0;
+    }
+
+    /**
+        @notice all the cells `checkers` of one color can make a simple move to, occupied or not
+        @param checkers cells mask of the checkers moving
+        @param kings cells mask of all the kings on the board
+        @param red is true if the checkers are red, red move up the board, white move down
+        */
+    function _steps(uint256 checkers, uint256 kings, bool red) private pure returns (uint256) {
+        uint256 down = red ? checkers & kings : checkers;
+        uint256 up = red ? checkers : checkers & kings;
+        return _downLeft(down) | _downRight(down) | _upLeft(up) | _upRight(up);
+    }
+
+    /**
+        @notice all the cells `checkers` of one color can jump to over `opponents`, occupied or not
+        @param checkers cells mask of the checkers jumping
+        @param kings cells mask of all the kings on the board
+        @param red is true if the checkers are red, red move up the board, white move down
+        @param opponents cells mask of the checkers that can be captured
+        */
+    function _jumps(uint256 checkers, uint256 kings, bool red, uint256 opponents) private pure returns (uint256) {
+        uint256 down = red ? checkers & kings : checkers;
+        uint256 up = red ? checkers : checkers & kings;
+        return _downLeft(_downLeft(down) & opponents) | _downRight(_downRight(down) & opponents) |
+        _upLeft(_upLeft(up) & opponents) | _upRight(_upRight(up) & opponents);
+    }
+
+    // the board rows alternate between having their dark cells shifted to the right and to the left,
+    // so one diagonal step is a shift by 4 or by 3 or 5 depending on the row, and the edges are masked out
+
+    function _downLeft(uint256 cells) private pure returns (uint256) {
+        return ((cells & EVEN_ROWS) << 4 | (cells & ODD_ROWS_NOT_LEFT_EDGE) << 3) & CELLS;
+    }
+
+    function _downRight(uint256 cells) private pure returns (uint256) {
+        return ((cells & EVEN_ROWS_NOT_RIGHT_EDGE) << 5 | (cells & ODD_ROWS) << 4) & CELLS;
+    }
+
+    function _upLeft(uint256 cells) private pure returns (uint256) {
+        return (cells & EVEN_ROWS) >> 4 | (cells & ODD_ROWS_NOT_LEFT_EDGE) >> 5;
+    }
+
+    function _upRight(uint256 cells) private pure returns (uint256) {
+        return (cells & EVEN_ROWS_NOT_RIGHT_EDGE) >> 3 | (cells & ODD_ROWS) >> 4;
+    }
 
     function isFinal(GameState calldata _gameState) external pure override returns (bool) {
-        return _decodeState(_gameState.state).winner != 0;
+        return _winner(_gameState.state) != 0;
     }
 
     function isWin(GameState calldata _gameState, uint8 playerId) external pure override returns (bool) {
-        return _decodeState(_gameState.state).winner == playerId + 1;
+        return _winner(_gameState.state) == playerId + 1;
+    }
+
+    /**
+        @notice `isFinal` and `isWin` in one call, checkers never end in a draw
+      */
+    function outcome(GameState calldata _gameState) external pure override returns (Status status, uint8 winnerIndex) {
+        uint8 winner = _winner(_gameState.state);
+        if (winner == 0) {
+            return (Status.InProgress, 0);
+        }
+        return (Status.Win, winner - 1);
+    }
+
+    function supportsInterface(bytes4 interfaceId) public view virtual override returns (bool) {
+        return interfaceId == type(IGameJutsuTransitionRules).interfaceId ||
+        interfaceId == type(IGameJutsuOutcomeRules).interfaceId ||
+        super.supportsInterface(interfaceId);
     }
 
     function _decodeMove(bytes calldata move) private pure returns (Move memory) {
@@ -392,8 +481,39 @@ contract CheckersRules is IGameJutsuRules {
         return move;
     }
 
-    function _decodeState(bytes calldata state) private pure returns (State memory) {
-        return abi.decode(state, (State));
+    /**
+        @notice the state is either `abi.encode`d `State` or its compact form:
+        @notice version byte 0x01, 32 cell bytes, `redMoves` byte and `winner` byte
+        @dev `abi.encode`d states are 1088 bytes long, so the two never collide
+        */
+    function _isCompact(bytes calldata state) private pure returns (bool) {
+        return state.length == COMPACT_STATE_LENGTH && uint8(state[0]) == COMPACT_STATE_VERSION;
+    }
+
+    /**
+        @notice copies the whole state to memory, only needed to make a move, the rest is read by the calldata readers
+        */
+    function _decodeState(bytes calldata state) private pure returns (State memory decoded) {
+        if (!_isCompact(state)) {
+            return abi.decode(state, (State));
+        }
+        bytes32 cells = bytes32(state[1 : 33]);
+        for (uint256 i = 0; i < 32; i++) {
+            decoded.cells[i] = uint8(cells[i]);
+        }
+        decoded.redMoves = _redMoves(state);
+        decoded.winner = _winner(state);
+    }
+
+    function _encodeState(State memory state, bool compact) private pure returns (bytes memory) {
+        if (!compact) {
+            return abi.encode(state);
+        }
+        uint256 cells;
+        for (uint256 i = 0; i < 32; i++) {
+            cells |= uint256(state.cells[i]) << (8 * (31 - i));
+        }
+        return abi.encodePacked(COMPACT_STATE_VERSION, bytes32(cells), state.redMoves, state.winner);
     }
 
     function _isRed(uint8 _piece) private pure returns (bool) {
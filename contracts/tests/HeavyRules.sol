@@ -0,0 +1,26 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+import "@openzeppelin/utils/Address.sol";
+import "@openzeppelin/utils/introspection/IERC165.sol";
+
+/**
+    @dev forwards every call to the wrapped rules after burning `burn` gas, ERC-165 queries are forwarded as they are
+  */
+contract HeavyRules {
+    address private immutable rules;
+    uint256 private immutable burn;
+
+    constructor(address _rules, uint256 _burn) {
+        rules = _rules;
+        burn = _burn;
+    }
+
+    fallback(bytes calldata data) external returns (bytes memory) {
+        if (msg.sig != IERC165.supportsInterface.selector) {
+            uint256 start = gasleft();
+            while (start - gasleft() < burn) {}
+        }
+        return Address.functionStaticCall(rules, data);
+    }
+}
@@ -0,0 +1,20 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+/**
+    @dev answers every call, ERC-165 queries included, with the raw return data the test has set
+  */
+contract MalformedRules {
+    bytes private result;
+
+    function setResult(bytes calldata _result) external {
+        result = _result;
+    }
+
+    fallback() external {
+        bytes memory data = result;
+        assembly {
+            return(add(data, 32), mload(data))
+        }
+    }
+}
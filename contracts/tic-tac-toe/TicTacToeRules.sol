@@ -10,7 +10,9 @@ https://gamejutsu.app
 // SPDX-License-Identifier: MIT
 pragma solidity ^0.8.0;
 
-import "../../interfaces/IGameJutsuRules.sol";
+import "@openzeppelin/utils/introspection/ERC165.sol";
+import "../../interfaces/IGameJutsuTransitionRules.sol";
+import "../../interfaces/IGameJutsuOutcomeRules.sol";
 
 /**
     @title TicTacToe Rules
@@ -20,9 +22,10 @@ import "../../interfaces/IGameJutsuRules.sol";
     @author Gene A. Tsvigun
     @dev The state encodes the board as a 3x3 array of uint8s with 0 for empty, 1 for X, and 2 for O
     @dev explicitly keeping wins as `bool crossesWin` and `bool noughtsWin`
-    @dev yes we know the board can be packed more efficiently but we want to keep it simple
+    @dev the board is either `abi.encode`d or in a compact 4-byte form, see `_isCompact`,
+    @dev new boards keep the format of the old ones
   */
-contract TicTacToeRules is IGameJutsuRules {
+contract TicTacToeRules is IGameJutsuTransitionRules, IGameJutsuOutcomeRules, ERC165 {
 
     struct Board {
         uint8[9] cells;
@@ -32,15 +35,16 @@ contract TicTacToeRules is IGameJutsuRules {
 
 type Move is uint8;
 
+    uint8 private constant COMPACT_BOARD_VERSION = 0x01;
+    uint256 private constant COMPACT_BOARD_LENGTH = 4;
+
     /**
         @notice player 0 is X, player 1 is O
       */
     function isValidMove(GameState calldata _gameState, uint8 playerId, bytes calldata _move) external pure override returns (bool) {
-        Board memory b = abi.decode(_gameState.state, (Board));
+        Board memory b = _decodeBoard(_gameState.state);
         uint8 _m = abi.decode(_move, (uint8));
-        Move m = Move.wrap(_m);
-        bool playerIdMatchesTurn = _gameState.nonce % 2 == playerId;
-        return playerIdMatchesTurn && !b.crossesWin && !b.naughtsWin && _isMoveWithinRange(m) && _isCellEmpty(b, m);
+        return _isValidMove(b, _gameState.nonce, playerId, Move.wrap(_m));
     }
 
     /**
@@ -50,18 +54,23 @@ type Move is uint8;
         @param _move is the move represented by `abi.encode`d `Move` struct
         */
     function transition(GameState calldata _gameState, uint8 playerId, bytes calldata _move) external pure override returns (GameState memory) {
-        Board memory b = abi.decode(_gameState.state, (Board));
+        Board memory b = _decodeBoard(_gameState.state);
         uint8 _m = abi.decode(_move, (uint8));
-        b.cells[_m] = uint8(1 + _gameState.nonce % 2);
-        Move move = Move.wrap(_m);
-        if (_isWinningMove(b, move)) {
-            if (playerId == 0) {
-                b.crossesWin = true;
-            } else {
-                b.naughtsWin = true;
-            }
+        _transition(b, _gameState.nonce, playerId, Move.wrap(_m));
+        return GameState(_gameState.gameId, _gameState.nonce + 1, _encodeBoard(b, _isCompact(_gameState.state)));
+    }
+
+    /**
+        @notice `isValidMove` and `transition` in one call, the board is decoded once and reused
+      */
+    function validateAndTransition(GameState calldata _gameState, uint8 playerId, bytes calldata _move) external pure override returns (bool valid, bytes memory newState) {
+        Board memory b = _decodeBoard(_gameState.state);
+        Move m = Move.wrap(abi.decode(_move, (uint8)));
+        if (!_isValidMove(b, _gameState.nonce, playerId, m)) {
+            return (false, "");
         }
-        return GameState(_gameState.gameId, _gameState.nonce + 1, abi.encode(b));
+        _transition(b, _gameState.nonce, playerId, m);
+        return (true, _encodeBoard(b, _isCompact(_gameState.state)));
     }
 
     function defaultInitialGameState() external pure returns (bytes memory) {
@@ -69,15 +78,92 @@ type Move is uint8;
     }
 
     function isFinal(GameState calldata state) external pure returns (bool){
-        Board memory b = abi.decode(state.state, (Board));
+        Board memory b = _decodeBoard(state.state);
         return b.crossesWin || b.naughtsWin || _isBoardFull(b);
     }
 
     function isWin(GameState calldata state, uint8 playerId) external pure returns (bool){
-        Board memory b = abi.decode(state.state, (Board));
+        Board memory b = _decodeBoard(state.state);
         return playerId == 0 ? b.crossesWin : b.naughtsWin;
     }
 
+    /**
+        @notice `isFinal` and `isWin` in one call
+      */
+    function outcome(GameState calldata state) external pure override returns (Status status, uint8 winnerIndex) {
+        Board memory b = _decodeBoard(state.state);
+        if (b.crossesWin) {
+            return (Status.Win, 0);
+        }
+        if (b.naughtsWin) {
+            return (Status.Win, 1);
+        }
+        return (_isBoardFull(b) ? Status.Draw : Status.InProgress, 0);
+    }
+
+    function supportsInterface(bytes4 interfaceId) public view virtual override returns (bool) {
+        return interfaceId == type(IGameJutsuTransitionRules).interfaceId ||
+        interfaceId == type(IGameJutsuOutcomeRules).interfaceId ||
+        super.supportsInterface(interfaceId);
+    }
+
+    /**
+        @notice the board is either `abi.encode`d `Board` or its compact form: version byte 0x01 and 3 bytes,
+        @notice 2 bits per cell from the lowest bits up, then a `crossesWin` bit and a `naughtsWin` bit
+        @dev `abi.encode`d boards are 352 bytes long, so the two never collide
+        @dev a compact board must be canonical: cells 0 to 2 only, the 4 bits above the flags clear
+      */
+    function _isCompact(bytes calldata state) private pure returns (bool) {
+        return state.length == COMPACT_BOARD_LENGTH && uint8(state[0]) == COMPACT_BOARD_VERSION;
+    }
+
+    function _decodeBoard(bytes calldata state) private pure returns (Board memory b) {
+        if (!_isCompact(state)) {
+            return abi.decode(state, (Board));
+        }
+        uint24 packed = uint24(bytes3(state[1 : 4]));
+        require(packed >> 20 == 0);
+        for (uint256 i = 0; i < 9; i++) {
+            b.cells[i] = uint8(packed >> (2 * i) & 3);
+            require(b.cells[i] <= 2);
+        }
+        b.crossesWin = packed >> 18 & 1 == 1;
+        b.naughtsWin = packed >> 19 & 1 == 1;
+    }
+
+    function _encodeBoard(Board memory b, bool compact) private pure returns (bytes memory) {
+        if (!compact) {
+            return abi.encode(b);
+        }
+        uint24 packed;
+        for (uint256 i = 0; i < 9; i++) {
+            packed |= uint24(b.cells[i]) << (2 * i);
+        }
+        if (b.crossesWin) {
+            packed |= 1 << 18;
+        }
+        if (b.naughtsWin) {
+            packed |= 1 << 19;
+        }
+        return abi.encodePacked(COMPACT_BOARD_VERSION, bytes3(packed));
+    }
+
+    function _isValidMove(Board memory b, uint256 nonce, uint8 playerId, Move m) private pure returns (bool) {
+        bool playerIdMatchesTurn = nonce % 2 == playerId;
+        return playerIdMatchesTurn && !b.crossesWin && !b.naughtsWin && _isMoveWithinRange(m) && _isCellEmpty(b, m);
+    }
+
+    function _transition(Board memory b, uint256 nonce, uint8 playerId, Move move) private pure {
+        b.cells[Move.unwrap(move)] = uint8(1 + nonce % 2);
+        if (_isWinningMove(b, move)) {
+            if (playerId == 0) {
+                b.crossesWin = true;
+            } else {
+                b.naughtsWin = true;
+            }
+        }
+    }
+
     function _isCellEmpty(Board memory b, Move move) private pure returns (bool) {
         return b.cells[Move.unwrap(move)] == 0;
     }
@@ -24,15 +24,20 @@ interface IGameJutsuArbiter {
     /**
         @notice What the Arbiter knows about the game
         @custom rules the contract defining the rules of the game
-        @custom stake the amount of the chain's native currency to stake for the game
+        @custom stake the amount of the chain's native currency to stake for the game, the whole pot once it has started
         @custom started whether the game has started
         @custom finished whether the game has finished
+        @custom outcome 0 until the game is finished, then 1-based ID of the winner or 3 for a draw
         @custom players the players and their session addresses
         @custom playersArray both players addresses
+        @dev rules, stake, outcome, started and finished share a single storage slot
+        @dev the pot has to fit in 72 bits, capping each player's stake at type(uint72).max / 2, about 2361 ether
+        @dev once the game is finished this slot and `playersArray` are all that's left of it, `players` is emptied on settlement
       */
     struct Game {
         IGameJutsuRules rules;
-        uint256 stake;
+        uint72 stake;
+        uint8 outcome;
         bool started;
         bool finished;
         mapping(address => uint8) players;
@@ -46,6 +51,7 @@ interface IGameJutsuArbiter {
         @custom player the address of the player making the move
         @custom oldState the state of the game before the move, the player declares it to be the actual state
         @custom newState the state of the game after the move, must be a valid transition from the oldState
+        @custom newState may be left empty for the Arbiter to derive it, the signatures over the full move still apply
         @custom move the move itself, must be consistent with the newState
       */
     struct GameMove {
@@ -61,12 +67,72 @@ interface IGameJutsuArbiter {
         @notice Signed game move with players' signatures
         @custom gameMove GameMove struct
         @custom signatures the signatures of the players signing  `abi.encode`d gameMove
+        @custom signatures may be 65-byte `(r, s, v)` or EIP-2098 compact 64-byte `(r, vs)` signatures
       */
     struct SignedGameMove {
         GameMove gameMove;
         bytes[] signatures;
     }
 
+    /**
+        @notice Moves signed in the hash-chained mode, each one's EIP-712 `ChainedGameMove` commits to the one before it
+        @notice a signature over a move vouches for the whole chain up to that move
+        @custom moves consecutive moves, the last one is the head, only the head must carry its newState
+        @custom previousMoveHash the `ChainedGameMove` struct hash of the move before the first one, zero for the first move of the game
+        @custom headSignatures signatures over the head, the first one by the player making it
+        @custom previousSignatures signatures over the move before the head, may be empty if the head is signed by all players
+      */
+    struct ChainedMoves {
+        GameMove[] moves;
+        bytes32 previousMoveHash;
+        bytes[] headSignatures;
+        bytes[] previousSignatures;
+    }
+
+    /**
+        @notice A game at a glance, for lobbies and indexers to load many games in one call
+        @custom gameId the id of the game
+        @custom rules the contract defining the rules of the game
+        @custom stake the total stake of the game
+        @custom started whether the game has started
+        @custom finished whether the game has finished
+        @custom outcome see `Game`
+        @custom players both players addresses, kept once the game is finished
+        @custom timeoutStartTime when the running timeout has started, zero if none is running
+        @custom timeoutPlayer the player who has started the running timeout
+        @custom timeoutNonce nonce of the move the running timeout has started from
+      */
+    struct GameRecord {
+        uint256 gameId;
+        IGameJutsuRules rules;
+        uint256 stake;
+        bool started;
+        bool finished;
+        uint8 outcome;
+        address[2] players;
+        uint256 timeoutStartTime;
+        address timeoutPlayer;
+        uint256 timeoutNonce;
+    }
+
+    /**
+        @notice The terms of a game both players sign instead of proposing and accepting it on-chain
+        @custom rules the contract defining the rules of the game
+        @custom stake the amount each player stakes
+        @custom rulesGasBudget gas for each single rules call, 0 to leave the calls unbounded
+        @custom players both players addresses, the first one gets player ID 0
+        @custom deadline timestamp after which the game can no longer be opened with these signatures
+        @custom salt tells apart games with otherwise equal terms
+      */
+    struct GameOpen {
+        IGameJutsuRules rules;
+        uint256 stake;
+        uint256 rulesGasBudget;
+        address[2] players;
+        uint256 deadline;
+        bytes32 salt;
+    }
+
     event GameProposed(address indexed rules, uint256 gameId, uint256 stake, address indexed proposer);
     event GameStarted(address indexed rules, uint256 gameId, uint256 stake, address[2] players);
     event GameFinished(uint256 gameId, address winner, address loser, bool isDraw);
@@ -75,11 +141,23 @@ interface IGameJutsuArbiter {
     event SessionAddressRegistered(uint256 gameId, address player, address sessionAddress);
     event TimeoutStarted(uint256 gameId, address player, uint256 nonce, uint256 timeout);
     event TimeoutResolved(uint256 gameId, address player, uint256 nonce);
+    event Deposit(address player, uint256 amount);
+    event Withdrawal(address player, uint256 amount);
+    event CheckpointRecorded(uint256 gameId, uint256 nonce, bytes32 stateHash);
+    event MoveLogCommitted(uint256 gameId, uint256 length, bytes32 root);
 
     function proposeGame(IGameJutsuRules rules, address[] calldata sessionAddresses) payable external returns (uint256 gameId);
 
+    function proposeGameWithRulesGasBudget(IGameJutsuRules rules, uint256 gasBudget, address[] calldata sessionAddresses) payable external returns (uint256 gameId);
+
+    function proposeGameFromDeposit(IGameJutsuRules rules, uint256 stake, address[] calldata sessionAddresses) payable external returns (uint256 gameId);
+
     function acceptGame(uint256 gameId, address[] calldata sessionAddresses) payable external;
 
+    function acceptGameWithRulesGasBudget(uint256 gameId, uint256 gasBudget, address[] calldata sessionAddresses) payable external;
+
+    function openGame(GameOpen calldata gameOpen, bytes[] calldata signatures) payable external returns (uint256 gameId);
+
     function registerSessionAddress(uint256 gameId, address sessionAddress) external;
 
     function disputeMove(SignedGameMove calldata signedMove) external; //TODO mark the most important methods
@@ -88,20 +166,64 @@ interface IGameJutsuArbiter {
 
     function finishGame(SignedGameMove[2] calldata signedMoves) external returns (address winner);
 
+    function finishGames(SignedGameMove[2][] calldata signedMovesBatch) external returns (bool[] memory finished);
+
+    function checkpoint(uint256 gameId, uint256 nonce, bytes32 stateHash, bytes[] calldata signatures) external;
+
+    function finishGameFromCheckpoint(SignedGameMove calldata signedMove) external returns (address winner);
+
+    function commitMoveLog(uint256 gameId, uint256 length, bytes32 root, bytes[] calldata signatures) external;
+
+    function disputeLoggedMove(GameMove calldata gameMove, bytes32[] calldata proof) external;
+
     function resign(uint256 gameId) external;
 
     function initTimeout(SignedGameMove[2] calldata signedMoves) payable external;
 
+    function initTimeoutFromCheckpoint(SignedGameMove calldata signedMove) payable external;
+
     function resolveTimeout(SignedGameMove calldata signedMove) external;
 
     function finalizeTimeout(uint256 gameId) external;
 
+    function finalizeTimeouts(uint256[] calldata gameIds) external returns (uint256[] memory finalized);
+
+    function finishGameChained(ChainedMoves calldata chain) external returns (address winner);
+
+    function initTimeoutChained(ChainedMoves calldata chain) payable external;
+
+    function finishGamePacked(bytes calldata packedMoves) external returns (address winner);
+
+    function initTimeoutPacked(bytes calldata packedMoves) payable external;
+
+    function resolveTimeoutPacked(bytes calldata packedMove) external;
+
+    function disputeMovePacked(bytes calldata packedMove) external;
+
+    function deposit() external payable;
+
+    function withdraw() external;
+
     //TODO penalize griefers for starting timeouts despite valid moves being published, needs timing in SignedGameMove
 
     function games(uint256 gameId) external view returns (IGameJutsuRules rules, uint256 stake, bool started, bool finished);
 
     function getPlayers(uint256 gameId) external view returns (address[2] memory);
 
+    function gameOutcome(uint256 gameId) external view returns (uint8);
+
+    function getGames(uint256[] calldata gameIds) external view returns (GameRecord[] memory records);
+
+    function getGameRange(uint256 fromGameId, uint256 count) external view returns (GameRecord[] memory records);
+
+    function gameOpenId(GameOpen calldata gameOpen) external view returns (uint256);
+
+    function rulesGasBudget(uint256 gameId) external view returns (uint256);
+
+    function measureRulesGas(IGameJutsuRules rules, IGameJutsuRules.GameState calldata state, uint8 playerId, bytes[] calldata moves) external view returns (uint256 gasUsed);
+
+    function balances(address player) external view returns (uint256);
+
     function isValidGameMove(GameMove calldata gameMove) external view returns (bool);
 
     function isValidSignedMove(SignedGameMove calldata signedMove) external view returns (bool);
@@ -0,0 +1,33 @@
+/*
+  ________                           ____.       __
+ /  _____/_____    _____   ____     |    |__ ___/  |_  ________ __
+/   \  ___\__  \  /     \_/ __ \    |    |  |  \   __\/  ___/  |  \
+\    \_\  \/ __ \|  Y Y  \  ___//\__|    |  |  /|  |  \___ \|  |  /
+ \______  (____  /__|_|  /\___  >________|____/ |__| /____  >____/
+        \/     \/      \/     \/                          \/
+https://gamejutsu.app
+*/
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+import "./IGameJutsuRules.sol";
+
+/**
+    @title GameJutsu Rules reporting the outcome in one call
+    @notice Optional extension of IGameJutsuRules, advertised via ERC-165
+    @notice the Arbiter uses it instead of `isFinal` followed by `isWin` for every player when available
+  */
+interface IGameJutsuOutcomeRules is IGameJutsuRules {
+    enum Status {
+        InProgress,
+        Win,
+        Draw
+    }
+
+    /**
+        @notice Same as `isFinal` and `isWin` for every player, decoding the state only once
+        @return status whether the game goes on, has been won or ended in a draw
+        @return winnerIndex 0-based id of the winning player, only meaningful when `status` is `Win`
+      */
+    function outcome(GameState calldata state) external pure returns (Status status, uint8 winnerIndex);
+}
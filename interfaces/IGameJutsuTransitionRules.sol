@@ -0,0 +1,27 @@
+/*
+  ________                           ____.       __
+ /  _____/_____    _____   ____     |    |__ ___/  |_  ________ __
+/   \  ___\__  \  /     \_/ __ \    |    |  |  \   __\/  ___/  |  \
+\    \_\  \/ __ \|  Y Y  \  ___//\__|    |  |  /|  |  \___ \|  |  /
+ \______  (____  /__|_|  /\___  >________|____/ |__| /____  >____/
+        \/     \/      \/     \/                          \/
+https://gamejutsu.app
+*/
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+import "./IGameJutsuRules.sol";
+
+/**
+    @title GameJutsu Rules validating and transitioning in one call
+    @notice Optional extension of IGameJutsuRules, advertised via ERC-165
+    @notice the Arbiter uses it instead of `isValidMove` followed by `transition` when available
+  */
+interface IGameJutsuTransitionRules is IGameJutsuRules {
+    /**
+        @notice Same as `isValidMove` followed by `transition`, decoding the state only once
+        @return valid whether the move is valid in the given state for the given player
+        @return newState encoded state after the move, empty if the move is not valid
+      */
+    function validateAndTransition(GameState calldata state, uint8 playerId, bytes calldata move) external pure returns (bool valid, bytes memory newState);
+}
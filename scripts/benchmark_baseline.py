@@ -0,0 +1,171 @@
+#   ________                           ____.       __
+#  /  _____/_____    _____   ____     |    |__ ___/  |_  ________ __
+# /   \  ___\__  \  /     \_/ __ \    |    |  |  \   __\/  ___/  |  \
+# \    \_\  \/ __ \|  Y Y  \  ___//\__|    |  |  /|  |  \___ \|  |  /
+#  \______  (____  /__|_|  /\___  >________|____/ |__| /____  >____/
+#         \/     \/      \/     \/                          \/
+# https://gamejutsu.app
+# ETHOnline2022 submission by ChainHackers
+__license__ = "MIT"
+
+import io
+import subprocess
+import tarfile
+import tempfile
+from typing import List
+
+from brownie import Arbiter, CheckersRules, TicTacToeRules, accounts, chain, project, Wei
+from eth_abi import encode_abi
+from eth_account import Account
+
+from scripts.game_moves import sign_move
+from scripts.game_states import encode_checkers_state, encode_tic_tac_toe_state
+
+# gas of the main Arbiter flows at a baseline revision and in the working tree, side by side
+# the baseline is checked out of git into a temporary brownie project, nothing of it is built with this one
+# both run ABI-encoded states with the rules of their own revision, the baseline knows no other encoding
+
+BASELINE_REVISION = "e554f95"
+W, R = 0, 1  # playerId
+
+
+def load_baseline_project(revision: str = BASELINE_REVISION):
+    """
+    The repository at `revision` as a separate brownie project, compiled
+    """
+    directory = tempfile.mkdtemp(prefix="gamejutsu-baseline-")
+    archive = subprocess.run(["git", "archive", revision], check=True, capture_output=True).stdout
+    tarfile.open(fileobj=io.BytesIO(archive)).extractall(directory)
+    return project.load(directory, name="GameJutsuBaseline")
+
+
+def encode_move(fr: int, to: int, pass_move: bool) -> bytes:
+    return encode_abi(["uint8", "uint8", "bool"], [fr, to, pass_move])
+
+
+def game_move(rules, game_id: int, nonce: int, player, player_id: int, old_state: bytes, move: bytes) -> list:
+    _, _, new_state = rules.transition([game_id, nonce, old_state], player_id, move)
+    return [game_id, nonce, player.address, old_state, bytes(new_state), move]
+
+
+def start_game(arbiter, rules, player_a, player_b, stake: int) -> int:
+    tx = arbiter.proposeGame(rules, [], {'value': stake, 'from': player_a.address})
+    game_id = tx.events['GameProposed']['gameId']
+    arbiter.acceptGame(game_id, [], {'value': stake, 'from': player_b.address})
+    return game_id
+
+
+def print_against_baseline(name: str, gas: int, baseline_gas: int):
+    saved = baseline_gas - gas
+    print(f"{name:<22} {gas:>9} {baseline_gas:>9} {saved:>9} {100 * saved / baseline_gas:>6.1f}%")
+
+
+class Side:
+    """
+    An Arbiter and the rules of the same revision, all the gas figures of one side of the comparison
+    """
+
+    def __init__(self, dev, arbiter_container, checkers_container, tic_tac_toe_container):
+        self.arbiter = dev.deploy(arbiter_container)
+        self.checkers = dev.deploy(checkers_container)
+        self.tic_tac_toe = dev.deploy(tic_tac_toe_container)
+        self.gas = {}
+
+    def opening_moves(self, game_id: int, player_a, player_b) -> List[list]:
+        initial_state = encode_checkers_state([1] * 12 + [0] * 8 + [2] * 12, False, compact=False)
+        white_9_13 = game_move(self.checkers, game_id, 0, player_a, W, initial_state, encode_move(9, 13, True))
+        red_21_17 = game_move(self.checkers, game_id, 1, player_b, R, white_9_13[4], encode_move(21, 17, True))
+        white_10_14 = game_move(self.checkers, game_id, 2, player_a, W, red_21_17[4], encode_move(10, 14, True))
+        return [white_9_13, red_21_17, white_10_14]
+
+    def run_flows(self, player_a, player_b):
+        stake = Wei('0.1 ether')
+        timeout_stake = self.arbiter.DEFAULT_TIMEOUT_STAKE()
+
+        tx = self.arbiter.proposeGame(self.checkers, [], {'value': stake, 'from': player_a.address})
+        game_id = tx.events['GameProposed']['gameId']
+        self.gas["proposeGame"] = tx.gas_used
+        self.gas["acceptGame"] = self.arbiter.acceptGame(game_id, [], {'value': stake, 'from': player_b.address}).gas_used
+
+        white_9_13, red_21_17, white_10_14 = self.opening_moves(game_id, player_a, player_b)
+        timeout_moves = [sign_move(white_9_13, player_a, player_b), sign_move(red_21_17, player_b)]
+        self.gas["isValidSignedMove"] = self.arbiter.isValidSignedMove.estimate_gas(sign_move(white_10_14, player_a))
+        self.gas["initTimeout"] = self.arbiter.initTimeout(timeout_moves, {'value': timeout_stake, 'from': player_b.address}).gas_used
+        self.gas["resolveTimeout"] = self.arbiter.resolveTimeout(sign_move(white_10_14, player_a), {'from': player_a.address}).gas_used
+
+        self.arbiter.initTimeout(timeout_moves, {'value': timeout_stake, 'from': player_b.address})
+        chain.sleep(self.arbiter.TIMEOUT() + 1)
+        self.gas["finalizeTimeout"] = self.arbiter.finalizeTimeout(game_id, {'from': player_b.address}).gas_used
+
+        game_id = start_game(self.arbiter, self.checkers, player_a, player_b, stake)
+        _, _, white_10_14 = self.opening_moves(game_id, player_a, player_b)
+        white_cheats = list(white_10_14)
+        white_cheats[5] = encode_move(10, 18, True)
+        self.gas["disputeMove"] = self.arbiter.disputeMove(sign_move(white_cheats, player_a), {'from': player_b.address}).gas_used
+
+        game_id = start_game(self.arbiter, self.checkers, player_a, player_b, stake)
+        cells = [0] * 32
+        cells[13] = 1
+        cells[21] = 2
+        red_almost_lost = encode_checkers_state(cells, True, compact=False)
+        red_21_17 = game_move(self.checkers, game_id, 40, player_b, R, red_almost_lost, encode_move(21, 17, True))
+        white_13_22 = game_move(self.checkers, game_id, 41, player_a, W, red_21_17[4], encode_move(13, 22, True))
+        finishing_moves = [sign_move(red_21_17, player_b), sign_move(white_13_22, player_a)]
+        self.gas["finishGame"] = self.arbiter.finishGame(finishing_moves, {'from': player_a.address}).gas_used
+
+    def run_100_games(self, player_a, player_b, withdraw: bool):
+        """
+        50 draws and 50 wins of the first player, the balances are withdrawn at the end if `withdraw`
+        """
+        stake = Wei('0.01 ether')
+        settlement_gas = 0
+        for i in range(100):
+            game_id = start_game(self.arbiter, self.tic_tac_toe, player_a, player_b, stake)
+            moves = x_winning_moves(game_id, player_a, player_b) if i % 2 else draw_moves(game_id, player_a, player_b)
+            settlement_gas += self.arbiter.finishGame(moves, {'from': player_a.address}).gas_used
+        if withdraw:
+            for player in [player_a, player_b]:
+                settlement_gas += self.arbiter.withdraw({'from': player.address}).gas_used
+        self.gas["100 games settled"] = settlement_gas
+
+
+def x_winning_moves(game_id: int, player_a, player_b) -> list:
+    o_about_to_play_in_the_center_board = encode_tic_tac_toe_state([1, 1, 0, 2, 0, 0, 0, 0, 0], False, False, compact=False)
+    x_almost_won_board = encode_tic_tac_toe_state([1, 1, 0, 2, 2, 0, 0, 0, 0], False, False, compact=False)
+    x_won_board = encode_tic_tac_toe_state([1, 1, 1, 2, 2, 0, 0, 0, 0], True, False, compact=False)
+    o_center_move = [game_id, 3, player_b.address, o_about_to_play_in_the_center_board, x_almost_won_board, b"\x04"]
+    x_winning_move = [game_id, 4, player_a.address, x_almost_won_board, x_won_board, b"\x02"]
+    return [sign_move(o_center_move, player_b), sign_move(x_winning_move, player_a)]
+
+
+def draw_moves(game_id: int, player_a, player_b) -> list:
+    seven_moves_board = encode_tic_tac_toe_state([1, 2, 1, 1, 2, 2, 0, 1, 0], False, False, compact=False)
+    eight_moves_board = encode_tic_tac_toe_state([1, 2, 1, 1, 2, 2, 2, 1, 0], False, False, compact=False)
+    full_board = encode_tic_tac_toe_state([1, 2, 1, 1, 2, 2, 2, 1, 1], False, False, compact=False)
+    o_6_move = [game_id, 7, player_b.address, seven_moves_board, eight_moves_board, b"\x06"]
+    x_8_move = [game_id, 8, player_a.address, eight_moves_board, full_board, b"\x08"]
+    return [sign_move(o_6_move, player_b), sign_move(x_8_move, player_a)]
+
+
+def funded_player(dev):
+    player = Account.create()
+    dev.transfer(player.address, "10 ether")
+    return player
+
+
+# brownie run scripts/benchmark_baseline.py
+def main():
+    dev = accounts[0]
+    player_a, player_b = funded_player(dev), funded_player(dev)
+    baseline_project = load_baseline_project()
+    current = Side(dev, Arbiter, CheckersRules, TicTacToeRules)
+    baseline = Side(dev, baseline_project.Arbiter, baseline_project.CheckersRules, baseline_project.TicTacToeRules)
+    for side in [current, baseline]:
+        side.run_flows(player_a, player_b)
+    # the baseline pushes every payout with a transfer, the current Arbiter credits balances withdrawn at the end
+    current.run_100_games(player_a, player_b, withdraw=True)
+    baseline.run_100_games(player_a, player_b, withdraw=False)
+
+    print(f"{'':<22} {'current':>9} {'baseline':>9} {'saved':>9} {'':>7}")
+    for name, gas in current.gas.items():
+        print_against_baseline(name, gas, baseline.gas[name])
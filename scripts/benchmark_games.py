@@ -0,0 +1,78 @@
+#   ________                           ____.       __
+#  /  _____/_____    _____   ____     |    |__ ___/  |_  ________ __
+# /   \  ___\__  \  /     \_/ __ \    |    |  |  \   __\/  ___/  |  \
+# \    \_\  \/ __ \|  Y Y  \  ___//\__|    |  |  /|  |  \___ \|  |  /
+#  \______  (____  /__|_|  /\___  >________|____/ |__| /____  >____/
+#         \/     \/      \/     \/                          \/
+# https://gamejutsu.app
+# ETHOnline2022 submission by ChainHackers
+__license__ = "MIT"
+
+import time
+
+from brownie import Arbiter, TicTacToeRules, accounts, web3
+from eth_account import Account
+
+from scripts.game_records import iter_games
+
+# Arbiter at 10,000 games: storage left behind by settled games and bulk vs per-game loading
+# too slow for the test suite, needs a node with `debug_storageRangeAt` such as ganache
+
+GAMES = 10_000
+
+
+def storage_slots(address: str) -> int:
+    """
+    Non-empty storage slots of the contract, as of the start of the latest block's first transaction
+    """
+    block_hash = web3.eth.get_block('latest').hash.hex()
+    slots, start = 0, "0x" + "00" * 32
+    while start is not None:
+        result = web3.provider.make_request("debug_storageRangeAt", [block_hash, 0, address, start, 1024])["result"]
+        slots += len(result["storage"])
+        start = result["nextKey"]
+    return slots
+
+
+def state_size_after_settled_games(dev, player_a, player_b, games: int = GAMES):
+    rules = dev.deploy(TicTacToeRules)
+    arbiter = dev.deploy(Arbiter)
+    settlement_gas = 0
+    for _ in range(games):
+        tx = arbiter.proposeGame(rules, [Account.create().address], {'from': player_a})
+        game_id = tx.events['GameProposed']['gameId']
+        arbiter.acceptGame(game_id, [Account.create().address], {'from': player_b})
+        settlement_gas += arbiter.resign(game_id, {'from': player_a}).gas_used
+    # the slots are read as of the start of the latest block's transaction, so the last resign needs one more block
+    dev.transfer(dev, 0)
+
+    slots = storage_slots(arbiter.address)
+    print(f"{games} games with a session address per player: {slots} storage slots, {slots / games:.2f} per game")
+    print(f"resign with the refunds of the compaction: {settlement_gas // games} per game")
+
+
+def load_games_bulk_and_per_game(dev, player_a, player_b, games: int = GAMES):
+    rules = dev.deploy(TicTacToeRules)
+    arbiter = dev.deploy(Arbiter)
+    for i in range(games):
+        tx = arbiter.proposeGame(rules, [], {'from': player_a})
+        if i % 2:
+            arbiter.acceptGame(tx.events['GameProposed']['gameId'], [], {'from': player_b})
+
+    started = time.perf_counter()
+    for game_id in range(games):
+        arbiter.games(game_id), arbiter.getPlayers(game_id), arbiter.timeouts(game_id)
+    per_game_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    records = list(iter_games(arbiter))
+    bulk_time = time.perf_counter() - started
+    assert len(records) == games
+    print(f"loading {games} games: {per_game_time:.2f}s with the per-game getters, {bulk_time:.2f}s with getGameRange")
+
+
+# brownie run scripts/benchmark_games.py
+def main():
+    dev, player_a, player_b = accounts[0], accounts[1], accounts[2]
+    state_size_after_settled_games(dev, player_a, player_b)
+    load_games_bulk_and_per_game(dev, player_a, player_b)
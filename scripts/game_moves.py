@@ -0,0 +1,263 @@
+#   ________                           ____.       __
+#  /  _____/_____    _____   ____     |    |__ ___/  |_  ________ __
+# /   \  ___\__  \  /     \_/ __ \    |    |  |  \   __\/  ___/  |  \
+# \    \_\  \/ __ \|  Y Y  \  ___//\__|    |  |  /|  |  \___ \|  |  /
+#  \______  (____  /__|_|  /\___  >________|____/ |__| /____  >____/
+#         \/     \/      \/     \/                          \/
+# https://gamejutsu.app
+# ETHOnline2022 submission by ChainHackers
+__license__ = "MIT"
+
+from typing import List
+
+from brownie.convert import to_bytes
+from eth_account.messages import SignableMessage, encode_structured_data
+from eth_typing import ChecksumAddress
+from eth_utils import keccak
+
+# Client side helpers to build and sign the moves the Arbiter understands
+# https://codesandbox.io/s/gamejutsu-moves-eip712-no-nested-types-p5fnzf?file=/src/index.js
+
+EIP712_DOMAIN = {
+    "name": "GameJutsu",
+    "version": "0.1",
+    "chainId": 137,
+    "verifyingContract": "0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC",
+    "salt": to_bytes("0x920dfa98b3727bbfe860dd7341801f2e2a55cd7f637dea958edfc5df56c35e4d", "bytes32"),
+}
+
+EIP712_DOMAIN_TYPE = [
+    {"name": "name", "type": "string"},
+    {"name": "version", "type": "string"},
+    {"name": "chainId", "type": "uint256"},
+    {"name": "verifyingContract", "type": "address"},
+    {"name": "salt", "type": "bytes32"},
+]
+
+GAME_MOVE_TYPE = [
+    {"name": "gameId", "type": "uint256"},
+    {"name": "nonce", "type": "uint256"},
+    {"name": "player", "type": "address"},
+    {"name": "oldState", "type": "bytes"},
+    {"name": "newState", "type": "bytes"},
+    {"name": "move", "type": "bytes"}
+]
+
+CHAINED_GAME_MOVE_TYPE = GAME_MOVE_TYPE + [
+    {"name": "previousMoveHash", "type": "bytes32"},
+]
+
+GAME_OPEN_TYPE = [
+    {"name": "rules", "type": "address"},
+    {"name": "stake", "type": "uint256"},
+    {"name": "rulesGasBudget", "type": "uint256"},
+    {"name": "players", "type": "address[2]"},
+    {"name": "deadline", "type": "uint256"},
+    {"name": "salt", "type": "bytes32"},
+]
+
+CHECKPOINT_TYPE = [
+    {"name": "gameId", "type": "uint256"},
+    {"name": "nonce", "type": "uint256"},
+    {"name": "stateHash", "type": "bytes32"},
+]
+
+
+def encode_move(
+        game_id: int,
+        nonce: int,
+        player: ChecksumAddress,
+        old_state: bytes,
+        new_state: bytes,
+        move: bytes) -> SignableMessage:
+    data = {
+        "types": {
+            "EIP712Domain": EIP712_DOMAIN_TYPE,
+            "GameMove": GAME_MOVE_TYPE,
+        },
+        "domain": EIP712_DOMAIN,
+        "primaryType": "GameMove",
+        "message": {
+            "gameId": game_id,
+            "nonce": nonce,
+            "player": player,
+            "oldState": old_state,
+            "newState": new_state,
+            "move": move
+        },
+    }
+    return encode_structured_data(data)
+
+
+def sign_move(game_move: list, *signers) -> list:
+    """
+    Sign a `GameMove` with every signer, the first one must be the player making the move
+    :return: `SignedGameMove` ready to be sent to the Arbiter
+    """
+    message = encode_move(*game_move)
+    signatures: List[bytes] = [signer.sign_message(message).signature for signer in signers]
+    return [game_move, signatures]
+
+
+def encode_checkpoint(game_id: int, nonce: int, state_hash: bytes) -> SignableMessage:
+    data = {
+        "types": {
+            "EIP712Domain": EIP712_DOMAIN_TYPE,
+            "Checkpoint": CHECKPOINT_TYPE,
+        },
+        "domain": EIP712_DOMAIN,
+        "primaryType": "Checkpoint",
+        "message": {
+            "gameId": game_id,
+            "nonce": nonce,
+            "stateHash": state_hash,
+        },
+    }
+    return encode_structured_data(data)
+
+
+def sign_checkpoint(game_id: int, nonce: int, state: bytes, *signers) -> list:
+    """
+    Sign the state to be made the next move from by all the signers
+    :return: arguments for `Arbiter.checkpoint`
+    """
+    state_hash = keccak(state)
+    message = encode_checkpoint(game_id, nonce, state_hash)
+    return [game_id, nonce, state_hash, [signer.sign_message(message).signature for signer in signers]]
+
+
+def without_new_state(signed_move: list) -> list:
+    """
+    Drop `newState` from a signed move, the Arbiter derives it with the rules, the signatures stay valid
+    :return: `SignedGameMove` with an empty `newState`
+    """
+    game_move, signatures = signed_move
+    game_id, nonce, player, old_state, _, move = game_move
+    return [[game_id, nonce, player, old_state, b"", move], signatures]
+
+
+def calldata_gas(data: bytes) -> int:
+    """
+    Intrinsic gas the calldata costs on L1: 16 per non-zero byte, 4 per zero byte
+    """
+    return sum(16 if b else 4 for b in data)
+
+
+def encode_game_open(rules: ChecksumAddress, stake: int, rules_gas_budget: int, players: List[ChecksumAddress],
+                     deadline: int, salt: bytes) -> SignableMessage:
+    data = {
+        "types": {
+            "EIP712Domain": EIP712_DOMAIN_TYPE,
+            "GameOpen": GAME_OPEN_TYPE,
+        },
+        "domain": EIP712_DOMAIN,
+        "primaryType": "GameOpen",
+        "message": {
+            "rules": rules,
+            "stake": stake,
+            "rulesGasBudget": rules_gas_budget,
+            "players": players,
+            "deadline": deadline,
+            "salt": salt,
+        },
+    }
+    return encode_structured_data(data)
+
+
+def game_open_id(game_open: list) -> int:
+    """
+    ID of a game opened by signatures, the same `Arbiter.gameOpenId` returns
+    """
+    message = encode_game_open(*game_open)
+    return int.from_bytes(keccak(b"\x19" + message.version + message.header + message.body), "big")
+
+
+def sign_game_open(game_open: list, *signers) -> list:
+    """
+    Sign the terms of a game `[rules, stake, rulesGasBudget, players, deadline, salt]` by both players, no transaction needed to play it
+    :return: arguments for `Arbiter.openGame`
+    """
+    message = encode_game_open(*game_open)
+    return [game_open, [signer.sign_message(message).signature for signer in signers]]
+
+
+def compact_signature(signature: bytes) -> bytes:
+    """
+    EIP-2098 compact form of a 65-byte signature: `r` followed by `s` with the parity of `v` in its top bit
+    """
+    r, s, v = signature[:32], int.from_bytes(signature[32:64], "big"), signature[64]
+    return r + (s | ((v - 27) << 255)).to_bytes(32, "big")
+
+
+def with_compact_signatures(signed_move: list) -> list:
+    """
+    :return: the same `SignedGameMove` with all its signatures in the EIP-2098 compact form
+    """
+    game_move, signatures = signed_move
+    return [game_move, [compact_signature(bytes(signature)) for signature in signatures]]
+
+
+def pack_signed_move(signed_move: list) -> bytes:
+    """
+    Tightly packed `SignedGameMove` for the Arbiter's `*Packed` entry points, see `PackedGameMove.sol`
+    The fields are the same as in the ABI-encoded move, the nonce keeps its full 32 bytes, the signatures stay valid
+    """
+    (game_id, nonce, player, old_state, new_state, move), signatures = signed_move
+    packed = game_id.to_bytes(32, "big") + nonce.to_bytes(32, "big") + to_bytes(player, "bytes20")
+    for data in [old_state, new_state, move]:
+        packed += len(data).to_bytes(2, "big") + bytes(data)
+    packed += len(signatures).to_bytes(1, "big")
+    for signature in signatures:
+        packed += len(signature).to_bytes(1, "big") + bytes(signature)
+    return packed
+
+
+def pack_signed_moves(*signed_moves: list) -> bytes:
+    return b"".join(pack_signed_move(signed_move) for signed_move in signed_moves)
+
+
+def encode_chained_move(
+        game_id: int,
+        nonce: int,
+        player: ChecksumAddress,
+        old_state: bytes,
+        new_state: bytes,
+        move: bytes,
+        previous_move_hash: bytes) -> SignableMessage:
+    data = {
+        "types": {
+            "EIP712Domain": EIP712_DOMAIN_TYPE,
+            "ChainedGameMove": CHAINED_GAME_MOVE_TYPE,
+        },
+        "domain": EIP712_DOMAIN,
+        "primaryType": "ChainedGameMove",
+        "message": {
+            "gameId": game_id,
+            "nonce": nonce,
+            "player": player,
+            "oldState": old_state,
+            "newState": new_state,
+            "move": move,
+            "previousMoveHash": previous_move_hash,
+        },
+    }
+    return encode_structured_data(data)
+
+
+def sign_move_chain(game_moves: List[list], previous_move_hash: bytes, head_signers: list, previous_signers: list) -> list:
+    """
+    Hash-chain the moves, each one committing to the struct hash of the one before it, and sign the last two
+    Players sign every move they make this way, only the signatures over the last two moves are sent
+    :return: `ChainedMoves` for the Arbiter's `*Chained` entry points
+    """
+    messages = []
+    move_hash = previous_move_hash
+    for game_move in game_moves:
+        messages.append(encode_chained_move(*game_move, move_hash))
+        move_hash = messages[-1].body
+    return [
+        game_moves,
+        previous_move_hash,
+        [signer.sign_message(messages[-1]).signature for signer in head_signers],
+        [signer.sign_message(messages[-2]).signature for signer in previous_signers],
+    ]
@@ -0,0 +1,57 @@
+#   ________                           ____.       __
+#  /  _____/_____    _____   ____     |    |__ ___/  |_  ________ __
+# /   \  ___\__  \  /     \_/ __ \    |    |  |  \   __\/  ___/  |  \
+# \    \_\  \/ __ \|  Y Y  \  ___//\__|    |  |  /|  |  \___ \|  |  /
+#  \______  (____  /__|_|  /\___  >________|____/ |__| /____  >____/
+#         \/     \/      \/     \/                          \/
+# https://gamejutsu.app
+# ETHOnline2022 submission by ChainHackers
+__license__ = "MIT"
+
+from typing import Iterator, List, NamedTuple
+
+# Bulk loading of games for lobbies and indexers with `Arbiter.getGames` and `Arbiter.getGameRange`
+
+PAGE_SIZE = 500
+
+
+class GameRecord(NamedTuple):
+    game_id: int
+    rules: str
+    stake: int
+    started: bool
+    finished: bool
+    outcome: int
+    players: List[str]
+    timeout_start_time: int
+    timeout_player: str
+    timeout_nonce: int
+
+
+def to_game_record(record) -> GameRecord:
+    game_id, rules, stake, started, finished, outcome, players, start_time, timeout_player, nonce = record
+    return GameRecord(game_id, rules, stake, started, finished, outcome, list(players), start_time, timeout_player,
+                      nonce)
+
+
+def load_games(arbiter, game_ids: List[int], page_size: int = PAGE_SIZE) -> List[GameRecord]:
+    """
+    Records of the given games, including the ones opened by signatures, `page_size` games per call
+    """
+    records = []
+    for i in range(0, len(game_ids), page_size):
+        records += [to_game_record(r) for r in arbiter.getGames(game_ids[i:i + page_size])]
+    return records
+
+
+def iter_games(arbiter, first_game_id: int = 0, page_size: int = PAGE_SIZE) -> Iterator[GameRecord]:
+    """
+    Records of all the proposed games from `first_game_id` on, `page_size` games per call
+    """
+    game_id = first_game_id
+    while True:
+        page = arbiter.getGameRange(game_id, page_size)
+        yield from (to_game_record(r) for r in page)
+        if len(page) < page_size:
+            return
+        game_id += page_size
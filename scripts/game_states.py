@@ -0,0 +1,74 @@
+#   ________                           ____.       __
+#  /  _____/_____    _____   ____     |    |__ ___/  |_  ________ __
+# /   \  ___\__  \  /     \_/ __ \    |    |  |  \   __\/  ___/  |  \
+# \    \_\  \/ __ \|  Y Y  \  ___//\__|    |  |  /|  |  \___ \|  |  /
+#  \______  (____  /__|_|  /\___  >________|____/ |__| /____  >____/
+#         \/     \/      \/     \/                          \/
+# https://gamejutsu.app
+# ETHOnline2022 submission by ChainHackers
+__license__ = "MIT"
+
+from typing import List, Tuple
+
+from eth_abi import encode_abi, decode_abi
+
+# Game states of CheckersRules and TicTacToeRules, `abi.encode`d or in the compact form
+# the compact form starts with a version byte, the rules keep the format of the state they are given
+
+COMPACT_STATE_VERSION = 0x01
+
+CHECKERS_STATE_TYPES = ["uint8[32]", "bool", "uint8"]
+CHECKERS_COMPACT_STATE_LENGTH = 35
+CHECKERS_CELL_CODES = {0, 1, 2, 0xA1, 0xA2}
+
+TIC_TAC_TOE_STATE_TYPES = ["uint8[9]", "bool", "bool"]
+TIC_TAC_TOE_COMPACT_STATE_LENGTH = 4
+
+
+def is_compact(state: bytes, length: int) -> bool:
+    return len(state) == length and state[0] == COMPACT_STATE_VERSION
+
+
+def encode_checkers_state(cells: List[int], red_moves: bool, winner: int = 0, compact: bool = True) -> bytes:
+    """
+    Version byte, 32 cell bytes, `redMoves` byte and `winner` byte if `compact`
+    the rules only accept the canonical compact form: known cell codes and a winner from 0 to 2
+    """
+    if not compact:
+        return encode_abi(CHECKERS_STATE_TYPES, [cells, red_moves, winner])
+    assert len(cells) == 32 and all(cell in CHECKERS_CELL_CODES for cell in cells) and 0 <= winner <= 2
+    return bytes([COMPACT_STATE_VERSION, *cells, int(red_moves), winner])
+
+
+def decode_checkers_state(state: bytes) -> Tuple[List[int], bool, int]:
+    if not is_compact(state, CHECKERS_COMPACT_STATE_LENGTH):
+        cells, red_moves, winner = decode_abi(CHECKERS_STATE_TYPES, state)
+        return list(cells), red_moves, winner
+    return list(state[1:33]), state[33] != 0, state[34]
+
+
+def encode_tic_tac_toe_state(cells: List[int], crosses_win: bool, naughts_win: bool, compact: bool = True) -> bytes:
+    """
+    Version byte and 3 bytes if `compact`: 2 bits per cell from the lowest bits up, then `crossesWin` and `naughtsWin`
+    """
+    if not compact:
+        return encode_abi(TIC_TAC_TOE_STATE_TYPES, [cells, crosses_win, naughts_win])
+    assert len(cells) == 9 and all(0 <= cell <= 2 for cell in cells)
+    packed = sum(cell << (2 * i) for i, cell in enumerate(cells)) | crosses_win << 18 | naughts_win << 19
+    return bytes([COMPACT_STATE_VERSION]) + packed.to_bytes(3, 'big')
+
+
+def decode_tic_tac_toe_state(state: bytes) -> Tuple[List[int], bool, bool]:
+    if not is_compact(state, TIC_TAC_TOE_COMPACT_STATE_LENGTH):
+        cells, crosses_win, naughts_win = decode_abi(TIC_TAC_TOE_STATE_TYPES, state)
+        return list(cells), crosses_win, naughts_win
+    packed = int.from_bytes(state[1:4], 'big')
+    return [packed >> (2 * i) & 3 for i in range(9)], bool(packed >> 18 & 1), bool(packed >> 19 & 1)
+
+
+def to_compact_checkers_state(state: bytes) -> bytes:
+    return encode_checkers_state(*decode_checkers_state(state))
+
+
+def to_compact_tic_tac_toe_state(state: bytes) -> bytes:
+    return encode_tic_tac_toe_state(*decode_tic_tac_toe_state(state))
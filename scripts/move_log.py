@@ -0,0 +1,94 @@
+#   ________                           ____.       __
+#  /  _____/_____    _____   ____     |    |__ ___/  |_  ________ __
+# /   \  ___\__  \  /     \_/ __ \    |    |  |  \   __\/  ___/  |  \
+# \    \_\  \/ __ \|  Y Y  \  ___//\__|    |  |  /|  |  \___ \|  |  /
+#  \______  (____  /__|_|  /\___  >________|____/ |__| /____  >____/
+#         \/     \/      \/     \/                          \/
+# https://gamejutsu.app
+# ETHOnline2022 submission by ChainHackers
+__license__ = "MIT"
+
+from typing import List
+
+from eth_account.messages import SignableMessage, encode_structured_data
+from eth_utils import keccak
+
+from scripts.game_moves import EIP712_DOMAIN, EIP712_DOMAIN_TYPE, encode_move
+
+# Merkle trees over the move log for `Arbiter.commitMoveLog` and `Arbiter.disputeLoggedMove`
+# leaves are keccak256 of the GameMove EIP-712 digests, sibling pairs are hashed sorted as in OpenZeppelin's MerkleProof
+
+MOVE_LOG_TYPE = [
+    {"name": "gameId", "type": "uint256"},
+    {"name": "length", "type": "uint256"},
+    {"name": "root", "type": "bytes32"},
+]
+
+
+def move_digest(game_move: list) -> bytes:
+    message = encode_move(*game_move)
+    return keccak(b"\x19" + message.version + message.header + message.body)
+
+
+def move_leaf(game_move: list) -> bytes:
+    return keccak(move_digest(game_move))
+
+
+def hash_pair(a: bytes, b: bytes) -> bytes:
+    return keccak(min(a, b) + max(a, b))
+
+
+def merkle_tree(leaves: List[bytes]) -> List[List[bytes]]:
+    """
+    :return: every level of the tree from the leaves up to the root, a node without a sibling is carried up as is
+    """
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        levels.append([hash_pair(*level[i:i + 2]) if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)])
+    return levels
+
+
+def merkle_root(levels: List[List[bytes]]) -> bytes:
+    return levels[-1][0]
+
+
+def merkle_proof(levels: List[List[bytes]], index: int) -> List[bytes]:
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(level[sibling])
+        index //= 2
+    return proof
+
+
+def move_log_tree(game_moves: List[list]) -> List[List[bytes]]:
+    return merkle_tree([move_leaf(game_move) for game_move in game_moves])
+
+
+def encode_move_log(game_id: int, length: int, root: bytes) -> SignableMessage:
+    data = {
+        "types": {
+            "EIP712Domain": EIP712_DOMAIN_TYPE,
+            "MoveLog": MOVE_LOG_TYPE,
+        },
+        "domain": EIP712_DOMAIN,
+        "primaryType": "MoveLog",
+        "message": {
+            "gameId": game_id,
+            "length": length,
+            "root": root,
+        },
+    }
+    return encode_structured_data(data)
+
+
+def sign_move_log(game_id: int, game_moves: List[list], *signers) -> list:
+    """
+    Build the tree over the moves and sign its root by all the signers
+    :return: arguments for `Arbiter.commitMoveLog`
+    """
+    root = merkle_root(move_log_tree(game_moves))
+    message = encode_move_log(game_id, len(game_moves), root)
+    return [game_id, len(game_moves), root, [signer.sign_message(message).signature for signer in signers]]
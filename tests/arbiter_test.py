@@ -20,6 +20,9 @@ from eth_typing import ChecksumAddress
 from brownie.network.account import PublicKeyAccount
 from brownie import chain
 
+from scripts.game_moves import sign_game_open, game_open_id, sign_checkpoint
+from scripts.move_log import sign_move_log
+
 ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
 
 
@@ -79,7 +82,7 @@ def test_accept_game(arbiter, rules, player_a, player_b):
     stake = Wei("0.1 ether")
     tx = arbiter.proposeGame(rules, [], {'value': stake, 'from': player_a.address})
     game_id = tx.events['GameProposed']['gameId']
-    with reverts("Arbiter: stake mismatch"):
+    with reverts("Arbiter: insufficient balance"):
         arbiter.acceptGame(game_id, [], {'from': player_b.address})
     arbiter.acceptGame(game_id, [], {'value': stake, 'from': player_b.address})
     game_rules, game_stake, game_started, game_finished = arbiter.games(0)
@@ -425,6 +428,91 @@ def test_is_valid_signed_move_x_moves_twice_with_same_nonce(arbiter, rules, star
     assert tx.events['GameFinished']['winner'] == player_b.address
 
 
+def test_dispute_move_with_history_same_nonce(arbiter, rules, start_game, player_a, player_b):
+    game_id = start_game(
+        player_a.address,
+        player_b.address,
+        Wei('0.1 ether')
+    )
+
+    empty_board = encode_abi(STATE_TYPES, [[0, 0, 0, 0, 0, 0, 0, 0, 0], False, False])
+    cross_in_0_board = encode_abi(STATE_TYPES, [[1, 0, 0, 0, 0, 0, 0, 0, 0], False, False])
+    cross_in_1_board = encode_abi(STATE_TYPES, [[0, 1, 0, 0, 0, 0, 0, 0, 0], False, False])
+
+    x_0_move = [game_id, 0, player_a.address, empty_board, cross_in_0_board, to_bytes("0x00")]
+    x_1_move = [game_id, 0, player_a.address, empty_board, cross_in_1_board, to_bytes("0x01")]
+    signed_x_0_move = [x_0_move, [player_a.sign_message(encode_move(*x_0_move)).signature]]
+    signed_x_1_move = [x_1_move, [player_a.sign_message(encode_move(*x_1_move)).signature]]
+
+    with reverts("Arbiter: same move disputed"):
+        arbiter.disputeMoveWithHistory([signed_x_0_move, signed_x_0_move], {'from': player_b.address})
+
+    tx = arbiter.disputeMoveWithHistory([signed_x_0_move, signed_x_1_move], {'from': player_b.address})
+    assert tx.events['PlayerDisqualified']['player'] == player_a.address
+    assert tx.events['GameFinished']['winner'] == player_b.address
+    rules, stake, started, finished = arbiter.games(game_id)
+    assert finished
+
+
+def test_dispute_move_with_history_consecutive_nonces(arbiter, rules, start_game, player_a, player_b):
+    game_id = start_game(
+        player_a.address,
+        player_b.address,
+        Wei('0.1 ether')
+    )
+
+    empty_board = encode_abi(STATE_TYPES, [[0, 0, 0, 0, 0, 0, 0, 0, 0], False, False])
+    cross_in_0_board = encode_abi(STATE_TYPES, [[1, 0, 0, 0, 0, 0, 0, 0, 0], False, False])
+    cross_in_4_board = encode_abi(STATE_TYPES, [[0, 0, 0, 0, 1, 0, 0, 0, 0], False, False])
+    x_0_o_4_board = encode_abi(STATE_TYPES, [[1, 0, 0, 0, 2, 0, 0, 0, 0], False, False])
+    x_4_o_0_board = encode_abi(STATE_TYPES, [[2, 0, 0, 0, 1, 0, 0, 0, 0], False, False])
+    x_0_o_0_board = encode_abi(STATE_TYPES, [[2, 0, 0, 0, 0, 0, 0, 0, 0], False, False])
+
+    x_0_move = [game_id, 0, player_a.address, empty_board, cross_in_0_board, to_bytes("0x00")]
+    encoded_x_0_move = encode_move(*x_0_move)
+    signed_x_0_move = [x_0_move, [
+        player_a.sign_message(encoded_x_0_move).signature,
+        player_b.sign_message(encoded_x_0_move).signature
+    ]]
+
+    def signed_o_move(old_state: bytes, new_state: bytes, move: bytes) -> list:
+        o_move = [game_id, 1, player_b.address, old_state, new_state, move]
+        return [o_move, [player_b.sign_message(encode_move(*o_move)).signature]]
+
+    with reverts("Arbiter: valid move disputed"):
+        arbiter.disputeMoveWithHistory(
+            [signed_x_0_move, signed_o_move(cross_in_0_board, x_0_o_4_board, to_bytes("0x04"))],
+            {'from': player_a.address}
+        )
+
+    # O pretends X went to the center, the move is valid on its own but doesn't follow the co-signed one
+    assert arbiter.isValidGameMove([game_id, 1, player_b.address, cross_in_4_board, x_4_o_0_board, to_bytes("0x00")])
+    tx = arbiter.disputeMoveWithHistory(
+        [signed_x_0_move, signed_o_move(cross_in_4_board, x_4_o_0_board, to_bytes("0x00"))],
+        {'from': player_a.address}
+    )
+    assert tx.events['PlayerDisqualified']['player'] == player_b.address
+    assert tx.events['GameFinished']['winner'] == player_a.address
+
+    game_id = start_game(
+        player_a.address,
+        player_b.address,
+        Wei('0.1 ether')
+    )
+    x_0_move[0] = game_id
+    encoded_x_0_move = encode_move(*x_0_move)
+    signed_x_0_move = [x_0_move, [
+        player_a.sign_message(encoded_x_0_move).signature,
+        player_b.sign_message(encoded_x_0_move).signature
+    ]]
+    # O overwrites the cross, linked properly but invalid according to the rules
+    tx = arbiter.disputeMoveWithHistory(
+        [signed_x_0_move, signed_o_move(cross_in_0_board, x_0_o_0_board, to_bytes("0x00"))],
+        {'from': player_a.address}
+    )
+    assert tx.events['PlayerDisqualified']['player'] == player_b.address
+
+
 def test_is_valid_signed_move_x_cant_place_o(arbiter, rules, start_game, player_a, player_b):
     game_id = start_game(
         player_a.address,
@@ -644,6 +732,165 @@ def test_resign(arbiter, rules, start_game, player_a, player_b):
     assert finished
 
 
+def test_finished_game_compacted(arbiter, rules, player_a, player_b, create_eth_account):
+    stake = Wei('0.1 ether')
+    session_a, session_b = create_eth_account(), create_eth_account()
+    tx = arbiter.proposeGameWithRulesGasBudget(rules, 300000, [session_a.address], {'value': stake, 'from': player_a.address})
+    game_id = tx.events['GameProposed']['gameId']
+    with reverts("Arbiter: rules gas budget not confirmed"):
+        arbiter.acceptGame(game_id, [session_b.address], {'value': stake, 'from': player_b.address})
+    with reverts("Arbiter: rules gas budget mismatch"):
+        arbiter.acceptGameWithRulesGasBudget(game_id, 400000, [session_b.address], {'value': stake, 'from': player_b.address})
+    arbiter.acceptGameWithRulesGasBudget(game_id, 300000, [session_b.address], {'value': stake, 'from': player_b.address})
+    assert arbiter.gameOutcome(game_id) == 0
+    arbiter.checkpoint(*sign_checkpoint(game_id, 1, b"state", player_a, player_b), {'from': player_a.address})
+    logged_moves = [[game_id, 0, player_a.address, b"", b"state", b"move"]]
+    arbiter.commitMoveLog(*sign_move_log(game_id, logged_moves, player_a, player_b), {'from': player_a.address})
+    assert arbiter.checkpoints(game_id)[0] == 1
+    assert arbiter.moveLogs(game_id)[1] == 1
+    assert arbiter.rulesGasBudget(game_id) == 300000
+
+    arbiter.resign(game_id, {'from': player_a.address})
+    assert arbiter.games(game_id) == (rules, 2 * stake, True, True)
+    assert arbiter.gameOutcome(game_id) == 2
+    assert arbiter.getPlayers(game_id) == [player_a.address, player_b.address]
+    assert arbiter.balances(player_b.address) == 2 * stake
+    assert arbiter.checkpoints(game_id) == (0, "0x" + "00" * 32)
+    assert arbiter.moveLogs(game_id) == ("0x" + "00" * 32, 0)
+    assert arbiter.rulesGasBudget(game_id) == 0
+    for player in [player_a, player_b]:
+        with reverts("Arbiter: player not in game"):
+            arbiter.registerSessionAddress(game_id, player.address, {'from': player.address})
+
+
+def test_session_addresses_cap(arbiter, rules, player_a, player_b, create_eth_account):
+    stake = Wei('0.1 ether')
+    max_sessions = arbiter.MAX_SESSION_ADDRESSES()
+    tx = arbiter.proposeGame(rules, [create_eth_account().address for _ in range(max_sessions)],
+                             {'value': stake, 'from': player_a.address})
+    game_id = tx.events['GameProposed']['gameId']
+    arbiter.acceptGame(game_id, [], {'value': stake, 'from': player_b.address})
+    with reverts("Arbiter: too many session addresses"):
+        arbiter.registerSessionAddress(game_id, create_eth_account().address, {'from': player_a.address})
+    # the cap is per player, one player's sessions leave the other's room intact
+    arbiter.registerSessionAddress(game_id, create_eth_account().address, {'from': player_b.address})
+
+
+def test_get_games(arbiter, rules, player_a, player_b):
+    stake = Wei('0.1 ether')
+    first_game_id = arbiter.nextGameId()
+    tx = arbiter.proposeGame(rules, [], {'value': stake, 'from': player_a.address})
+    proposed_id = tx.events['GameProposed']['gameId']
+    tx = arbiter.proposeGame(rules, [], {'value': stake, 'from': player_a.address})
+    finished_id = tx.events['GameProposed']['gameId']
+    arbiter.acceptGame(finished_id, [], {'value': stake, 'from': player_b.address})
+    arbiter.resign(finished_id, {'from': player_b.address})
+
+    proposed, finished = arbiter.getGames([proposed_id, finished_id])
+    assert proposed == (proposed_id, rules, stake, False, False, 0, [player_a.address, ZERO_ADDRESS], 0, ZERO_ADDRESS, 0)
+    assert finished == (finished_id, rules, 2 * stake, True, True, 1, [player_a.address, player_b.address], 0, ZERO_ADDRESS, 0)
+    assert arbiter.getGameRange(first_game_id, 100) == [proposed, finished]
+    assert arbiter.getGameRange(finished_id, 100) == [finished]
+    assert arbiter.getGameRange(finished_id + 1, 100) == []
+    assert arbiter.getGameRange(first_game_id, 1) == [proposed]
+
+
+def test_deposit(arbiter, rules, player_a, player_b):
+    stake = Wei('0.1 ether')
+    arbiter.deposit({'value': stake, 'from': player_a.address})
+    arbiter.deposit({'value': 3 * stake, 'from': player_b.address})
+    with reverts("Arbiter: insufficient balance"):
+        arbiter.proposeGameFromDeposit(rules, 2 * stake, [], {'from': player_a.address})
+
+    tx = arbiter.proposeGameFromDeposit(rules, stake, [], {'from': player_a.address})
+    game_id = tx.events['GameProposed']['gameId']
+    assert arbiter.balances(player_a.address) == 0
+    arbiter.acceptGame(game_id, [], {'from': player_b.address})
+    assert arbiter.balances(player_b.address) == 2 * stake
+    assert arbiter.games(game_id) == (rules, 2 * stake, True, False)
+
+    arbiter.resign(game_id, {'from': player_b.address})
+    assert arbiter.balances(player_a.address) == 2 * stake
+    balance_before = balance(player_a)
+    arbiter.withdraw({'from': player_a.address})
+    assert balance(player_a) > balance_before
+    assert arbiter.balances(player_a.address) == 0
+
+
+def test_malformed_rules_result(arbiter, MalformedRules, dev, player_a, player_b):
+    malformed_rules = dev.deploy(MalformedRules)
+    stake = Wei('0.1 ether')
+    for result in [
+        encode_abi(["uint256"], [2]),  # not a bool
+        encode_abi(["uint256", "uint256"], [1, 2 ** 255]),  # newState offset out of range
+        encode_abi(["uint256", "uint256", "uint256"], [1, 64, 1]),  # newState longer than the data
+    ]:
+        malformed_rules.setResult(result, {'from': dev})
+        tx = arbiter.proposeGame(malformed_rules, [], {'value': stake, 'from': player_a.address})
+        game_id = tx.events['GameProposed']['gameId']
+        arbiter.acceptGame(game_id, [], {'value': stake, 'from': player_b.address})
+        move = [game_id, 0, player_a.address, b"old", b"new", b"move"]
+        signed_move = [move, [player_a.sign_message(encode_move(*move)).signature]]
+        assert not arbiter.isValidSignedMove(signed_move)
+        tx = arbiter.disputeMove(signed_move, {'from': player_b.address})
+        assert tx.events['PlayerDisqualified']['player'] == player_a.address
+
+
+def test_stake_cap(arbiter, rules, player_a):
+    max_stake = (2 ** 72 - 1) // 2
+    with reverts("Arbiter: stake too high"):
+        arbiter.proposeGameFromDeposit(rules, max_stake + 1, [], {'from': player_a.address})
+    with reverts("Arbiter: insufficient balance"):
+        arbiter.proposeGameFromDeposit(rules, max_stake, [], {'from': player_a.address})
+
+
+def test_open_game(arbiter, rules, start_game, player_a, player_b):
+    stake = Wei('0.1 ether')
+    game_id = start_game(player_a.address, player_b.address, stake)
+    arbiter.resign(game_id, {'from': player_a.address})
+    assert arbiter.balances(player_b.address) == 2 * stake
+
+    deadline = chain.time() + 3600
+    game_open = [rules.address, stake, 0, [player_a.address, player_b.address], deadline, b"\x01" * 32]
+    _, signatures = sign_game_open(game_open, player_b, player_a)
+    game_id = game_open_id(game_open)
+    assert arbiter.gameOpenId(game_open) == game_id
+
+    with reverts("Arbiter: game not signed by both players"):
+        arbiter.openGame(game_open, [signatures[1], signatures[1]], {'value': stake, 'from': player_a.address})
+
+    tx = arbiter.openGame(game_open, signatures, {'value': stake, 'from': player_a.address})
+    assert tx.events['GameStarted']['gameId'] == game_id
+    assert arbiter.games(game_id) == (rules, 2 * stake, True, False)
+    assert arbiter.getPlayers(game_id) == [player_a.address, player_b.address]
+    assert arbiter.balances(player_a.address) == 0
+    assert arbiter.balances(player_b.address) == stake
+    assert arbiter.rulesGasBudget(game_id) == 0
+
+    with reverts("Arbiter: game already opened"):
+        arbiter.openGame(game_open, signatures, {'from': player_a.address})
+
+    arbiter.resign(game_id, {'from': player_b.address})
+    assert arbiter.balances(player_a.address) == 2 * stake
+
+    budgeted_game_open = [rules.address, stake, 300000, [player_a.address, player_b.address], deadline, b"\x02" * 32]
+    _, signatures = sign_game_open(budgeted_game_open, player_a, player_b)
+    tx = arbiter.openGame(budgeted_game_open, signatures, {'from': player_a.address})
+    assert tx.return_value == game_open_id(budgeted_game_open)
+    assert arbiter.rulesGasBudget(tx.return_value) == 300000
+
+
+
+def test_open_game_expired(arbiter, rules, player_a, player_b):
+    stake = Wei('0.1 ether')
+    deadline = chain.time() + 60
+    game_open = [rules.address, stake, 0, [player_a.address, player_b.address], deadline, b"\x03" * 32]
+    _, signatures = sign_game_open(game_open, player_a, player_b)
+    chain.sleep(120)
+    with reverts("Arbiter: game open expired"):
+        arbiter.openGame(game_open, signatures, {'value': 2 * stake, 'from': player_a.address})
+
+
 def test_timeout(arbiter, rules, start_game, player_a, player_b):
     game_id = start_game(
         player_a.address,
@@ -805,7 +1052,15 @@ def test_timeout(arbiter, rules, start_game, player_a, player_b):
     assert e['gameId'] == game_id
     assert e['player'] == player_a.address
     assert e['nonce'] == 4
+    assert balance(player_b) == balance_b_before_timeout_resolution
+    assert arbiter.balances(player_b.address) == arbiter.DEFAULT_TIMEOUT_STAKE()
+
+    tx = arbiter.withdraw({'from': player_b.address})
+    assert tx.events['Withdrawal']['amount'] == arbiter.DEFAULT_TIMEOUT_STAKE()
     assert balance(player_b) == balance_b_before_timeout_resolution + arbiter.DEFAULT_TIMEOUT_STAKE()
+    assert arbiter.balances(player_b.address) == 0
+    with reverts("Arbiter: nothing to withdraw"):
+        arbiter.withdraw({'from': player_b.address})
 
 
 def test_finalize_timeout(arbiter, rules, start_game, player_a, player_b):
@@ -896,6 +1151,8 @@ def test_finalize_timeout(arbiter, rules, start_game, player_a, player_b):
 
     b_balance_before_pre_finalize_timeout = balance(player_b)
     tx = arbiter.finalizeTimeout(game_id, {'from': player_b.address})
+    assert arbiter.balances(player_b.address) == arbiter.DEFAULT_TIMEOUT_STAKE() + 2 * stake
+    arbiter.withdraw({'from': player_b.address})
     assert balance(player_b) == arbiter.DEFAULT_TIMEOUT_STAKE() + b_balance_before_pre_finalize_timeout + 2 * stake
     assert 'GameFinished' in tx.events
     e = tx.events['GameFinished']
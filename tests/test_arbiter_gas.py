@@ -0,0 +1,780 @@
+#   ________                           ____.       __
+#  /  _____/_____    _____   ____     |    |__ ___/  |_  ________ __
+# /   \  ___\__  \  /     \_/ __ \    |    |  |  \   __\/  ___/  |  \
+# \    \_\  \/ __ \|  Y Y  \  ___//\__|    |  |  /|  |  \___ \|  |  /
+#  \______  (____  /__|_|  /\___  >________|____/ |__| /____  >____/
+#         \/     \/      \/     \/                          \/
+# https://gamejutsu.app
+# ETHOnline2022 submission by ChainHackers
+__license__ = "MIT"
+
+# Arbiter entry points gas at CheckersRules state sizes
+# the flows against the Arbiter before the gas work: `brownie run scripts/benchmark_baseline.py`
+# run with `brownie test tests/test_arbiter_gas.py -s` to see the numbers
+
+import time
+from typing import List
+import pytest
+from brownie import interface, reverts, Wei, chain, web3
+from eth_abi import encode_abi
+
+from scripts.game_records import iter_games
+from scripts.game_states import encode_checkers_state, decode_checkers_state, encode_tic_tac_toe_state
+from scripts.move_log import sign_move_log, move_log_tree, merkle_proof
+from scripts.game_moves import sign_move, sign_checkpoint, without_new_state, calldata_gas, sign_game_open, game_open_id, \
+    with_compact_signatures, pack_signed_move, pack_signed_moves, sign_move_chain
+
+STATE_TYPES = ["uint8[32]", "bool", "uint8"]
+TIC_TAC_TOE_STATE_TYPES = ["uint8[9]", "bool", "bool"]
+MOVE_TYPES = ["uint8", "uint8", "bool"]
+
+W, R = 0, 1  # playerId
+
+
+@pytest.fixture(scope='module')
+def rules(CheckersRules, dev):
+    return interface.IGameJutsuRules(dev.deploy(CheckersRules))
+
+
+@pytest.fixture(scope='module')
+def tic_tac_toe_rules(TicTacToeRules, dev):
+    return interface.IGameJutsuRules(dev.deploy(TicTacToeRules))
+
+
+@pytest.fixture
+def arbiter(Arbiter, dev):
+    return dev.deploy(Arbiter)
+
+
+@pytest.fixture(scope="module")
+def player_a(create_funded_eth_account):
+    return create_funded_eth_account()
+
+
+@pytest.fixture(scope="module")
+def player_b(create_funded_eth_account):
+    return create_funded_eth_account()
+
+
+@pytest.fixture
+def game_id(arbiter, rules, player_a, player_b):
+    stake = Wei('0.1 ether')
+    tx = arbiter.proposeGame(rules, [], {'value': stake, 'from': player_a.address})
+    game_id = tx.events['GameProposed']['gameId']
+    arbiter.acceptGame(game_id, [], {'value': stake, 'from': player_b.address})
+    return game_id
+
+
+def encode_move(fr: int, to: int, pass_move: bool) -> bytes:
+    return encode_abi(MOVE_TYPES, [fr, to, pass_move])
+
+
+def encode_board(cells: List[int], red_moves: bool, winner: int = 0) -> bytes:
+    return encode_abi(STATE_TYPES, [cells, red_moves, winner])
+
+
+def game_move(rules, game_id: int, nonce: int, player, player_id: int, old_state: bytes, move: bytes) -> list:
+    _, _, new_state = rules.transition([game_id, nonce, old_state], player_id, move)
+    return [game_id, nonce, player.address, old_state, bytes(new_state), move]
+
+
+@pytest.fixture
+def opening_moves(rules, game_id, player_a, player_b):
+    #                  0       1       2       3
+    #      0  00 │███│ o │███│ o │███│ o │███│ o │ 03 3
+    #      4  04 │ o │███│ o │███│ o │███│ o │███│ 07 7
+    #      8  08 │███│ o │███│ . │███│ o │███│ o │ 0B 11
+    #      12 0С │   │███│ o │███│   │███│   │███│ 0F 15
+    #      16 10 │███│   │███│ x │███│   │███│   │ 13 19
+    #      20 14 │ x │███│ . │███│ x │███│ x │███│ 17 23
+    #      24 18 │███│ x │███│ x │███│ x │███│ x │ 1B 27
+    #      28 1С │ x │███│ x │███│ x │███│ x │███│ 1F 31
+    #             1С      1D      1E      1F
+    initial_state = bytes(rules.defaultInitialGameState())
+    white_9_13 = game_move(rules, game_id, 0, player_a, W, initial_state, encode_move(9, 13, True))
+    red_21_17 = game_move(rules, game_id, 1, player_b, R, white_9_13[4], encode_move(21, 17, True))
+    white_10_14 = game_move(rules, game_id, 2, player_a, W, red_21_17[4], encode_move(10, 14, True))
+    return white_9_13, red_21_17, white_10_14
+
+
+def test_propose_accept_gas(arbiter, rules, player_a, player_b):
+    stake = Wei('0.1 ether')
+    tx = arbiter.proposeGame(rules, [], {'value': stake, 'from': player_a.address})
+    game_id = tx.events['GameProposed']['gameId']
+    print(f"proposeGame: {tx.gas_used}")
+
+    tx = arbiter.acceptGame(game_id, [], {'value': stake, 'from': player_b.address})
+    print(f"acceptGame: {tx.gas_used}")
+    assert arbiter.games(game_id) == (rules, 2 * stake, True, False)
+
+
+def test_finish_game_gas(arbiter, rules, game_id, player_a, player_b):
+    #                  0       1       2       3
+    #      12 0С │   │███│ o │███│   │███│   │███│ 0F 15
+    #      16 10 │███│ . │███│ x │███│   │███│   │ 13 19
+    #      20 14 │   │███│ x │███│ * │███│   │███│ 17 23
+    cells = [0] * 32
+    cells[13] = 1
+    cells[21] = 2
+    red_almost_lost = encode_board(cells, red_moves=True)
+    red_21_17 = game_move(rules, game_id, 40, player_b, R, red_almost_lost, encode_move(21, 17, True))
+    white_13_22 = game_move(rules, game_id, 41, player_a, W, red_21_17[4], encode_move(13, 22, True))
+
+    tx = arbiter.finishGame(
+        [sign_move(red_21_17, player_b), sign_move(white_13_22, player_a)],
+        {'from': player_a.address}
+    )
+    assert tx.events['GameFinished']['winner'] == player_a.address
+    print(f"finishGame: {tx.gas_used}")
+
+
+def test_timeout_gas(arbiter, game_id, opening_moves, player_a, player_b):
+    white_9_13, red_21_17, white_10_14 = opening_moves
+    tx = arbiter.initTimeout(
+        [sign_move(white_9_13, player_a, player_b), sign_move(red_21_17, player_b)],
+        {'value': arbiter.DEFAULT_TIMEOUT_STAKE(), 'from': player_b.address}
+    )
+    assert 'TimeoutStarted' in tx.events
+    print(f"initTimeout: {tx.gas_used}")
+
+    tx = arbiter.resolveTimeout(sign_move(white_10_14, player_a), {'from': player_a.address})
+    assert 'TimeoutResolved' in tx.events
+    print(f"resolveTimeout: {tx.gas_used}")
+
+
+def test_finalize_timeout_gas(arbiter, game_id, opening_moves, player_a, player_b):
+    white_9_13, red_21_17, _ = opening_moves
+    arbiter.initTimeout(
+        [sign_move(white_9_13, player_a, player_b), sign_move(red_21_17, player_b)],
+        {'value': arbiter.DEFAULT_TIMEOUT_STAKE(), 'from': player_b.address}
+    )
+    chain.sleep(arbiter.TIMEOUT() + 1)
+    tx = arbiter.finalizeTimeout(game_id, {'from': player_b.address})
+    assert tx.events['GameFinished']['winner'] == player_b.address
+    print(f"finalizeTimeout: {tx.gas_used}")
+
+
+def test_timeout_60_plies_in_with_and_without_checkpoint(arbiter, rules, game_id, player_a, player_b):
+    #                  0       1       2       3
+    #      0  00 │███│   │███│ O │███│   │███│   │ 03 3
+    #      4  04 │   │███│ . │███│   │███│   │███│ 07 7
+    #      ...
+    #      24 18 │███│   │███│   │███│ . │███│   │ 1B 27
+    #      28 1С │   │███│   │███│ X │███│   │███│ 1F 31
+    # the kings shuttle between 1 and 5 and between 30 and 26, 60 plies all signed by both players
+    cells = [0] * 32
+    cells[1] = 0xA1
+    cells[30] = 0xA2
+    state = encode_board(cells, red_moves=False)
+    shuttles = [(1, 5), (30, 26)]
+    history = []
+    for nonce in range(60):
+        player_id = nonce % 2
+        mover, opponent = (player_a, player_b) if player_id == W else (player_b, player_a)
+        fr, to = shuttles[player_id] if nonce % 4 < 2 else shuttles[player_id][::-1]
+        move = game_move(rules, game_id, nonce, mover, player_id, state, encode_move(fr, to, True))
+        signed_move = sign_move(move, mover, opponent)
+        assert arbiter.isValidSignedMove(signed_move)
+        history.append(signed_move)
+        state = move[4]
+    assert not rules.isFinal([game_id, 60, state])
+
+    tx = arbiter.initTimeout(history[-2:], {'value': arbiter.DEFAULT_TIMEOUT_STAKE(), 'from': player_b.address})
+    without_checkpoint = tx.gas_used
+    print(f"initTimeout: {without_checkpoint}, calldata {len(tx.input) // 2 - 1} bytes")
+    chain.undo()
+
+    last_move = history[-1][0]
+    checkpoint_tx = arbiter.checkpoint(*sign_checkpoint(game_id, 59, last_move[3], player_a, player_b),
+                                       {'from': player_b.address})
+    assert 'CheckpointRecorded' in checkpoint_tx.events
+    assert arbiter.checkpoints(game_id) == (59, web3.keccak(last_move[3]).hex())
+    tx = arbiter.initTimeoutFromCheckpoint(history[-1], {'value': arbiter.DEFAULT_TIMEOUT_STAKE(), 'from': player_b.address})
+    assert 'TimeoutStarted' in tx.events
+    print(f"checkpoint: {checkpoint_tx.gas_used}, "
+          f"initTimeoutFromCheckpoint: {tx.gas_used}, calldata {len(tx.input) // 2 - 1} bytes")
+    assert tx.gas_used < without_checkpoint
+
+    stale_checkpoint = sign_checkpoint(game_id, 58, history[-2][0][3], player_a, player_b)
+    with reverts("Arbiter: checkpoint not newer"):
+        arbiter.checkpoint(*stale_checkpoint, {'from': player_b.address})
+
+
+def test_dispute_move_gas(arbiter, rules, game_id, opening_moves, player_a, player_b):
+    _, red_21_17, white_10_14 = opening_moves
+    white_cheats = list(white_10_14)
+    white_cheats[5] = encode_move(10, 18, True)
+
+    gas = arbiter.isValidSignedMove.estimate_gas(sign_move(white_10_14, player_a))
+    print(f"isValidSignedMove: {gas}")
+
+    tx = arbiter.disputeMove(sign_move(white_cheats, player_a), {'from': player_b.address})
+    assert tx.events['GameFinished']['winner'] == player_b.address
+    print(f"disputeMove: {tx.gas_used}")
+
+
+@pytest.fixture
+def start_tic_tac_toe_game(arbiter, tic_tac_toe_rules, player_a, player_b):
+    def start() -> int:
+        stake = Wei('0.01 ether')
+        tx = arbiter.proposeGame(tic_tac_toe_rules, [], {'value': stake, 'from': player_a.address})
+        game_id = tx.events['GameProposed']['gameId']
+        arbiter.acceptGame(game_id, [], {'value': stake, 'from': player_b.address})
+        return game_id
+
+    return start
+
+
+def x_winning_moves(game_id: int, player_a, player_b) -> list:
+    # ╭───┬───┬───╮
+    # │ X │ X │ X │
+    # ├───┼───┼───┤
+    # │ 0 │ 0 │   │
+    # ├───┼───┼───┤
+    # │   │   │   │
+    # ╰───┴───┴───╯
+    o_about_to_play_in_the_center_board = encode_abi(TIC_TAC_TOE_STATE_TYPES, [[1, 1, 0, 2, 0, 0, 0, 0, 0], False, False])
+    x_almost_won_board = encode_abi(TIC_TAC_TOE_STATE_TYPES, [[1, 1, 0, 2, 2, 0, 0, 0, 0], False, False])
+    x_won_board = encode_abi(TIC_TAC_TOE_STATE_TYPES, [[1, 1, 1, 2, 2, 0, 0, 0, 0], True, False])
+    o_center_move = [game_id, 3, player_b.address, o_about_to_play_in_the_center_board, x_almost_won_board, b"\x04"]
+    x_winning_move = [game_id, 4, player_a.address, x_almost_won_board, x_won_board, b"\x02"]
+    return [sign_move(o_center_move, player_b), sign_move(x_winning_move, player_a)]
+
+
+def draw_moves(game_id: int, player_a, player_b) -> list:
+    # ╭───┬───┬───╮
+    # │ X │ 0 │ X │
+    # ├───┼───┼───┤
+    # │ X │ 0 │ 0 │
+    # ├───┼───┼───┤
+    # │ 0 │ X │ X │
+    # ╰───┴───┴───╯
+    seven_moves_board = encode_abi(TIC_TAC_TOE_STATE_TYPES, [[1, 2, 1, 1, 2, 2, 0, 1, 0], False, False])
+    eight_moves_board = encode_abi(TIC_TAC_TOE_STATE_TYPES, [[1, 2, 1, 1, 2, 2, 2, 1, 0], False, False])
+    full_board = encode_abi(TIC_TAC_TOE_STATE_TYPES, [[1, 2, 1, 1, 2, 2, 2, 1, 1], False, False])
+    o_6_move = [game_id, 7, player_b.address, seven_moves_board, eight_moves_board, b"\x06"]
+    x_8_move = [game_id, 8, player_a.address, eight_moves_board, full_board, b"\x08"]
+    return [sign_move(o_6_move, player_b), sign_move(x_8_move, player_a)]
+
+
+@pytest.fixture
+def x_wins(start_tic_tac_toe_game, player_a, player_b):
+    def finishing_moves() -> list:
+        return x_winning_moves(start_tic_tac_toe_game(), player_a, player_b)
+
+    return finishing_moves
+
+
+@pytest.fixture
+def draw(start_tic_tac_toe_game, player_a, player_b):
+    def finishing_moves() -> list:
+        return draw_moves(start_tic_tac_toe_game(), player_a, player_b)
+
+    return finishing_moves
+
+
+def test_tic_tac_toe_timeout_gas(arbiter, start_tic_tac_toe_game, player_a, player_b):
+    game_id = start_tic_tac_toe_game()
+    two_moves_board = encode_abi(TIC_TAC_TOE_STATE_TYPES, [[1, 0, 0, 2, 0, 0, 0, 0, 0], False, False])
+    three_moves_board = encode_abi(TIC_TAC_TOE_STATE_TYPES, [[1, 1, 0, 2, 0, 0, 0, 0, 0], False, False])
+    four_moves_board = encode_abi(TIC_TAC_TOE_STATE_TYPES, [[1, 1, 0, 2, 2, 0, 0, 0, 0], False, False])
+    five_moves_board = encode_abi(TIC_TAC_TOE_STATE_TYPES, [[1, 1, 0, 2, 2, 0, 0, 0, 1], False, False])
+    x_1_move = [game_id, 2, player_a.address, two_moves_board, three_moves_board, b"\x01"]
+    o_center_move = [game_id, 3, player_b.address, three_moves_board, four_moves_board, b"\x04"]
+    x_8_move = [game_id, 4, player_a.address, four_moves_board, five_moves_board, b"\x08"]
+
+    tx = arbiter.initTimeout(
+        [sign_move(x_1_move, player_a, player_b), sign_move(o_center_move, player_b)],
+        {'value': arbiter.DEFAULT_TIMEOUT_STAKE(), 'from': player_b.address}
+    )
+    print(f"initTimeout tic-tac-toe: {tx.gas_used}")
+
+    tx = arbiter.resolveTimeout(sign_move(x_8_move, player_a), {'from': player_a.address})
+    assert 'TimeoutResolved' in tx.events
+    print(f"resolveTimeout tic-tac-toe: {tx.gas_used}")
+
+
+def test_finish_game_win_and_draw_gas(arbiter, x_wins, draw, player_a):
+    tx = arbiter.finishGame(x_wins(), {'from': player_a.address})
+    assert not tx.events['GameFinished']['isDraw']
+    print(f"finishGame win: {tx.gas_used}")
+
+    tx = arbiter.finishGame(draw(), {'from': player_a.address})
+    assert tx.events['GameFinished']['isDraw']
+    print(f"finishGame draw: {tx.gas_used}")
+
+
+def test_finish_games_skips_invalid_entries(arbiter, x_wins, player_a):
+    first, second = x_wins(), x_wins()
+    not_signed_by_mover = [second[0], [second[1][0], second[0][1]]]
+    tx = arbiter.finishGames([first, not_signed_by_mover, first], {'from': player_a.address})
+    assert tx.return_value == [True, False, False]
+    assert len(tx.events['GameFinished']) == 1
+    assert tx.events['GameFinished']['gameId'] == first[0][0][0]
+
+
+def test_finish_games_gas_per_game(arbiter, x_wins, player_a):
+    single = arbiter.finishGame(x_wins(), {'from': player_a.address}).gas_used
+    print(f"finishGame: {single}")
+    for batch_size in [1, 2, 4, 8, 16, 32]:
+        batch = [x_wins() for _ in range(batch_size)]
+        tx = arbiter.finishGames(batch, {'from': player_a.address})
+        assert tx.return_value == [True] * batch_size
+        per_game = tx.gas_used // batch_size
+        print(f"finishGames batch {batch_size:>2}: {per_game:>7} per game {'#' * (per_game // 2000)}")
+        if batch_size > 1:
+            assert per_game < single
+
+
+def test_pull_payments_over_100_games(arbiter, x_wins, draw, player_a, player_b):
+    settlement_gas = 0
+    for i in range(100):
+        tx = arbiter.finishGame(x_wins() if i % 2 else draw(), {'from': player_a.address})
+        assert 'GameFinished' in tx.events
+        settlement_gas += tx.gas_used
+    stake = Wei('0.01 ether')
+    assert arbiter.balances(player_a.address) == 50 * 2 * stake + 50 * stake
+    assert arbiter.balances(player_b.address) == 50 * stake
+
+    withdrawal_gas = 0
+    for player in [player_a, player_b]:
+        withdrawal_gas += arbiter.withdraw({'from': player.address}).gas_used
+    print(f"100 games settled: {settlement_gas}, withdrawals: {withdrawal_gas}, "
+          f"per game: {(settlement_gas + withdrawal_gas) // 100}")
+
+
+def test_dispute_move_with_history_gas(arbiter, rules, game_id, opening_moves, player_a, player_b):
+    white_9_13, red_21_17, white_10_14 = opening_moves
+    signed_red_21_17 = sign_move(red_21_17, player_b, player_a)
+
+    white_9_14 = game_move(rules, game_id, 0, player_a, W, white_9_13[3], encode_move(9, 14, True))
+    white_cheats = list(white_10_14)
+    white_cheats[3] = white_9_14[4]
+
+    for name, signed_moves in [
+        ("same nonce", [sign_move(white_9_13, player_a), sign_move(white_9_14, player_a)]),
+        ("state mismatch", [signed_red_21_17, sign_move(white_cheats, player_a)]),
+    ]:
+        tx = arbiter.disputeMoveWithHistory(signed_moves, {'from': player_b.address})
+        assert tx.events['PlayerDisqualified']['player'] == player_a.address
+        print(f"disputeMoveWithHistory {name}: {tx.gas_used}")
+        chain.undo()
+
+    invalid_move = list(white_10_14)
+    invalid_move[5] = encode_move(10, 18, True)
+    tx = arbiter.disputeMove(sign_move(invalid_move, player_a), {'from': player_b.address})
+    print(f"disputeMove: {tx.gas_used}")
+    chain.undo()
+    tx = arbiter.disputeMoveWithHistory([signed_red_21_17, sign_move(invalid_move, player_a)], {'from': player_b.address})
+    print(f"disputeMoveWithHistory invalid transition: {tx.gas_used}")
+
+
+def test_calldata_cost_with_and_without_new_state(arbiter, rules, game_id, opening_moves, player_a, player_b):
+    white_9_13, red_21_17, white_10_14 = opening_moves
+    timeout_moves = [sign_move(white_9_13, player_a, player_b), sign_move(red_21_17, player_b)]
+    resolving_move = sign_move(white_10_14, player_a)
+    stake = arbiter.DEFAULT_TIMEOUT_STAKE()
+
+    results = {}
+    for name, strip in [("newState shipped", lambda m: m), ("newState derived", without_new_state)]:
+        init_tx = arbiter.initTimeout([strip(m) for m in timeout_moves], {'value': stake, 'from': player_b.address})
+        assert 'TimeoutStarted' in init_tx.events
+        resolve_tx = arbiter.resolveTimeout(strip(resolving_move), {'from': player_a.address})
+        assert 'TimeoutResolved' in resolve_tx.events
+        for tx in [init_tx, resolve_tx]:
+            data = bytes.fromhex(tx.input[2:])
+            print(f"{name} {tx.fn_name}: gas {tx.gas_used}, calldata {len(data)} bytes, {calldata_gas(data)} gas")
+        results[name] = [len(init_tx.input), len(resolve_tx.input)]
+        chain.undo(2)
+    assert all(derived < shipped for derived, shipped in zip(results["newState derived"], results["newState shipped"]))
+
+    # a signature over one move doesn't vouch for the state another move derives
+    forged = list(white_10_14)
+    forged[5] = encode_move(10, 15, True)
+    arbiter.initTimeout([without_new_state(m) for m in timeout_moves], {'value': stake, 'from': player_b.address})
+    with reverts():
+        arbiter.resolveTimeout(without_new_state([forged, resolving_move[1]]), {'from': player_a.address})
+
+
+def keccak_gas(data: bytes) -> int:
+    """
+    Gas `keccak256` takes over `data`: 30 plus 6 per word
+    """
+    return 30 + 6 * ((len(data) + 31) // 32)
+
+
+def test_compact_state_calldata_hashing_and_dispute_gas(arbiter, rules, player_a, player_b):
+    for name, state in [
+        ("checkers abi.encode", encode_checkers_state([1] * 12 + [0] * 8 + [2] * 12, False, compact=False)),
+        ("checkers compact", encode_checkers_state([1] * 12 + [0] * 8 + [2] * 12, False)),
+        ("tic-tac-toe abi.encode", encode_tic_tac_toe_state([0] * 9, False, False, compact=False)),
+        ("tic-tac-toe compact", encode_tic_tac_toe_state([0] * 9, False, False)),
+    ]:
+        print(f"{name} state: {len(state)} bytes, {calldata_gas(state)} calldata gas, keccak256 {keccak_gas(state)} gas")
+
+    stake = Wei('0.1 ether')
+    results = {}
+    for name, compact in [("abi.encode", False), ("compact", True)]:
+        tx = arbiter.proposeGame(rules, [], {'value': stake, 'from': player_a.address})
+        game_id = tx.events['GameProposed']['gameId']
+        arbiter.acceptGame(game_id, [], {'value': stake, 'from': player_b.address})
+        initial_state = encode_checkers_state(*decode_checkers_state(bytes(rules.defaultInitialGameState())),
+                                              compact=compact)
+        white_9_13 = game_move(rules, game_id, 0, player_a, W, initial_state, encode_move(9, 13, True))
+        red_21_17 = game_move(rules, game_id, 1, player_b, R, white_9_13[4], encode_move(21, 17, True))
+        white_cheats = game_move(rules, game_id, 2, player_a, W, red_21_17[4], encode_move(10, 14, True))
+        white_cheats[5] = encode_move(10, 18, True)
+
+        tx = arbiter.disputeMove(sign_move(white_cheats, player_a), {'from': player_b.address})
+        assert tx.events['GameFinished']['winner'] == player_b.address
+        data = bytes.fromhex(tx.input[2:])
+        print(f"disputeMove with {name} states: gas {tx.gas_used}, calldata {len(data)} bytes, {calldata_gas(data)} gas")
+        results[name] = len(data), tx.gas_used
+    assert results["compact"][0] < results["abi.encode"][0]
+    assert results["compact"][1] < results["abi.encode"][1]
+
+
+def test_counterfactual_games_load(arbiter, tic_tac_toe_rules, player_a, player_b):
+    games = 50
+    stake = Wei('0.01 ether')
+    on_chain_gas = 0
+    for _ in range(games):
+        tx = arbiter.proposeGame(tic_tac_toe_rules, [], {'value': stake, 'from': player_a.address})
+        game_id = tx.events['GameProposed']['gameId']
+        on_chain_gas += tx.gas_used
+        on_chain_gas += arbiter.acceptGame(game_id, [], {'value': stake, 'from': player_b.address}).gas_used
+        on_chain_gas += arbiter.finishGame(draw_moves(game_id, player_a, player_b), {'from': player_a.address}).gas_used
+    # every draw has credited both stakes back, the counterfactual games reserve them from the balances
+    assert arbiter.balances(player_a.address) == arbiter.balances(player_b.address) == games * stake
+
+    started = time.perf_counter()
+    deadline = chain.time() + 3600
+    game_opens = [sign_game_open([tic_tac_toe_rules.address, stake, 0, [player_a.address, player_b.address], deadline, i.to_bytes(32, "big")],
+                                 player_a, player_b) for i in range(games)]
+    signing_time = time.perf_counter() - started
+
+    counterfactual_gas = 0
+    for game_open, signatures in game_opens:
+        game_id = game_open_id(game_open)
+        tx = arbiter.openGame(game_open, signatures, {'from': player_a.address})
+        assert tx.return_value == game_id
+        counterfactual_gas += tx.gas_used
+        counterfactual_gas += arbiter.finishGame(draw_moves(game_id, player_a, player_b), {'from': player_a.address}).gas_used
+    assert arbiter.balances(player_a.address) == arbiter.balances(player_b.address) == games * stake
+
+    print(f"{games} games proposed, accepted and settled: {on_chain_gas}, per game {on_chain_gas // games}")
+    print(f"{games} games opened by signatures and settled: {counterfactual_gas}, per game {counterfactual_gas // games}")
+    print(f"{games} games opened by signatures and never disputed: 0 gas, {signing_time:.2f}s signing off-chain")
+    assert counterfactual_gas < on_chain_gas
+
+
+def test_deposit_pool_long_series(arbiter, tic_tac_toe_rules, player_a, player_b):
+    games = 100
+    stake = Wei('0.01 ether')
+
+    value_per_game_gas = 0
+    for _ in range(games):
+        txs = [arbiter.proposeGame(tic_tac_toe_rules, [], {'value': stake, 'from': player_a.address})]
+        game_id = txs[0].events['GameProposed']['gameId']
+        txs.append(arbiter.acceptGame(game_id, [], {'value': stake, 'from': player_b.address}))
+        txs.append(arbiter.finishGame(draw_moves(game_id, player_a, player_b), {'from': player_a.address}))
+        txs += [arbiter.withdraw({'from': player.address}) for player in [player_a, player_b]]
+        value_per_game_gas += sum(tx.gas_used for tx in txs)
+
+    deposit_gas = sum(arbiter.deposit({'value': stake, 'from': player.address}).gas_used for player in [player_a, player_b])
+    for _ in range(games):
+        tx = arbiter.proposeGameFromDeposit(tic_tac_toe_rules, stake, [], {'from': player_a.address})
+        game_id = tx.events['GameProposed']['gameId']
+        deposit_gas += tx.gas_used
+        deposit_gas += arbiter.acceptGame(game_id, [], {'from': player_b.address}).gas_used
+        deposit_gas += arbiter.finishGame(draw_moves(game_id, player_a, player_b), {'from': player_a.address}).gas_used
+        assert arbiter.balances(player_a.address) == arbiter.balances(player_b.address) == stake
+    deposit_gas += sum(arbiter.withdraw({'from': player.address}).gas_used for player in [player_a, player_b])
+
+    print(f"{games} games, stakes sent and paid out every game: {value_per_game_gas // games} per game")
+    print(f"{games} games, stakes reserved from a deposit: {deposit_gas // games} per game")
+    assert deposit_gas < value_per_game_gas
+
+
+def test_compact_signatures_calldata_and_gas(arbiter, rules, game_id, opening_moves, player_a, player_b):
+    white_9_13, red_21_17, white_10_14 = opening_moves
+    timeout_moves = [sign_move(white_9_13, player_a, player_b), sign_move(red_21_17, player_b)]
+    assert arbiter.isValidSignedMove(with_compact_signatures(sign_move(white_10_14, player_a, player_b)))
+
+    cells = [0] * 32
+    cells[13] = 1
+    cells[21] = 2
+    red_almost_lost = encode_board(cells, red_moves=True)
+    red_21_17_loses = game_move(rules, game_id, 40, player_b, R, red_almost_lost, encode_move(21, 17, True))
+    white_13_22 = game_move(rules, game_id, 41, player_a, W, red_21_17_loses[4], encode_move(13, 22, True))
+    finishing_moves = [sign_move(red_21_17_loses, player_b), sign_move(white_13_22, player_a)]
+
+    stake = arbiter.DEFAULT_TIMEOUT_STAKE()
+    for name, convert in [("65-byte", lambda m: m), ("compact", with_compact_signatures)]:
+        txs = [
+            arbiter.initTimeout([convert(m) for m in timeout_moves], {'value': stake, 'from': player_b.address}),
+            arbiter.finishGame([convert(m) for m in finishing_moves], {'from': player_a.address}),
+        ]
+        assert 'TimeoutStarted' in txs[0].events
+        assert txs[1].events['GameFinished']['winner'] == player_a.address
+        for tx in txs:
+            data = bytes.fromhex(tx.input[2:])
+            print(f"{name} signatures {tx.fn_name}: gas {tx.gas_used}, calldata {len(data)} bytes, {calldata_gas(data)} gas")
+        chain.undo(2)
+
+
+def test_packed_moves_calldata_per_entry_point(arbiter, rules, game_id, opening_moves, player_a, player_b):
+    white_9_13, red_21_17, white_10_14 = opening_moves
+    timeout_moves = [sign_move(white_9_13, player_a, player_b), sign_move(red_21_17, player_b)]
+    resolving_move = sign_move(white_10_14, player_a)
+    white_cheats = list(white_10_14)
+    white_cheats[5] = encode_move(10, 18, True)
+    cheat = sign_move(white_cheats, player_a)
+
+    cells = [0] * 32
+    cells[13] = 1
+    cells[21] = 2
+    red_almost_lost = encode_board(cells, red_moves=True)
+    red_21_17_loses = game_move(rules, game_id, 40, player_b, R, red_almost_lost, encode_move(21, 17, True))
+    white_13_22 = game_move(rules, game_id, 41, player_a, W, red_21_17_loses[4], encode_move(13, 22, True))
+    finishing_moves = [sign_move(red_21_17_loses, player_b), sign_move(white_13_22, player_a)]
+
+    stake = arbiter.DEFAULT_TIMEOUT_STAKE()
+    entry_points = [
+        ("initTimeout", lambda: arbiter.initTimeout(timeout_moves, {'value': stake, 'from': player_b.address}),
+         lambda: arbiter.initTimeoutPacked(pack_signed_moves(*timeout_moves), {'value': stake, 'from': player_b.address})),
+        ("resolveTimeout", lambda: arbiter.resolveTimeout(resolving_move, {'from': player_a.address}),
+         lambda: arbiter.resolveTimeoutPacked(pack_signed_move(resolving_move), {'from': player_a.address})),
+        ("finishGame", lambda: arbiter.finishGame(finishing_moves, {'from': player_a.address}),
+         lambda: arbiter.finishGamePacked(pack_signed_moves(*finishing_moves), {'from': player_a.address})),
+        ("disputeMove", lambda: arbiter.disputeMove(cheat, {'from': player_b.address}),
+         lambda: arbiter.disputeMovePacked(pack_signed_move(cheat), {'from': player_b.address})),
+    ]
+    # resolveTimeout needs the timeout started by initTimeout, so each form runs the whole sequence
+    for form in [1, 2]:
+        for name, *calls in entry_points:
+            tx = calls[form - 1]()
+            assert tx.status == 1
+            data = bytes.fromhex(tx.input[2:])
+            print(f"{name}{'' if form == 1 else 'Packed'}: gas {tx.gas_used}, "
+                  f"calldata {len(data)} bytes, {calldata_gas(data)} gas")
+            if name in ("finishGame", "disputeMove"):
+                chain.undo()
+        chain.undo(2)
+
+    with reverts("PackedGameMove: trailing bytes"):
+        arbiter.disputeMovePacked(pack_signed_move(cheat) + b"\x00", {'from': player_b.address})
+    with reverts("PackedGameMove: trailing bytes"):
+        arbiter.finishGamePacked(pack_signed_moves(*finishing_moves) + b"\x00", {'from': player_a.address})
+
+
+def test_chained_moves_recovers_and_gas_by_history_length(arbiter, rules, game_id, opening_moves, player_a, player_b):
+    white_9_13, red_21_17, _ = opening_moves
+    stake = arbiter.DEFAULT_TIMEOUT_STAKE()
+    tx = arbiter.initTimeout([sign_move(white_9_13, player_a, player_b), sign_move(red_21_17, player_b)],
+                             {'value': stake, 'from': player_b.address})
+    print(f"initTimeout, 2 moves: 3 recovers, gas {tx.gas_used}")
+    chain.undo()
+
+    zero_hash = b"\x00" * 32
+    for history_length in [2, 4, 8, 16, 32]:
+        # moves before the last two only need to be linked, they are authenticated by hashing
+        earlier_moves = []
+        state = encode_board([0] * 32, red_moves=False, winner=0)
+        for nonce in range(history_length - 2):
+            player = [player_a, player_b][nonce % 2]
+            next_state = white_9_13[3] if nonce == history_length - 3 else encode_board([nonce + 1] * 32, red_moves=False)
+            earlier_moves.append([game_id, nonce, player.address, state, next_state, encode_move(0, 0, True)])
+            state = next_state
+        last_two = [list(white_9_13), list(red_21_17)]
+        last_two[0][1] = history_length - 2
+        last_two[1][1] = history_length - 1
+
+        moves = sign_move_chain(earlier_moves + last_two, zero_hash, [player_b], [player_a])
+        tx = arbiter.initTimeoutChained(moves, {'value': stake, 'from': player_b.address})
+        assert 'TimeoutStarted' in tx.events
+        print(f"initTimeoutChained, {history_length:>2} moves: 2 recovers, gas {tx.gas_used:>7}, "
+              f"one signature per move would take {history_length + 1} recovers")
+        chain.undo()
+
+    with reverts("Arbiter: chain not signed by all players"):
+        arbiter.initTimeoutChained(sign_move_chain([white_9_13, red_21_17], zero_hash, [player_b], [player_b]),
+                                   {'value': stake, 'from': player_b.address})
+
+    # the opponent may sign the head itself instead of the move before it
+    tx = arbiter.initTimeoutChained(sign_move_chain([white_9_13, red_21_17], zero_hash, [player_b, player_a], []),
+                                    {'value': stake, 'from': player_b.address})
+    assert 'TimeoutStarted' in tx.events
+    chain.undo()
+
+    too_short = sign_move_chain([white_9_13], zero_hash, [player_a], [])
+    with reverts("Arbiter: chain too short"):
+        arbiter.initTimeoutChained(too_short, {'value': stake, 'from': player_a.address})
+    with reverts("Arbiter: chain too short"):
+        arbiter.finishGameChained([[], zero_hash, [], []], {'from': player_a.address})
+
+
+def test_dispute_logged_move_gas_by_log_length(arbiter, game_id, opening_moves, player_a, player_b):
+    _, _, white_10_14 = opening_moves
+    for length in [10, 100, 1000]:
+        cheat_index = length // 2
+        moves = [[game_id, i, [player_a, player_b][i % 2].address, i.to_bytes(32, "big"), (i + 1).to_bytes(32, "big"), b"\x00"]
+                 for i in range(length)]
+        white_cheats = list(white_10_14)
+        white_cheats[1] = cheat_index
+        white_cheats[5] = encode_move(10, 18, True)
+        moves[cheat_index] = white_cheats
+
+        commit_tx = arbiter.commitMoveLog(*sign_move_log(game_id, moves, player_a, player_b), {'from': player_b.address})
+        assert 'MoveLogCommitted' in commit_tx.events
+        proof = merkle_proof(move_log_tree(moves), cheat_index)
+        tx = arbiter.disputeLoggedMove(white_cheats, proof, {'from': player_b.address})
+        assert tx.events['PlayerDisqualified']['player'] == player_a.address
+        print(f"{length:>4} moves: commitMoveLog {commit_tx.gas_used}, disputeLoggedMove {tx.gas_used}, "
+              f"proof {len(proof)} hashes, calldata {len(tx.input) // 2 - 1} bytes")
+        chain.undo()
+
+        with reverts("Arbiter: move not in the log"):
+            arbiter.disputeLoggedMove(white_cheats, proof[1:], {'from': player_b.address})
+
+
+def test_rules_gas_budget(arbiter, rules, player_a, player_b):
+    initial_state = bytes(rules.defaultInitialGameState())
+    openings = [encode_move(fr, to, True) for fr, to in [(8, 12), (9, 13), (9, 14), (10, 14), (10, 15), (11, 15)]]
+    worst_case = arbiter.measureRulesGas(rules, [0, 0, initial_state], W, openings)
+    print(f"CheckersRules worst case for the opening moves: {worst_case}")
+    assert worst_case > 0
+
+    stake = Wei('0.1 ether')
+    for gas_budget, cheat_proven in [(worst_case // 10, True), (worst_case * 2, False)]:
+        tx = arbiter.proposeGameWithRulesGasBudget(rules, gas_budget, [], {'value': stake, 'from': player_a.address})
+        game_id = tx.events['GameProposed']['gameId']
+        arbiter.acceptGameWithRulesGasBudget(game_id, gas_budget, [], {'value': stake, 'from': player_b.address})
+        assert arbiter.rulesGasBudget(game_id) == gas_budget
+
+        white_9_13 = game_move(rules, game_id, 0, player_a, W, initial_state, encode_move(9, 13, True))
+        # a move the rules can't validate within the agreed budget is as bad as an invalid one
+        if cheat_proven:
+            tx = arbiter.disputeMove(sign_move(white_9_13, player_a), {'from': player_b.address})
+            assert tx.events['PlayerDisqualified']['player'] == player_a.address
+        else:
+            with reverts("Arbiter: valid move disputed"):
+                arbiter.disputeMove(sign_move(white_9_13, player_a), {'from': player_b.address})
+
+
+def test_heavy_rules_without_gas_budget(arbiter, HeavyRules, tic_tac_toe_rules, dev, player_a, player_b):
+    # every rules call takes well over a million gas, a game without a budget still validates and settles
+    heavy_rules = dev.deploy(HeavyRules, tic_tac_toe_rules, 1_500_000)
+    stake = Wei('0.01 ether')
+    tx = arbiter.proposeGame(heavy_rules, [], {'value': stake, 'from': player_a.address})
+    game_id = tx.events['GameProposed']['gameId']
+    arbiter.acceptGame(game_id, [], {'value': stake, 'from': player_b.address})
+    assert arbiter.rulesGasBudget(game_id) == 0
+
+    tx = arbiter.finishGame(x_winning_moves(game_id, player_a, player_b), {'from': player_a.address, 'gas_limit': 10_000_000})
+    assert tx.events['GameFinished']['winner'] == player_a.address
+    print(f"finishGame with heavy rules: {tx.gas_used}")
+
+
+def test_finalize_timeouts_gas_per_timeout(arbiter, tic_tac_toe_rules, create_funded_eth_account):
+    player_a, player_b = create_funded_eth_account(), create_funded_eth_account()
+    two_moves_board = encode_abi(TIC_TAC_TOE_STATE_TYPES, [[1, 0, 0, 2, 0, 0, 0, 0, 0], False, False])
+    three_moves_board = encode_abi(TIC_TAC_TOE_STATE_TYPES, [[1, 1, 0, 2, 0, 0, 0, 0, 0], False, False])
+    four_moves_board = encode_abi(TIC_TAC_TOE_STATE_TYPES, [[1, 1, 0, 2, 2, 0, 0, 0, 0], False, False])
+
+    def start_timeout() -> int:
+        tx = arbiter.proposeGame(tic_tac_toe_rules, [], {'from': player_a.address})
+        game_id = tx.events['GameProposed']['gameId']
+        arbiter.acceptGame(game_id, [], {'from': player_b.address})
+        x_1_move = [game_id, 2, player_a.address, two_moves_board, three_moves_board, b"\x01"]
+        o_center_move = [game_id, 3, player_b.address, three_moves_board, four_moves_board, b"\x04"]
+        arbiter.initTimeout([sign_move(x_1_move, player_a, player_b), sign_move(o_center_move, player_b)],
+                            {'value': arbiter.DEFAULT_TIMEOUT_STAKE(), 'from': player_b.address})
+        return game_id
+
+    game_id = start_timeout()
+    chain.sleep(arbiter.TIMEOUT() + 1)
+    single = arbiter.finalizeTimeout(game_id, {'from': player_a.address}).gas_used
+    print(f"finalizeTimeout: {single}")
+
+    for batch_size in [1, 2, 4, 8, 16]:
+        game_ids = [start_timeout() for _ in range(batch_size)]
+        chain.sleep(arbiter.TIMEOUT() + 1)
+        not_expired_yet = start_timeout()
+        # skipped: already finalized, not expired, never started
+        batch = game_ids + [game_id, not_expired_yet, 2 ** 64]
+        tx = arbiter.finalizeTimeouts(batch, {'from': player_a.address})
+        assert tx.return_value == [2 ** batch_size - 1]
+        assert len(tx.events['PlayerDisqualified']) == batch_size
+        per_timeout = tx.gas_used // batch_size
+        print(f"finalizeTimeouts batch {batch_size:>2}: {per_timeout:>7} per timeout {'#' * (per_timeout // 2000)}")
+        chain.sleep(arbiter.TIMEOUT() + 1)
+        arbiter.finalizeTimeout(not_expired_yet, {'from': player_a.address})
+        arbiter.withdraw({'from': player_b.address})
+
+
+# the 10,000-game versions of the two tests below are in scripts/benchmark_games.py
+
+def game_slot(game_id: int) -> int:
+    """
+    Storage slot of `Arbiter._games[game_id]`, the mapping comes right after the 3 settings
+    """
+    return int.from_bytes(web3.keccak(encode_abi(["uint256", "uint256"], [game_id, 3])), "big")
+
+
+def player_slot(game_id: int, player: str) -> int:
+    return int.from_bytes(web3.keccak(encode_abi(["address", "uint256"], [player, game_slot(game_id) + 1])), "big")
+
+
+def session_addresses_slot(game_id: int) -> int:
+    """
+    Storage slot of `Arbiter._sessionAddresses[game_id]`, the lengths of both players' lists start there
+    """
+    return int.from_bytes(web3.keccak(encode_abi(["uint256", "uint256"], [game_id, 8])), "big")
+
+
+def test_settled_games_leave_tombstones_only(arbiter, tic_tac_toe_rules, player_a, player_b, create_eth_account):
+    game_ids, session_addresses = [], []
+    for _ in range(5):
+        session_a, session_b, late_session_a = [create_eth_account().address for _ in range(3)]
+        tx = arbiter.proposeGame(tic_tac_toe_rules, [session_a], {'from': player_a.address})
+        game_id = tx.events['GameProposed']['gameId']
+        arbiter.acceptGame(game_id, [session_b], {'from': player_b.address})
+        arbiter.registerSessionAddress(game_id, late_session_a, {'from': player_a.address})
+        arbiter.resign(game_id, {'from': player_a.address})
+        game_ids.append(game_id)
+        session_addresses.append([session_a, session_b, late_session_a])
+
+    empty = "0x" + "00" * 32
+    for game_id, sessions in zip(game_ids, session_addresses):
+        # the tombstone is the first slot of the game and both players addresses
+        tombstone = game_slot(game_id)
+        for slot in [tombstone, tombstone + 2, tombstone + 3]:
+            assert web3.eth.get_storage_at(arbiter.address, slot) != empty
+        lists = session_addresses_slot(game_id)
+        for slot in [lists, lists + 1] + [player_slot(game_id, address) for address in [player_a.address, player_b.address] + sessions]:
+            assert web3.eth.get_storage_at(arbiter.address, slot) == empty
+        assert arbiter.games(game_id) == (tic_tac_toe_rules, 0, True, True)
+        assert arbiter.gameOutcome(game_id) == 2
+        assert arbiter.getPlayers(game_id) == [player_a.address, player_b.address]
+
+
+def test_load_games_bulk_and_per_game(arbiter, tic_tac_toe_rules, player_a, player_b):
+    games, page_size = 23, 5
+    first_game_id = arbiter.nextGameId()
+    for i in range(games):
+        tx = arbiter.proposeGame(tic_tac_toe_rules, [], {'from': player_a.address})
+        if i % 2:
+            arbiter.acceptGame(tx.events['GameProposed']['gameId'], [], {'from': player_b.address})
+
+    per_game = [(arbiter.games(game_id), arbiter.getPlayers(game_id), arbiter.timeouts(game_id))
+                for game_id in range(first_game_id, first_game_id + games)]
+    records = list(iter_games(arbiter, first_game_id, page_size))
+
+    assert len(records) == games
+    assert [r.game_id for r in records] == list(range(first_game_id, first_game_id + games))
+    for record, (game, players, timeout) in zip(records, per_game):
+        assert (record.rules, record.stake, record.started, record.finished) == tuple(game)
+        assert record.players == list(players)
+        assert record.timeout_start_time == timeout[0]
+    assert sum(r.started for r in records) == games // 2
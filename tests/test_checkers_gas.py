@@ -13,8 +13,11 @@ from typing import List, Tuple, Generator
 import pytest
 from brownie import interface
 from eth_abi import encode_abi, decode_abi
+import random
 from random import randbytes
 
+from scripts.game_states import encode_checkers_state
+
 
 @pytest.fixture(scope='module')
 def rules(CheckersRules, dev):
@@ -102,6 +105,170 @@ def test_red_jumps_with_multiple_red_checkers_remaining(rules, game_id, gas_chec
     assert tx.gas_used < 200000
 
 
+OPENING = [1, 1, 1, 1,
+           1, 1, 1, 1,
+           1, 1, 1, 1,
+           0, 0, 0, 0,
+           0, 0, 0, 0,
+           2, 2, 2, 2,
+           2, 2, 2, 2,
+           2, 2, 2, 2]
+
+CROWDED = [1, 1, 1, 1,
+           2, 2, 0, 2,
+           2, 1, 2, 2,
+           2, 2, 2, 2,
+           2, 2, 2, 2,
+           2, 2, 0, 2,
+           2, 2, 1, 0,
+           2, 2, 2, 2]
+
+KINGS_ENDGAME = [0, 0, 0, 0,
+                 0, 161, 0, 0,
+                 0, 0, 161, 0,
+                 0, 0, 0, 0,
+                 0, 0, 0, 0,
+                 0, 0, 0, 0,
+                 0, 0, 162, 0,
+                 0, 162, 0, 0]
+
+
+@pytest.mark.parametrize("name, cells, red_moves, player_id, move", [
+    ("opening", OPENING, False, W, (9, 13, True)),
+    ("crowded, jump", CROWDED, True, R, (13, 6, False)),
+    ("kings endgame", KINGS_ENDGAME, True, R, (26, 22, True)),
+])
+def test_bitboard_gas_by_board(rules, game_id, name, cells, red_moves, player_id, move):
+    # the board is scanned for moves and jumps with shifts over White, Red and kings bitmasks,
+    # each call stays under 100k gas whether the board is full, crowded or down to a few kings
+    game_state = [game_id, 0, encode_board(cells=cells, red_moves=red_moves, winner=0)]
+    move = encode_move(*move)
+    assert rules.isValidMove(game_state, player_id, move)
+
+    is_valid_move_gas = rules.isValidMove.estimate_gas(game_state, player_id, move)
+    transition_gas = rules.transition.estimate_gas(game_state, player_id, move)
+    print(f"{name}: isValidMove {is_valid_move_gas}, transition {transition_gas}")
+    assert is_valid_move_gas < 100000
+    assert transition_gas < 100000
+
+
+# crowded boards near the end of a game, 28 checkers, mostly kings
+
+CROWDED_JUMP_AGAIN = [161, 2, 1, 161,
+                      1, 161, 162, 2,
+                      2, 2, 0, 161,
+                      161, 161, 162, 2,
+                      161, 0, 161, 1,
+                      1, 1, 161, 162,
+                      1, 2, 2, 162,
+                      1, 0, 0, 2]
+
+CROWDED_JUMP_WINS = [1, 1, 2, 161,
+                     1, 162, 161, 0,
+                     2, 2, 1, 161,
+                     1, 2, 161, 161,
+                     161, 1, 0, 162,
+                     162, 0, 1, 161,
+                     2, 162, 1, 161,
+                     162, 0, 161, 161]
+
+CROWDED_STEP_WINS = [162, 162, 162, 161,
+                     162, 2, 162, 1,
+                     1, 0, 2, 2,
+                     1, 1, 161, 2,
+                     161, 1, 1, 1,
+                     161, 161, 1, 161,
+                     0, 162, 161, 1,
+                     0, 161, 2, 0]
+
+
+@pytest.mark.parametrize("name, cells, move, red_moves_next, winner", [
+    ("jump, the same side jumps again", CROWDED_JUMP_AGAIN, (3, 10, False), False, 0),
+    ("jump, the opponent is left without moves", CROWDED_JUMP_WINS, (30, 21, True), True, 1),
+    ("simple move, the opponent is left without moves", CROWDED_STEP_WINS, (14, 9, True), True, 1),
+])
+def test_transition_worst_case_gas(rules, game_id, name, cells, move, red_moves_next, winner):
+    # both colors' moves and jumps are found in a single pass over the board after the move,
+    # and reused to pass the turn and to detect the winner
+    game_state = [game_id, 0, encode_board(cells=cells, red_moves=False, winner=0)]
+    move = encode_move(*move)
+    assert rules.isValidMove(game_state, W, move)
+
+    _, _, new_state = rules.transition(game_state, W, move)
+    _, red_moves, new_winner = decode_abi(STATE_TYPES, new_state)
+    assert (red_moves, new_winner) == (red_moves_next, winner)
+
+    transition_gas = rules.transition.estimate_gas(game_state, W, move)
+    validate_and_transition_gas = interface.IGameJutsuTransitionRules(rules.address).validateAndTransition.estimate_gas(
+        game_state, W, move)
+    print(f"{name}: transition {transition_gas}, validateAndTransition {validate_and_transition_gas}")
+    assert transition_gas < 100000
+    assert validate_and_transition_gas < 150000
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_external_functions_gas(rules, game_id, compact):
+    # isValidMove, isFinal, isWin and outcome read the state straight from calldata,
+    # the state is copied to memory only by transition and by validateAndTransition once the move is valid
+    game_state = [game_id, 0, encode_checkers_state(CROWDED, red_moves=True, compact=compact)]
+    move = encode_move(13, 6, False)
+    transition_rules = interface.IGameJutsuTransitionRules(rules.address)
+    outcome_rules = interface.IGameJutsuOutcomeRules(rules.address)
+    gas = {
+        "isValidMove": rules.isValidMove.estimate_gas(game_state, R, move),
+        "isValidMove, invalid": rules.isValidMove.estimate_gas(game_state, R, encode_move(13, 6, True)),
+        "transition": rules.transition.estimate_gas(game_state, R, move),
+        "validateAndTransition": transition_rules.validateAndTransition.estimate_gas(game_state, R, move),
+        "validateAndTransition, invalid": transition_rules.validateAndTransition.estimate_gas(
+            game_state, R, encode_move(13, 6, True)),
+        "isFinal": rules.isFinal.estimate_gas(game_state),
+        "isWin": rules.isWin.estimate_gas(game_state, R),
+        "outcome": outcome_rules.outcome.estimate_gas(game_state),
+    }
+    for name, used in gas.items():
+        print(f"{'compact' if compact else 'abi.encode'} {name}: {used}")
+    assert gas["validateAndTransition, invalid"] < gas["validateAndTransition"]
+    assert max(gas["isFinal"], gas["isWin"], gas["outcome"]) < gas["isValidMove"]
+
+
+def random_mid_game_position(rng: random.Random) -> Tuple[List[int], bool]:
+    cells = [0] * 32
+    for checker, king in [(1, 161), (2, 162)]:
+        for i in rng.sample([i for i in range(32) if cells[i] == 0], rng.randint(6, 10)):
+            cells[i] = king if rng.random() < 0.15 else checker
+    return cells, rng.random() < 0.5
+
+
+def valid_moves(rules, game_state: list, red_moves: bool, cells: List[int]) -> Generator[tuple, None, None]:
+    player_id = R if red_moves else W
+    for fr in [i for i in range(32) if cells[i] % 16 == (2 if red_moves else 1)]:
+        for step in [-9, -7, -5, -4, -3, 3, 4, 5, 7, 9]:
+            for pass_move in [True, False]:
+                move = (fr, fr + step, pass_move)
+                if 0 <= fr + step < 32 and rules.isValidMove(game_state, player_id, encode_move(*move)):
+                    yield move
+
+
+def test_gas_over_random_mid_game_positions(rules, game_id):
+    # seeded random positions with 12-20 checkers and some kings, both calls stay under 100k gas in every one
+    rng = random.Random(22)
+    is_valid_move_gas, transition_gas = [], []
+    while len(is_valid_move_gas) < 30:
+        cells, red_moves = random_mid_game_position(rng)
+        game_state = [game_id, 0, encode_board(cells=cells, red_moves=red_moves, winner=0)]
+        move = next(valid_moves(rules, game_state, red_moves, cells), None)
+        if move is None:
+            continue
+        player_id = R if red_moves else W
+        is_valid_move_gas.append(rules.isValidMove.estimate_gas(game_state, player_id, encode_move(*move)))
+        transition_gas.append(rules.transition.estimate_gas(game_state, player_id, encode_move(*move)))
+
+    for name, gas in [("isValidMove", is_valid_move_gas), ("transition", transition_gas)]:
+        print(f"{name} over {len(gas)} positions: min {min(gas)}, mean {sum(gas) // len(gas)}, max {max(gas)}")
+    assert max(is_valid_move_gas) < 100000
+    assert max(transition_gas) < 100000
+
+
 def encode_move(fr: int, to: int, pass_move: bool) -> bytes:
     move = mov(fr, to, pass_move)
     return encode_abi(MOVE_TYPES, move)
@@ -11,11 +11,12 @@ __license__ = "MIT"
 
 from typing import List, Tuple, Generator
 import pytest
-from brownie import interface
+from brownie import interface, reverts
 from eth_abi import encode_abi, decode_abi
 from random import randbytes
 
 from brownie.test import given, strategy as st
+from scripts.game_states import encode_checkers_state, decode_checkers_state, to_compact_checkers_state
 from hypothesis import strategies
 
 WHITE = 1
@@ -248,6 +249,96 @@ def test_red_king_jumps_back(rules, game_id):
     assert winner_3 == RED
 
 
+def test_validate_and_transition(rules, game_id):
+    #               0       1       2       3
+    #      0  │███│   │███│ x │███│   │███│   │ 3
+    #      4  │   │███│ o │███│   │███│   │███│ 7
+    #      8  │███│ . │███│   │███│   │███│   │ 11
+    #      12 │   │███│ o │███│   │███│   │███│ 15
+    #      16 │███│   │███│ . │███│   │███│   │ 19
+    #      20 │   │███│   │███│ o │███│   │███│ 23
+    #      24 │███│   │███│   │███│ . │███│   │ 27
+    #      28 │   │███│   │███│   │███│   │███│ 31
+    #           28      29      30      31
+    cells = [0, 162, 0, 0,
+             0, 1, 0, 0,
+             0, 0, 0, 0,
+             0, 1, 0, 0,
+             0, 0, 0, 0,
+             0, 0, 1, 0,
+             0, 0, 0, 0,
+             0, 0, 0, 0]
+    game_state = [game_id, 0, encode_board(cells=cells, red_moves=True, winner=0)]
+    transition_rules = interface.IGameJutsuTransitionRules(rules.address)
+    assert transition_rules.supportsInterface(transition_rules.validateAndTransition.signature)
+
+    for move in [encode_move(fr=1, to=8, pass_move=False), encode_move(fr=1, to=8, pass_move=True),
+                 encode_move(fr=1, to=6, pass_move=True), encode_move(fr=5, to=9, pass_move=True)]:
+        valid, new_state = transition_rules.validateAndTransition(game_state, R, move)
+        assert valid == rules.isValidMove(game_state, R, move)
+        if valid:
+            assert new_state == rules.transition(game_state, R, move)[2]
+        else:
+            assert new_state.hex() in ["", "0x"]
+
+
+def test_outcome(rules, game_id):
+    in_progress, win = 0, 1
+    outcome_rules = interface.IGameJutsuOutcomeRules(rules.address)
+    assert outcome_rules.supportsInterface(outcome_rules.outcome.signature)
+
+    cells = [0] * 32
+    cells[13] = WHITE
+    for winner, expected in [(0, (in_progress, 0)), (WHITE, (win, W)), (RED, (win, R))]:
+        game_state = [game_id, 0, encode_board(cells=cells, red_moves=True, winner=winner)]
+        assert outcome_rules.outcome(game_state) == expected
+
+
+def test_compact_state(rules, game_id):
+    cells = [0] * 32
+    cells[1] = RED_KING
+    cells[5] = WHITE
+    cells[13] = WHITE
+    legacy_state = [game_id, 0, encode_board(cells=cells, red_moves=True, winner=0)]
+    compact_state = [game_id, 0, encode_checkers_state(cells, red_moves=True, winner=0)]
+    assert len(compact_state[2]) == 35
+
+    for move in [encode_move(fr=1, to=8, pass_move=False), encode_move(fr=1, to=8, pass_move=True),
+                 encode_move(fr=1, to=6, pass_move=True)]:
+        assert rules.isValidMove(compact_state, R, move) == rules.isValidMove(legacy_state, R, move)
+        _, _, legacy_next = rules.transition(legacy_state, R, move)
+        _, _, compact_next = rules.transition(compact_state, R, move)
+        assert bytes(compact_next) == to_compact_checkers_state(bytes(legacy_next))
+        assert decode_checkers_state(bytes(compact_next)) == decode_checkers_state(bytes(legacy_next))
+
+    outcome_rules = interface.IGameJutsuOutcomeRules(rules.address)
+    for winner, expected in [(0, (0, 0)), (WHITE, (1, W)), (RED, (1, R))]:
+        game_state = [game_id, 0, encode_checkers_state(cells, red_moves=True, winner=winner)]
+        assert outcome_rules.outcome(game_state) == expected
+        assert rules.isFinal(game_state) == (winner != 0)
+
+
+def test_non_canonical_compact_state(rules, game_id):
+    cells = [0] * 32
+    cells[1] = RED_KING
+    state = encode_checkers_state(cells, red_moves=True, winner=0)
+    move = encode_move(fr=1, to=6, pass_move=True)
+    assert rules.isValidMove([game_id, 0, state], R, move)
+
+    for non_canonical in [
+        state[:2] + bytes([3]) + state[3:],  # no such cell code
+        state[:2] + bytes([0xA0]) + state[3:],  # a king of no color
+        state[:33] + bytes([2]) + state[34:],  # redMoves other than 0 or 1
+        state[:34] + bytes([3]),  # no such winner
+    ]:
+        with reverts():
+            rules.isValidMove([game_id, 0, non_canonical], R, move)
+        with reverts():
+            rules.transition([game_id, 0, non_canonical], R, move)
+    with reverts():
+        rules.isFinal([game_id, 0, state[:34] + bytes([3])])
+
+
 def test_red_moves_4_0(rules, game_id):
     #                  0       1       2       3
     #      0  00 │███│   │███│ x │███│   │███│   │ 03 3
@@ -10,11 +10,13 @@ __author__ = ["Gene A. Tsvigun"]
 __license__ = "MIT"
 
 import pytest
-from brownie import interface
+from brownie import interface, reverts
 from brownie.convert import to_bytes
 from eth_abi import encode_abi, decode_abi
 from random import randbytes
 
+from scripts.game_states import encode_tic_tac_toe_state, decode_tic_tac_toe_state, to_compact_tic_tac_toe_state
+
 
 @pytest.fixture(scope='module')
 def rules(TicTacToeRules, dev):
@@ -146,3 +148,65 @@ def test_transition(rules, game_id):
     next_game_id, next_nonce, next_state = rules.transition(x_almost_won_state, X, x_winning_move_data)
     x_won_board = encode_abi(STATE_TYPES, [[1, 1, 1, 2, 2, 0, 0, 0, 0], True, False])
     assert next_state.hex() == x_won_board.hex()
+
+
+def test_validate_and_transition(rules, game_id):
+    board = encode_abi(STATE_TYPES, [[1, 1, 0, 2, 2, 0, 0, 0, 0], False, False])
+    game_state = [game_id, 4, board]
+    transition_rules = interface.IGameJutsuTransitionRules(rules.address)
+    assert transition_rules.supportsInterface(transition_rules.validateAndTransition.signature)
+
+    for player_id in [X, O]:
+        for cell_id in range(9):
+            move = to_bytes(cell_id)
+            valid, new_state = transition_rules.validateAndTransition(game_state, player_id, move)
+            assert valid == rules.isValidMove(game_state, player_id, move)
+            if valid:
+                assert new_state == rules.transition(game_state, player_id, move)[2]
+
+
+def test_compact_board(rules, game_id):
+    cells = [1, 1, 0, 2, 2, 0, 0, 0, 0]
+    legacy_state = [game_id, 4, encode_abi(STATE_TYPES, [cells, False, False])]
+    compact_state = [game_id, 4, encode_tic_tac_toe_state(cells, False, False)]
+    assert len(compact_state[2]) == 4
+
+    for cell_id in range(9):
+        move = to_bytes(cell_id)
+        assert rules.isValidMove(compact_state, X, move) == rules.isValidMove(legacy_state, X, move)
+        _, _, legacy_next = rules.transition(legacy_state, X, move)
+        _, _, compact_next = rules.transition(compact_state, X, move)
+        assert bytes(compact_next) == to_compact_tic_tac_toe_state(bytes(legacy_next))
+
+    _, _, x_won = rules.transition(compact_state, X, to_bytes(2))
+    assert decode_tic_tac_toe_state(bytes(x_won)) == ([1, 1, 1, 2, 2, 0, 0, 0, 0], True, False)
+    assert rules.isWin([game_id, 5, x_won], X)
+    assert rules.isFinal([game_id, 9, encode_tic_tac_toe_state([1, 2, 1, 1, 2, 2, 2, 1, 1], False, False)])
+
+
+def test_non_canonical_compact_board(rules, game_id):
+    state = encode_tic_tac_toe_state([1, 1, 0, 2, 2, 0, 0, 0, 0], False, False)
+    assert rules.isValidMove([game_id, 4, state], X, to_bytes(2))
+
+    packed = int.from_bytes(state[1:], 'big')
+    for non_canonical in [packed | 3 << 16, packed | 1 << 20, packed | 1 << 23]:
+        board = state[:1] + non_canonical.to_bytes(3, 'big')
+        with reverts():
+            rules.isValidMove([game_id, 4, board], X, to_bytes(2))
+        with reverts():
+            rules.isFinal([game_id, 4, board])
+
+
+def test_outcome(rules, game_id):
+    in_progress, win, draw = 0, 1, 2
+    outcome_rules = interface.IGameJutsuOutcomeRules(rules.address)
+    assert outcome_rules.supportsInterface(outcome_rules.outcome.signature)
+
+    for cells, crosses_win, naughts_win, expected in [
+        ([1, 1, 0, 2, 2, 0, 0, 0, 0], False, False, (in_progress, 0)),
+        ([1, 1, 1, 2, 2, 0, 0, 0, 0], True, False, (win, X)),
+        ([1, 1, 0, 2, 2, 2, 1, 0, 0], False, True, (win, O)),
+        ([1, 2, 1, 1, 2, 2, 2, 1, 1], False, False, (draw, 0)),
+    ]:
+        game_state = [game_id, 9, encode_abi(STATE_TYPES, [cells, crosses_win, naughts_win])]
+        assert outcome_rules.outcome(game_state) == expected